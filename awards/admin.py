@@ -1,45 +1,32 @@
-import csv
+import logging
 
 from django.contrib import admin, messages
-from django.db.models import Case, Count, IntegerField, Sum, When
-from django.http import HttpResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import redirect, render
 from django.urls import path
 from django.utils.html import format_html
 
 from coreconfig.service import email_service
 
+from .ballots import confirmation_email_task
+from .confirmed_filter import confirmed_vote_filter
+from .exports import FORMATS, summary_export, vote_export
+from .live import async_event_stream, event_stream
 from .models import Category, Nominee, Vote
-from .utils import build_confirmation_url, vote_rows_for_queue_context
+from .tallies import apply_deletion, refresh_tallies, summary_rows
+from .utils import build_confirmation_url, immediate_atomic, is_expired, unconfirmed_vote_cutoff
+
+logger = logging.getLogger(__name__)
+
+# Ballots per pending-votes query and email batch when resending confirmations
+RESEND_CHUNK_SIZE = 200
 
 
 def _vote_summary_queryset():
-    return (
-        Vote.objects.values(
-            'category__id',
-            'category__title',
-            'nominee__id',
-            'nominee__nominee',
-        )
-        .annotate(
-            confirmed_votes=Sum(
-                Case(
-                    When(is_confirmed=True, then=1),
-                    default=0,
-                    output_field=IntegerField(),
-                )
-            ),
-            unconfirmed_votes=Sum(
-                Case(
-                    When(is_confirmed=False, then=1),
-                    default=0,
-                    output_field=IntegerField(),
-                )
-            ),
-            total_votes=Count('id'),
-        )
-        .order_by('category__title', 'nominee__nominee')
-    )
+    # Read from the materialized NomineeTally rows (one per nominee)
+    return summary_rows()
 
 
 @admin.register(Category)
@@ -99,6 +86,27 @@ class VoteAdmin(admin.ModelAdmin):
     readonly_fields = ['created_at', 'confirmed_at', 'batch_id', 'confirmation_token']
     actions = ['resend_confirmation_email_action']
 
+    def save_model(self, request, obj, form, change):
+        previous_nominee_id = None
+        if change:
+            previous_nominee_id = Vote.objects.filter(pk=obj.pk).values_list('nominee_id', flat=True).first()
+        with transaction.atomic():
+            super().save_model(request, obj, form, change)
+            refresh_tallies({obj.nominee_id, previous_nominee_id} - {None})
+            if obj.is_confirmed:
+                confirmed_vote_filter.add([(obj.voter_email, obj.category_id)])
+
+    def delete_model(self, request, obj):
+        with transaction.atomic():
+            super().delete_model(request, obj)
+            apply_deletion([(obj.nominee_id, obj.is_confirmed)])
+
+    def delete_queryset(self, request, queryset):
+        with immediate_atomic():
+            removed = list(queryset.values_list('nominee_id', 'is_confirmed'))
+            super().delete_queryset(request, queryset)
+            apply_deletion(removed)
+
     def get_urls(self):
         urls = super().get_urls()
         custom_urls = [
@@ -107,6 +115,16 @@ class VoteAdmin(admin.ModelAdmin):
                 self.admin_site.admin_view(self.summary_export_view),
                 name='awards_vote_summary_export',
             ),
+            path(
+                'export.<str:export_format>',
+                self.admin_site.admin_view(self.vote_export_view),
+                name='awards_vote_export',
+            ),
+            path(
+                'summary/live/',
+                self.admin_site.admin_view(self.summary_live_view),
+                name='awards_vote_summary_live',
+            ),
             path(
                 'summary/',
                 self.admin_site.admin_view(self.summary_view),
@@ -120,40 +138,68 @@ class VoteAdmin(admin.ModelAdmin):
         ]
         return custom_urls + urls
 
-    def _queue_vote_confirmation_email(self, vote_obj, request=None):
-        pending_votes = list(
-            Vote.objects.select_related('category', 'nominee').filter(
-                voter_email=vote_obj.voter_email,
-                confirmation_token=vote_obj.confirmation_token,
+    def _queue_vote_confirmation_emails(self, ballots, request=None):
+        """
+        Queue one confirmation email per (voter_email, confirmation_token)
+        ballot that still has pending, unexpired votes. Each chunk of
+        RESEND_CHUNK_SIZE ballots loads its pending rows with one query and
+        publishes its emails in one batch. Returns (queued, failed, skipped).
+        """
+        ballots = list(dict.fromkeys(ballots))
+        cutoff = unconfirmed_vote_cutoff()
+        queued = failed = skipped = 0
+        for start in range(0, len(ballots), RESEND_CHUNK_SIZE):
+            chunk = ballots[start:start + RESEND_CHUNK_SIZE]
+            wanted = set(chunk)
+            grouped = {}
+            pending = Vote.objects.select_related('category', 'nominee').filter(
+                confirmation_token__in={token for _, token in chunk},
                 is_confirmed=False,
-            )
-        )
-        if not pending_votes:
-            return False
+            ).order_by('id')
+            for vote in pending:
+                key = (vote.voter_email, vote.confirmation_token)
+                if key in wanted:
+                    grouped.setdefault(key, []).append(vote)
 
-        confirm_url = build_confirmation_url(
-            token=vote_obj.confirmation_token,
-            email=vote_obj.voter_email,
-            request=request,
-        )
-        vote_rows = vote_rows_for_queue_context(pending_votes)
-        email_queue = email_service.send_email_task(
-            email_type='awards_vote',
-            subject='Confirm Your iGaming Awards Vote',
-            recipients=[vote_obj.voter_email],
-            context={
-                "voter_name": vote_obj.voter_name,
-                "vote_rows": vote_rows,
-                "confirm_url": confirm_url,
-            },
-            template_path='awards/email/vote_confirmation.html',
-            source_app='awards_VoteAdmin',
-            related_model_id=vote_obj.id,
-        )
-        Vote.objects.filter(
-            id__in=[v.id for v in pending_votes]
-        ).update(email_sent=email_queue is not None)
-        return email_queue is not None
+            sendable = []
+            for key in chunk:
+                votes = grouped.get(key)
+                if not votes or any(is_expired(vote, cutoff) for vote in votes):
+                    skipped += 1
+                    continue
+                sendable.append(votes)
+
+            results = email_service.send_email_tasks([
+                confirmation_email_task(
+                    votes[0].voter_name,
+                    votes[0].voter_email,
+                    votes,
+                    build_confirmation_url(
+                        token=votes[0].confirmation_token,
+                        email=votes[0].voter_email,
+                        request=request,
+                    ),
+                    source_app='awards_VoteAdmin',
+                )
+                for votes in sendable
+            ])
+            sent_ids, unsent_ids = [], []
+            for votes, email_queue in zip(sendable, results):
+                if email_queue is not None:
+                    queued += 1
+                    sent_ids.extend(vote.id for vote in votes)
+                else:
+                    failed += 1
+                    unsent_ids.extend(vote.id for vote in votes)
+            if sent_ids:
+                Vote.objects.filter(id__in=sent_ids).update(email_sent=True)
+            if unsent_ids:
+                Vote.objects.filter(id__in=unsent_ids).update(email_sent=False)
+            logger.info(
+                f"Resending vote confirmations: {start + len(chunk)}/{len(ballots)} ballots processed "
+                f"({queued} queued, {failed} failed, {skipped} skipped)"
+            )
+        return queued, failed, skipped
 
     def resend_button(self, obj):
         if obj.is_confirmed:
@@ -170,9 +216,13 @@ class VoteAdmin(admin.ModelAdmin):
             vote = Vote.objects.get(id=vote_id)
             if vote.is_confirmed:
                 messages.warning(request, "Vote is already confirmed.")
+            elif is_expired(vote):
+                messages.warning(request, "Vote has expired unconfirmed; the voter needs to vote again.")
             else:
-                ok = self._queue_vote_confirmation_email(vote, request=request)
-                if ok:
+                queued, _, _ = self._queue_vote_confirmation_emails(
+                    [(vote.voter_email, vote.confirmation_token)], request=request
+                )
+                if queued:
                     messages.success(request, "Confirmation email queued successfully.")
                 else:
                     messages.error(request, "Failed to queue confirmation email.")
@@ -181,11 +231,20 @@ class VoteAdmin(admin.ModelAdmin):
         return redirect('admin:awards_vote_changelist')
 
     def resend_confirmation_email_action(self, request, queryset):
-        count = 0
-        for vote in queryset.filter(is_confirmed=False):
-            if self._queue_vote_confirmation_email(vote, request=request):
-                count += 1
-        self.message_user(request, f"{count} confirmation email(s) queued.")
+        # Several selected rows usually belong to the same ballot: one email each
+        ballots = list(
+            queryset.filter(is_confirmed=False)
+            .order_by()
+            .values_list('voter_email', 'confirmation_token')
+            .distinct()
+        )
+        queued, failed, skipped = self._queue_vote_confirmation_emails(ballots, request=request)
+        message = f"{queued} confirmation email(s) queued for {len(ballots)} ballot(s)."
+        if skipped:
+            message += f" {skipped} ballot(s) skipped (confirmed or expired)."
+        if failed:
+            message += f" {failed} email(s) could not be queued."
+        self.message_user(request, message, messages.WARNING if failed else messages.SUCCESS)
 
     resend_confirmation_email_action.short_description = "Resend confirmation email(s)"
 
@@ -198,34 +257,24 @@ class VoteAdmin(admin.ModelAdmin):
         )
         return render(request, 'admin/awards/vote_summary.html', context)
 
-    def summary_export_view(self, request):
-        summary = _vote_summary_queryset()
-        response = HttpResponse(content_type='text/csv; charset=utf-8')
-        response['Content-Disposition'] = 'attachment; filename="awards_vote_summary.csv"'
-        response.write('\ufeff')
-        writer = csv.writer(response)
-        writer.writerow(
-            [
-                'category_id',
-                'category_title',
-                'nominee_id',
-                'nominee_name',
-                'confirmed_votes',
-                'unconfirmed_votes',
-                'total_votes',
-            ]
-        )
-        for row in summary:
-            writer.writerow(
-                [
-                    row['category__id'],
-                    row['category__title'],
-                    row['nominee__id'],
-                    row['nominee__nominee'],
-                    row['confirmed_votes'] or 0,
-                    row['unconfirmed_votes'] or 0,
-                    row['total_votes'] or 0,
-                ]
-            )
+    def summary_live_view(self, request):
+        last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+        if isinstance(request, ASGIRequest):
+            stream = async_event_stream(last_event_id)
+        else:
+            stream = event_stream(last_event_id)
+        response = StreamingHttpResponse(stream, content_type='text/event-stream')
+        # Keep nginx from buffering the stream
+        response['X-Accel-Buffering'] = 'no'
         return response
 
+    def summary_export_view(self, request):
+        export_format = 'ndjson' if request.GET.get('format') == 'ndjson' else 'csv'
+        return summary_export(_vote_summary_queryset(), export_format)
+
+    def vote_export_view(self, request, export_format):
+        """Raw votes matching the changelist filters and search in the query string."""
+        if export_format not in FORMATS:
+            raise Http404
+        queryset = self.get_changelist_instance(request).get_queryset(request)
+        return vote_export(queryset, export_format)
@@ -5,3 +5,5 @@ class AwardsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'awards'
 
+    def ready(self):
+        import awards.signals
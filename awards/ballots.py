@@ -0,0 +1,279 @@
+"""
+Ballot write path
+Stores a validated ballot with as few statements as possible (SQLite
+serializes every write):
+
+    SELECT  existing votes of this voter in the ballot's categories
+    UPSERT  all votes in one INSERT ... ON CONFLICT (voter_email, category,
+            is_confirmed) DO UPDATE, email_sent already set: a resubmission
+            rewrites the voter's unconfirmed rows in place
+    UPDATE  nominee tallies (new and replaced votes in one statement)
+    INSERT  EmailQueue row (email_service)
+
+The SELECT and the upsert share one transaction, so the nominees being
+replaced are exactly the ones the tally update subtracts. The transaction
+begins IMMEDIATE (utils.immediate_atomic) and holds the write lock from
+BEGIN, so concurrent resubmissions from the same voter are applied one after
+the other instead of racing; other transactions keep SQLite's deferred mode.
+If the lock cannot be had within the busy timeout the whole transaction is
+retried (BALLOT_WRITE_ATTEMPTS); nothing of a failed attempt is kept, so a
+retry sees the same state as a first try.
+
+The inserted Vote objects keep their category/nominee instances from
+validation, so nothing is re-selected to build the confirmation email.
+email_sent is written optimistically and only reset if queuing fails.
+
+With AWARDS_VOTE_BUFFER_ENABLED, ballots are spooled by awards.vote_buffer
+instead and stored many at a time by record_ballot_batch.
+"""
+import uuid
+
+from django.db import IntegrityError, OperationalError
+
+from coreconfig.service import email_service
+
+from .catalog import nominee_catalog
+from .confirmed_filter import confirmed_vote_filter
+from .models import BufferedBallot, Nominee, Vote
+from .tallies import apply_ballot
+from .utils import build_confirmation_url, immediate_atomic, vote_rows_for_queue_context
+
+
+class BallotRejected(Exception):
+    """The voter already has confirmed votes in some of the ballot's categories."""
+
+    def __init__(self, categories):
+        super().__init__(', '.join(categories))
+        self.categories = categories
+
+
+class NomineeRemoved(Exception):
+    """A nominee on the ballot was deleted after the ballot was validated against the catalog."""
+
+
+BALLOT_WRITE_ATTEMPTS = 2
+
+# Columns a resubmission overwrites on the voter's unconfirmed row;
+# created_at restarts the confirmation window (AWARDS_UNCONFIRMED_VOTE_TTL_HOURS)
+UPSERT_UNIQUE_FIELDS = ['voter_email', 'category', 'is_confirmed']
+UPSERT_UPDATE_FIELDS = [
+    'voter_name', 'company', 'position', 'nominee', 'batch_id',
+    'confirmation_token', 'email_sent', 'created_at',
+]
+
+
+def upsert_votes(votes):
+    """Insert unconfirmed votes, overwriting the voter's unconfirmed vote in the same category."""
+    return Vote.objects.bulk_create(
+        votes,
+        update_conflicts=True,
+        unique_fields=UPSERT_UNIQUE_FIELDS,
+        update_fields=UPSERT_UPDATE_FIELDS,
+    )
+
+
+def _replace_votes(voter_email, categories, votes):
+    """One transaction: read the voter's votes in `categories`, upsert `votes`, adjust tallies."""
+    with immediate_atomic():
+        existing = list(
+            Vote.objects.filter(voter_email=voter_email, category_id__in=list(categories))
+            .values_list('category_id', 'is_confirmed', 'nominee_id')
+        )
+        confirmed = {category_id for category_id, is_confirmed, _ in existing if is_confirmed}
+        if confirmed:
+            raise BallotRejected([categories[category_id].title for category_id in categories if category_id in confirmed])
+        upsert_votes(votes)
+        apply_ballot([vote.nominee_id for vote in votes], [nominee_id for _, _, nominee_id in existing])
+
+
+def confirmation_email_task(voter_name, voter_email, votes, confirm_url, source_app='awards_VoteSubmissionAPIView'):
+    """send_email_task / send_email_tasks keyword arguments for a ballot's confirmation email."""
+    return dict(
+        email_type='awards_vote',
+        subject='Confirm Your iGaming Awards Vote',
+        recipients=[voter_email],
+        context={
+            "voter_name": voter_name,
+            "vote_rows": vote_rows_for_queue_context(votes),
+            "confirm_url": confirm_url,
+        },
+        template_path='awards/email/vote_confirmation.html',
+        source_app=source_app,
+        related_model_id=votes[0].id if votes else None,
+    )
+
+
+def _queue_confirmation(voter_name, voter_email, votes, confirm_url):
+    email_queue = email_service.send_email_task(**confirmation_email_task(voter_name, voter_email, votes, confirm_url))
+    return email_queue is not None
+
+
+def confirmed_categories(voter_email, categories):
+    """
+    Titles of `categories` ({id: Category}) the voter has already confirmed a
+    vote in. Only categories confirmed_vote_filter cannot rule out are queried.
+    """
+    candidates = confirmed_vote_filter.might_contain(voter_email, categories)
+    if not candidates:
+        return []
+    confirmed = set(
+        Vote.objects.filter(voter_email=voter_email, category_id__in=list(candidates), is_confirmed=True)
+        .values_list('category_id', flat=True)
+    )
+    return [category.title for category_id, category in categories.items() if category_id in confirmed]
+
+
+def record_ballot(voter_name, voter_email, company, position, votes_payload, request=None):
+    """
+    Store one ballot and queue its confirmation email.
+
+    votes_payload items are VoteItemSerializer output (category_obj / nominee_obj).
+    Returns (votes, email_sent); raises BallotRejected for already confirmed
+    categories and NomineeRemoved when a nominee was deleted meanwhile.
+    """
+    categories = {item['category_obj'].id: item['category_obj'] for item in votes_payload}
+    token = uuid.uuid4().hex
+    batch_id = uuid.uuid4()
+    votes = [
+        Vote(
+            voter_name=voter_name,
+            voter_email=voter_email,
+            company=company,
+            position=position,
+            category=item['category_obj'],
+            nominee=item['nominee_obj'],
+            batch_id=batch_id,
+            confirmation_token=token,
+            email_sent=True,
+        )
+        for item in votes_payload
+    ]
+
+    for attempt in range(1, BALLOT_WRITE_ATTEMPTS + 1):
+        try:
+            _replace_votes(voter_email, categories, votes)
+            break
+        except IntegrityError:
+            # Foreign keys are checked at COMMIT; a nominee removed in another
+            # worker can still be in this worker's catalog
+            nominee_ids = {vote.nominee_id for vote in votes}
+            if Nominee.objects.filter(id__in=nominee_ids).count() == len(nominee_ids):
+                raise
+            nominee_catalog.invalidate()
+            raise NomineeRemoved()
+        except OperationalError as exc:
+            # Retry only when the write lock was not acquired within the busy
+            # timeout; nothing was written then
+            if 'database is locked' not in str(exc) or attempt == BALLOT_WRITE_ATTEMPTS:
+                raise
+            for vote in votes:
+                vote.pk = None
+
+    email_sent = _queue_confirmation(
+        voter_name, voter_email, votes,
+        build_confirmation_url(token=token, email=voter_email, request=request),
+    )
+    if not email_sent:
+        Vote.objects.filter(batch_id=batch_id).update(email_sent=False)
+    return votes, email_sent
+
+
+def _ballot_votes(ballot):
+    """Vote objects for a buffered ballot; items whose nominee has since been removed are dropped."""
+    votes = []
+    for category_id, nominee_id in ballot['votes']:
+        nominee = nominee_catalog.nominee(nominee_id, category_id)
+        if nominee is None:
+            continue
+        votes.append(Vote(
+            voter_name=ballot['voter_name'],
+            voter_email=ballot['voter_email'],
+            company=ballot['company'],
+            position=ballot['position'],
+            category=nominee.category,
+            nominee=nominee,
+            batch_id=uuid.UUID(ballot['batch_id']),
+            confirmation_token=ballot['token'],
+            email_sent=False,
+        ))
+    return votes
+
+
+def record_ballot_batch(ballots):
+    """
+    Store buffered ballots (awards.vote_buffer records, in arrival order) in
+    one transaction, with the same outcome as calling record_ballot for each:
+    a later ballot replaces the voter's unconfirmed votes in its categories,
+    and ballots touching an already confirmed category are rejected.
+    Every ballot's batch_id is recorded as a BufferedBallot in the same
+    transaction, and ballots already recorded are skipped, so a batch can be
+    replayed after a crash (a superseded ballot leaves no Vote row to check).
+    Votes are committed with email_sent=False and marked sent once their
+    confirmation email is queued, so a crash in between leaves them visible
+    to the resend action instead of skipped as processed and marked sent.
+
+    Returns (accepted, rejected): accepted is [(ballot, votes, email_sent)]
+    with the votes that survived the batch, rejected is [(ballot, reason)].
+    """
+    processed = set(
+        str(batch_id) for batch_id in
+        BufferedBallot.objects.filter(batch_id__in=[ballot['batch_id'] for ballot in ballots])
+        .values_list('batch_id', flat=True)
+    )
+    ballots = [ballot for ballot in ballots if ballot['batch_id'] not in processed]
+    if not ballots:
+        return [], []
+
+    category_ids = {category_id for ballot in ballots for category_id, _ in ballot['votes']}
+    with immediate_atomic():
+        confirmed = set()
+        unconfirmed = {}
+        existing = Vote.objects.filter(
+            voter_email__in={ballot['voter_email'] for ballot in ballots},
+            category_id__in=category_ids,
+        ).values_list('voter_email', 'category_id', 'is_confirmed', 'nominee_id')
+        for voter_email, category_id, is_confirmed, nominee_id in existing:
+            if is_confirmed:
+                confirmed.add((voter_email, category_id))
+            else:
+                unconfirmed[(voter_email, category_id)] = nominee_id
+
+        pending = {}
+        candidates = []
+        rejected = []
+        for ballot in ballots:
+            votes = _ballot_votes(ballot)
+            if not votes:
+                rejected.append((ballot, 'nominees no longer exist'))
+                continue
+            blocked = [vote.category.title for vote in votes if (ballot['voter_email'], vote.category_id) in confirmed]
+            if blocked:
+                rejected.append((ballot, 'already voted in ' + ', '.join(blocked)))
+                continue
+            for vote in votes:
+                pending[(vote.voter_email, vote.category_id)] = vote
+            candidates.append((ballot, votes))
+
+        # One row per (voter, category): a later ballot in the batch wins, and
+        # the upsert overwrites any unconfirmed row already stored
+        new_votes = list(pending.values())
+        if new_votes:
+            upsert_votes(new_votes)
+        apply_ballot([vote.nominee_id for vote in new_votes], [unconfirmed[key] for key in pending if key in unconfirmed])
+        BufferedBallot.objects.bulk_create([BufferedBallot(batch_id=uuid.UUID(ballot['batch_id'])) for ballot in ballots])
+
+    # Confirmation emails only list votes a later ballot in the batch did not replace
+    accepted = []
+    for ballot, votes in candidates:
+        surviving = [vote for vote in votes if pending[(vote.voter_email, vote.category_id)] is vote]
+        if surviving:
+            accepted.append((ballot, surviving))
+    queued = email_service.send_email_tasks([
+        confirmation_email_task(ballot['voter_name'], ballot['voter_email'], surviving, ballot['confirm_url'])
+        for ballot, surviving in accepted
+    ])
+    accepted = [(ballot, surviving, email_queue is not None) for (ballot, surviving), email_queue in zip(accepted, queued)]
+    sent = [ballot['batch_id'] for ballot, _, email_sent in accepted if email_sent]
+    if sent:
+        Vote.objects.filter(batch_id__in=sent).update(email_sent=True)
+    return accepted, rejected
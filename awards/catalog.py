@@ -0,0 +1,123 @@
+"""
+Nominee Catalog
+Process-wide index of award categories and their nominees. Ballots are
+validated against it without touching the database, and the category list
+endpoint returns its pre-serialized payload. Category and Nominee signals
+bump the shared cache version; workers check it at most every
+NOMINEE_CATALOG_CHECK_INTERVAL seconds and reload with two queries. With a
+per-process cache backend other workers cannot see the bump and reload after
+PROCESS_SNAPSHOT_MAX_AGE seconds instead (coreconfig.shared_cache). The
+version a snapshot was loaded at is also its conditional GET validator, so a
+worker never pairs a fresh ETag with a stale payload.
+"""
+import threading
+import time
+import uuid
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Prefetch
+
+from coreconfig.shared_cache import snapshot_expired
+
+
+def _new_version():
+    # "<unix time>:<random>": the time doubles as Last-Modified for conditional GETs
+    return f'{time.time():.6f}:{uuid.uuid4().hex}'
+
+
+class CatalogSnapshot:
+    """Immutable view of the catalog for one version."""
+
+    def __init__(self, categories, version):
+        self.categories = categories
+        self.version = version
+        self.nominees = {}
+        for category in categories:
+            for nominee in category.nominees.all():
+                # Reuse the loaded category instead of a lazy FK lookup
+                nominee.category = category
+                self.nominees[nominee.id] = nominee
+
+        from .serializers import CategoryWithNomineesSerializer
+        self.payload = CategoryWithNomineesSerializer(categories, many=True).data
+
+
+class NomineeCatalog:
+    VERSION_KEY = 'awards_nominee_catalog_version'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._version = None
+        self._checked_at = 0.0
+        self._loaded_at = 0.0
+
+    def _current_version(self):
+        version = cache.get(self.VERSION_KEY)
+        if version is None:
+            cache.add(self.VERSION_KEY, _new_version(), timeout=None)
+            version = cache.get(self.VERSION_KEY)
+        return version
+
+    def _load(self, version):
+        from .models import Category, Nominee
+        categories = list(
+            Category.objects.prefetch_related(
+                Prefetch('nominees', queryset=Nominee.objects.order_by('nominee'))
+            ).order_by('priority', 'title')
+        )
+        return CatalogSnapshot(categories, version)
+
+    def snapshot(self):
+        interval = getattr(settings, 'NOMINEE_CATALOG_CHECK_INTERVAL', 5)
+        now = time.monotonic()
+        if self._snapshot is not None and now - self._checked_at < interval:
+            return self._snapshot
+
+        with self._lock:
+            if self._snapshot is not None and now - self._checked_at < interval:
+                return self._snapshot
+            if self._snapshot is not None and snapshot_expired(self._loaded_at, now):
+                # Per-process cache: a new local version changes the validators with the payload
+                version = _new_version()
+                cache.set(self.VERSION_KEY, version, timeout=None)
+            else:
+                version = self._current_version()
+            if self._snapshot is None or version != self._version:
+                self._snapshot = self._load(version)
+                self._version = version
+                self._loaded_at = now
+            self._checked_at = now
+            return self._snapshot
+
+    def nominee(self, nominee_id, category_id):
+        """Nominee (with .category loaded) if it belongs to the category, else None."""
+        nominee = self.snapshot().nominees.get(nominee_id)
+        if nominee is None or nominee.category_id != category_id:
+            return None
+        return nominee
+
+    def categories_payload(self):
+        """Serialized categories with nominees, as returned by AwardsCategoryListAPIView."""
+        return self.snapshot().payload
+
+    def validators(self):
+        """(version, last_modified) of the snapshot categories_payload() serves, for conditional GETs; no query."""
+        version = self.snapshot().version
+        stamp, _, _ = version.partition(':')
+        try:
+            last_modified = datetime.fromtimestamp(float(stamp), tz=dt_timezone.utc)
+        except ValueError:
+            last_modified = None
+        return version, last_modified
+
+    def invalidate(self):
+        """Bump the shared version so every worker reloads on its next check."""
+        cache.set(self.VERSION_KEY, _new_version(), timeout=None)
+        with self._lock:
+            self._snapshot = None
+
+
+nominee_catalog = NomineeCatalog()
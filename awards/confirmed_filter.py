@@ -0,0 +1,190 @@
+"""
+Confirmed Voter Filter
+Bloom filter of the (voter_email, category) pairs that have a confirmed vote,
+so the already-voted pre-check (ballots.confirmed_categories) only queries
+the Vote table for categories the filter cannot rule out. Most voters are new
+and never reach the database there. The ballot write path does not use it:
+it reads the voter's rows in the ballot's categories anyway.
+
+Each process builds its filter from the Vote table on first use.
+Confirmations are published from inside the confirming transaction, after
+its UPDATE and before COMMIT, as one cache entry per batch of pairs numbered
+by a shared sequence. Every check reads the sequence and adds the entries it
+has not seen yet, so a committed confirmation is visible to all workers
+before their next check: the filter never answers "not confirmed" for a
+pair whose confirmation has committed.
+
+The filter is rebuilt from the Vote table when an entry is missing (evicted,
+expired, or its sequence number taken but not stored yet), when the sequence
+went backwards or jumped by more than MAX_PENDING (cache cleared or evicted;
+a new sequence starts at a random offset, so it cannot line up with the old
+one), when it fills past its capacity, and every
+AWARDS_CONFIRMED_FILTER_REBUILD_INTERVAL seconds, which also drops pairs
+whose votes were deleted. A rebuild reads the sequence and scans inside a
+BEGIN IMMEDIATE transaction: confirming transactions hold the write lock
+while they publish, so every confirmation up to that sequence has committed
+by then and is in the scan.
+
+The sequence and entries must be visible to every worker, so the filter is
+only used with a shared cache backend (coreconfig.shared_cache); with a
+per-process cache every check goes to the database.
+"""
+import hashlib
+import math
+import secrets
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from coreconfig.shared_cache import cache_is_shared
+
+from .utils import immediate_atomic
+
+# Seconds a published batch of confirmations stays in the cache
+DELTA_TTL = 900
+
+# Unseen entries applied one by one; a larger gap rebuilds from the Vote table
+MAX_PENDING = 1000
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _key(voter_email, category_id):
+    return f'{voter_email}\x00{category_id}'
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings; no removal."""
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = max(1, capacity)
+        self.size = max(64, int(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        step = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * step) % self.size for i in range(self.hashes)]
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class ConfirmedVoteFilter:
+    SEQUENCE_KEY = 'awards_confirmed_filter_sequence'
+    DELTA_KEY = 'awards_confirmed_filter_delta:{sequence}'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._sequence = 0
+        self._built_at = 0.0
+
+    def enabled(self):
+        return _setting('AWARDS_CONFIRMED_FILTER_ENABLED', True) and cache_is_shared()
+
+    def _current_sequence(self):
+        """The shared sequence, created at a random offset when missing."""
+        sequence = cache.get(self.SEQUENCE_KEY)
+        if sequence is None:
+            cache.add(self.SEQUENCE_KEY, secrets.randbelow(1 << 48), timeout=None)
+            sequence = cache.get(self.SEQUENCE_KEY)
+        return sequence
+
+    def _next_sequence(self):
+        try:
+            return cache.incr(self.SEQUENCE_KEY)
+        except ValueError:
+            self._current_sequence()
+            return cache.incr(self.SEQUENCE_KEY)
+
+    def _build(self):
+        from .models import Vote
+
+        # Confirming transactions publish while holding the write lock, so
+        # once it is ours every sequence number read here has committed
+        with immediate_atomic():
+            sequence = self._current_sequence()
+            pairs = list(Vote.objects.filter(is_confirmed=True).values_list('voter_email', 'category_id'))
+        bloom = BloomFilter(
+            max(_setting('AWARDS_CONFIRMED_FILTER_CAPACITY', 100000), 2 * len(pairs)),
+            _setting('AWARDS_CONFIRMED_FILTER_ERROR_RATE', 0.001),
+        )
+        for voter_email, category_id in pairs:
+            bloom.add(_key(voter_email, category_id))
+        return bloom, sequence
+
+    def _apply_deltas(self, current):
+        """Add entries up to `current`; False when one is missing."""
+        entries = cache.get_many([
+            self.DELTA_KEY.format(sequence=sequence) for sequence in range(self._sequence + 1, current + 1)
+        ])
+        for sequence in range(self._sequence + 1, current + 1):
+            pairs = entries.get(self.DELTA_KEY.format(sequence=sequence))
+            if pairs is None:
+                return False
+            for voter_email, category_id in pairs:
+                self._bloom.add(_key(voter_email, category_id))
+            self._sequence = sequence
+        return True
+
+    def _sync(self):
+        current = self._current_sequence()
+        with self._lock:
+            if (
+                self._bloom is not None
+                and self._sequence <= current <= self._sequence + MAX_PENDING
+                and time.monotonic() - self._built_at < _setting('AWARDS_CONFIRMED_FILTER_REBUILD_INTERVAL', 600)
+                and (current == self._sequence or self._apply_deltas(current))
+                and self._bloom.count <= self._bloom.capacity
+            ):
+                return self._bloom
+
+        # Built outside the lock: the build waits for the database write lock,
+        # and checks in other threads keep using the current filter meanwhile
+        bloom, sequence = self._build()
+        with self._lock:
+            self._bloom = bloom
+            self._sequence = sequence
+            self._built_at = time.monotonic()
+        return bloom
+
+    def might_contain(self, voter_email, category_ids):
+        """The subset of category_ids the voter may have confirmed a vote in."""
+        if not self.enabled():
+            return set(category_ids)
+        bloom = self._sync()
+        return {category_id for category_id in category_ids if _key(voter_email, category_id) in bloom}
+
+    def add(self, pairs):
+        """
+        Publish confirmed (voter_email, category_id) pairs. Call inside the
+        confirming transaction, after its write: the entry must be stored
+        before the confirmation commits. A rollback only leaves extra pairs,
+        which cost a query but never skip one.
+        """
+        pairs = [[voter_email, category_id] for voter_email, category_id in pairs]
+        if not pairs or not self.enabled():
+            return
+        sequence = self._next_sequence()
+        cache.set(self.DELTA_KEY.format(sequence=sequence), pairs, timeout=DELTA_TTL)
+        bloom = self._bloom
+        if bloom is not None:
+            # This process sees its own confirmations without waiting for a check
+            for voter_email, category_id in pairs:
+                bloom.add(_key(voter_email, category_id))
+
+
+confirmed_vote_filter = ConfirmedVoteFilter()
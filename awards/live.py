@@ -0,0 +1,223 @@
+"""
+Live Results Feed
+Server-sent events for the admin vote summary. Tally changes (awards.tallies)
+are published after commit as one cache entry per change, numbered by a
+shared sequence; every open stream polls the sequence and forwards the new
+entries as per-category `tally` events, so viewers do not re-run the summary
+query. Events carry the nominee's current counts next to the deltas, which
+makes replays and out-of-order delivery harmless.
+
+Nothing is published while nobody watches: streams refresh a viewer
+heartbeat and publishers skip the tally read when it is stale. Fan-out
+across workers needs a shared cache backend (LocMemCache is per process).
+
+A stream ends after AWARDS_LIVE_FEED_MAX_DURATION seconds so it does not pin
+a WSGI worker; EventSource reconnects with Last-Event-ID and resumes from
+the cache, or gets a fresh snapshot when those events have expired.
+"""
+import asyncio
+import json
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+
+KEEPALIVE_INTERVAL = 15
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _format(event, data, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {event}')
+    lines.append('data: ' + json.dumps(data, cls=DjangoJSONEncoder, separators=(',', ':')))
+    return '\n'.join(lines) + '\n\n'
+
+
+def _tally_rows(nominee_ids=None):
+    from .models import NomineeTally
+    from .tallies import with_live_counts
+
+    tallies = NomineeTally.objects.all()
+    if nominee_ids is not None:
+        tallies = tallies.filter(nominee_id__in=list(nominee_ids))
+    # Expired unconfirmed votes are left out, as in the summary table
+    return with_live_counts(tallies).values(
+        'category_id', 'category__title', 'nominee_id', 'nominee__nominee',
+        'confirmed', 'live_unconfirmed', 'updated_at',
+    ).order_by('category__title', 'nominee__nominee')
+
+
+def _nominee_row(row, delta=None):
+    item = {
+        'nominee_id': row['nominee_id'],
+        'nominee': row['nominee__nominee'],
+        'confirmed': row['confirmed'],
+        'unconfirmed': row['live_unconfirmed'],
+        'updated_at': row['updated_at'],
+    }
+    if delta is not None:
+        item['confirmed_delta'], item['unconfirmed_delta'] = delta
+    return item
+
+
+def _group_by_category(rows, deltas=None):
+    categories = {}
+    for row in rows:
+        category = categories.setdefault(row['category_id'], {
+            'category_id': row['category_id'],
+            'category': row['category__title'],
+            'nominees': [],
+        })
+        delta = deltas.get(row['nominee_id']) if deltas is not None else None
+        category['nominees'].append(_nominee_row(row, delta))
+    return list(categories.values())
+
+
+class TallyFeed:
+    """Cache-backed publish/subscribe of tally changes."""
+
+    SEQUENCE_KEY = 'awards_live_feed_sequence'
+    EVENT_KEY = 'awards_live_feed_event:{sequence}'
+    VIEWERS_KEY = 'awards_live_feed_viewers'
+
+    def has_viewers(self):
+        seen_at = cache.get(self.VIEWERS_KEY)
+        return seen_at is not None and time.time() - seen_at < 3 * _setting('AWARDS_LIVE_FEED_POLL_INTERVAL', 1.0) + 5
+
+    def touch_viewers(self):
+        cache.set(self.VIEWERS_KEY, time.time(), timeout=60)
+
+    def current_sequence(self):
+        return cache.get(self.SEQUENCE_KEY) or 0
+
+    def _next_sequence(self):
+        try:
+            return cache.incr(self.SEQUENCE_KEY)
+        except ValueError:
+            cache.add(self.SEQUENCE_KEY, 0, timeout=None)
+            return cache.incr(self.SEQUENCE_KEY)
+
+    def publish(self, nominee_ids, deltas=None):
+        """
+        Publish the current tallies of `nominee_ids` (all nominees when None);
+        deltas maps nominee_id to (confirmed, unconfirmed) changes and is None
+        for recomputed tallies.
+        """
+        if nominee_ids is not None and not nominee_ids:
+            return None
+        if not self.has_viewers():
+            return None
+        categories = _group_by_category(_tally_rows(nominee_ids), deltas)
+        if not categories:
+            return None
+        sequence = self._next_sequence()
+        cache.set(self.EVENT_KEY.format(sequence=sequence), categories,
+                  timeout=_setting('AWARDS_LIVE_FEED_EVENT_TTL', 300))
+        return sequence
+
+    def read(self, first, last):
+        """{sequence: categories} for the entries still in the cache."""
+        keys = {self.EVENT_KEY.format(sequence=sequence): sequence for sequence in range(first, last + 1)}
+        found = cache.get_many(list(keys))
+        return {keys[key]: categories for key, categories in found.items()}
+
+
+tally_feed = TallyFeed()
+
+
+class FeedCursor:
+    """Position of one stream in the feed; open() and poll() return SSE chunks."""
+
+    # Polls to wait for an entry whose sequence number is taken but not yet stored
+    MISSING_ENTRY_POLLS = 3
+
+    def __init__(self, feed, last_event_id=None):
+        self.feed = feed
+        self.last = None
+        self.missing_polls = 0
+        if last_event_id:
+            try:
+                self.last = int(last_event_id)
+            except ValueError:
+                pass
+
+    def _snapshot(self):
+        self.last = self.feed.current_sequence()
+        self.missing_polls = 0
+        retry_ms = int(_setting('AWARDS_LIVE_FEED_RETRY_MS', 3000))
+        return [f'retry: {retry_ms}\n\n', _format('snapshot', _group_by_category(_tally_rows()), self.last)]
+
+    def open(self):
+        self.feed.touch_viewers()
+        if self.last is None or self.last > self.feed.current_sequence():
+            return self._snapshot()
+        return self.poll()
+
+    def poll(self):
+        self.feed.touch_viewers()
+        current = self.feed.current_sequence()
+        if current < self.last:
+            # Sequence was reset (cache flushed or evicted)
+            return self._snapshot()
+        if current == self.last:
+            return []
+
+        entries = self.feed.read(self.last + 1, current)
+        chunks = []
+        for sequence in range(self.last + 1, current + 1):
+            categories = entries.get(sequence)
+            if categories is None:
+                self.missing_polls += 1
+                if self.missing_polls >= self.MISSING_ENTRY_POLLS:
+                    # Expired or lost: the deltas cannot be replayed, start over
+                    return chunks + self._snapshot()
+                break
+            self.missing_polls = 0
+            self.last = sequence
+            chunks.extend(_format('tally', category, sequence) for category in categories)
+        return chunks
+
+
+def event_stream(last_event_id=None):
+    """Iterator for StreamingHttpResponse under WSGI."""
+    cursor = FeedCursor(tally_feed, last_event_id)
+    interval = _setting('AWARDS_LIVE_FEED_POLL_INTERVAL', 1.0)
+    deadline = time.monotonic() + _setting('AWARDS_LIVE_FEED_MAX_DURATION', 300)
+    yield from cursor.open()
+    sent_at = time.monotonic()
+    while time.monotonic() < deadline:
+        time.sleep(interval)
+        chunks = cursor.poll()
+        if chunks:
+            yield from chunks
+            sent_at = time.monotonic()
+        elif time.monotonic() - sent_at >= KEEPALIVE_INTERVAL:
+            yield ': keepalive\n\n'
+            sent_at = time.monotonic()
+
+
+async def async_event_stream(last_event_id=None):
+    """Async iterator for StreamingHttpResponse under ASGI; waits without holding a thread."""
+    cursor = FeedCursor(tally_feed, last_event_id)
+    interval = _setting('AWARDS_LIVE_FEED_POLL_INTERVAL', 1.0)
+    deadline = time.monotonic() + _setting('AWARDS_LIVE_FEED_MAX_DURATION', 300)
+    for chunk in await sync_to_async(cursor.open)():
+        yield chunk
+    sent_at = time.monotonic()
+    while time.monotonic() < deadline:
+        await asyncio.sleep(interval)
+        chunks = await sync_to_async(cursor.poll)()
+        if chunks:
+            for chunk in chunks:
+                yield chunk
+            sent_at = time.monotonic()
+        elif time.monotonic() - sent_at >= KEEPALIVE_INTERVAL:
+            yield ': keepalive\n\n'
+            sent_at = time.monotonic()
@@ -0,0 +1,90 @@
+"""
+Django management command to benchmark VoteSubmissionAPIView (validation,
+ballot write and confirmation email enqueue) against a throwaway copy of the
+database. RabbitMQ is replaced by an in-process stand-in so only the
+application and database work is measured.
+
+Usage:
+    python manage.py benchmark_votes
+    python manage.py benchmark_votes --categories 12 --iterations 500 --json before.json
+    python manage.py benchmark_votes --compare before.json
+"""
+import json
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from rest_framework.permissions import AllowAny
+
+from awards.models import Category, Nominee
+from awards.views import VoteSubmissionAPIView
+from coreconfig.benchmarking import (
+    format_results,
+    local_broker,
+    read_report,
+    run_benchmark,
+    throwaway_database,
+    write_report,
+)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark ballot submission (ops/sec, latency and queries per ballot)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--categories', type=int, default=10,
+                            help='Categories on the ballot, one vote each (default: 10)')
+        parser.add_argument('--iterations', type=int, default=300,
+                            help='Ballots per benchmark and thread configuration (default: 300)')
+        parser.add_argument('--threads', default='1',
+                            help='Comma-separated thread counts (default: 1; SQLite serializes writes)')
+        parser.add_argument('--warmup', type=int, default=10, help='Untimed warmup ballots (default: 10)')
+        parser.add_argument('--sqlite-file', default=None,
+                            help='Path for the scratch SQLite database (default: temporary file)')
+        parser.add_argument('--json', dest='json_path', default=None, help='Write results to this JSON file')
+        parser.add_argument('--compare', default=None, help='Show ops/sec change against a previous JSON report')
+
+    def handle(self, *args, **options):
+        thread_counts = [int(t) for t in options['threads'].split(',') if t.strip()]
+        iterations = options['iterations']
+        warmup = options['warmup']
+
+        results = []
+        with throwaway_database(options['sqlite_file']), local_broker() as channel:
+            ballot = []
+            for index in range(options['categories']):
+                category = Category.objects.create(title=f'Benchmark category {index}', priority=index)
+                nominees = Nominee.objects.bulk_create(
+                    Nominee(category=category, nominee=f'Nominee {index}-{n}') for n in range(3)
+                )
+                ballot.append({'category_id': category.id, 'nominee_id': nominees[0].id})
+
+            view = VoteSubmissionAPIView.as_view(permission_classes=[AllowAny])
+            factory = RequestFactory()
+
+            def submit(email):
+                body = json.dumps({'voterName': 'Bench Voter', 'voterEmail': email, 'votes': ballot})
+                response = view(factory.post('/api/awards/votes/', data=body, content_type='application/json'))
+                if response.status_code != 201:
+                    raise RuntimeError(f'HTTP {response.status_code}')
+
+            for threads in thread_counts:
+                results.append(run_benchmark(
+                    'vote_submit.new_voter',
+                    lambda i: submit(f'new-{threads}-{i}@bench.local'),
+                    iterations, threads, warmup,
+                ))
+                # Same 20 voters over and over: every ballot replaces an unconfirmed one
+                results.append(run_benchmark(
+                    'vote_submit.replace_unconfirmed',
+                    lambda i: submit(f'repeat-{threads}-{i % 20}@bench.local'),
+                    iterations, threads, warmup,
+                ))
+            published = channel.published
+
+        baseline = read_report(options['compare']) if options['compare'] else None
+        self.stdout.write(format_results(results, baseline))
+        self.stdout.write(f'Confirmation emails published to the stand-in broker: {published}')
+        if options['json_path']:
+            write_report(options['json_path'], results,
+                         {'iterations': iterations, 'categories': options['categories']})
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['json_path']}"))
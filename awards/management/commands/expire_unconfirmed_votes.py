@@ -0,0 +1,82 @@
+"""
+Django management command to delete unconfirmed votes older than
+AWARDS_UNCONFIRMED_VOTE_TTL_HOURS, in small chunks so ballot writers are
+never stuck behind one long delete. Nominee tallies are adjusted in the same
+transaction as each chunk. The admin summary and live feed already leave
+expired votes out before they are deleted (awards.tallies.with_live_counts),
+but recount the rows still waiting here once a minute, so keep the sweeper
+scheduled.
+
+Usage:
+    python manage.py expire_unconfirmed_votes
+    python manage.py expire_unconfirmed_votes --hours 48 --chunk-size 500 --dry-run
+
+Run every few minutes from cron or a systemd timer (each run only reads
+the partial index of unconfirmed votes up to the cutoff), e.g.:
+
+    */10 * * * * cd /path/to/project && python manage.py expire_unconfirmed_votes
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from awards.models import Vote
+from awards.tallies import apply_deletion
+from awards.utils import immediate_atomic
+
+
+class Command(BaseCommand):
+    help = 'Delete unconfirmed votes past their confirmation TTL, in chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hours',
+            type=int,
+            default=getattr(settings, 'AWARDS_UNCONFIRMED_VOTE_TTL_HOURS', 0),
+            help='Expire unconfirmed votes older than this many hours (default: AWARDS_UNCONFIRMED_VOTE_TTL_HOURS)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Votes deleted per transaction (default: 1000)',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=0.05,
+            help='Seconds to pause between chunks so request writers get the lock (default: 0.05)',
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Only count expired votes')
+
+    def handle(self, *args, **options):
+        if not options['hours']:
+            self.stdout.write(self.style.WARNING('Vote expiry is disabled (AWARDS_UNCONFIRMED_VOTE_TTL_HOURS=0).'))
+            return
+
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+        expired = Vote.objects.filter(is_confirmed=False, created_at__lt=cutoff)
+        if options['dry_run']:
+            self.stdout.write(f'{expired.count()} unconfirmed vote(s) created before {cutoff:%Y-%m-%d %H:%M} would expire')
+            return
+
+        total = 0
+        while True:
+            # Write lock taken at BEGIN: no vote can be confirmed between the SELECT and the delete
+            with immediate_atomic():
+                rows = list(expired.order_by('created_at', 'id').values_list('id', 'nominee_id')[:options['chunk_size']])
+                if not rows:
+                    break
+                Vote.objects.filter(id__in=[vote_id for vote_id, _ in rows]).delete()
+                apply_deletion([(nominee_id, False) for _, nominee_id in rows])
+            total += len(rows)
+            self.stdout.write(f'Expired {total} unconfirmed votes so far...')
+            if options['sleep']:
+                time.sleep(options['sleep'])
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Expired {total} unconfirmed vote(s) created before {cutoff:%Y-%m-%d %H:%M}')
+        )
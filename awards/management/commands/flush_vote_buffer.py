@@ -0,0 +1,62 @@
+"""
+Django management command to store ballots spooled by the vote ingestion
+buffer (AWARDS_VOTE_BUFFER_ENABLED) in batched transactions.
+Run it as a background process while the buffer is enabled, and once more
+after disabling it so no spooled ballot is left behind.
+
+Usage:
+    python manage.py flush_vote_buffer
+    python manage.py flush_vote_buffer --once
+    python manage.py flush_vote_buffer --interval 0.5 --batch-size 1000
+
+For production, run this as a systemd service or supervisor process.
+"""
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+
+from awards.vote_buffer import flush, vote_buffer
+from logs.slow_queries import capture_slow_queries
+
+
+class Command(BaseCommand):
+    help = 'Store spooled ballots from the vote ingestion buffer'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.should_stop = False
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Flush what is spooled now and exit')
+        parser.add_argument('--interval', type=float, default=1.0,
+                            help='Seconds between flushes (default: 1.0)')
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help='Ballots per transaction (default: AWARDS_VOTE_BUFFER_BATCH_SIZE)')
+
+    def signal_handler(self, signum, frame):
+        """Finish the current flush, then stop"""
+        self.stdout.write(self.style.WARNING('\nShutting down after the current flush...'))
+        self.should_stop = True
+
+    def flush_once(self, batch_size):
+        started = time.perf_counter()
+        accepted, rejected = flush(batch_size)
+        if accepted or rejected:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.stdout.write(f'Stored {accepted} ballot(s), rejected {rejected} in {elapsed_ms:.0f} ms')
+
+    def handle(self, *args, **options):
+        with capture_slow_queries('command:flush_vote_buffer'):
+            if options['once']:
+                self.flush_once(options['batch_size'])
+                return
+
+            signal.signal(signal.SIGINT, self.signal_handler)
+            signal.signal(signal.SIGTERM, self.signal_handler)
+            self.stdout.write(self.style.SUCCESS(f'Flushing vote buffer in {vote_buffer.directory}'))
+            while not self.should_stop:
+                self.flush_once(options['batch_size'])
+                time.sleep(options['interval'])
+            # Ballots accepted while stopping
+            self.flush_once(options['batch_size'])
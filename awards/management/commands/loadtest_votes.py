@@ -0,0 +1,381 @@
+"""
+Django management command to load test the full voter flow against a
+throwaway copy of the database:
+
+    GET  /api/security/csrf-token/
+    POST /api/awards/votes/
+    GET  /api/awards/votes/confirm/   (link taken from the confirmation email)
+
+Virtual voters run the flow at each configured concurrency through the WSGI
+application in-process (default) or over HTTP against a threaded Django test
+server (--server live). RabbitMQ is replaced by an in-process stand-in,
+email goes to the locmem backend and the cache to a private LocMemCache, so
+nothing leaves the machine and a shared cache is left alone. Reports
+throughput, p50/p95/p99 latency and SQL statements per step, and errors by
+type (rate limit, CSRF token, SQLite lock, ...). Exception types and per-step
+statement counts are only available in-process.
+
+With AWARDS_VOTE_BUFFER_ENABLED the vote step returns 202; spooled ballots
+are flushed after each run (timed separately) and then confirmed.
+
+Usage:
+    python manage.py loadtest_votes
+    python manage.py loadtest_votes --categories 20 --nominees 8 --voters 2000 --concurrency 1,8,32
+    python manage.py loadtest_votes --server live --json awards-night.json
+    python manage.py loadtest_votes --shared-ip   # every voter from one IP: shows rate limiting
+"""
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection
+from django.test import Client, override_settings
+from django.test.testcases import LiveServerThread
+from django.urls import reverse
+
+from awards.models import Category, Nominee
+from coreconfig.benchmarking import (
+    StatementCounter,
+    environment_info,
+    local_broker,
+    percentile,
+    throwaway_database,
+)
+from coreconfig.service import email_service
+
+STEPS = ('csrf_token', 'vote', 'confirm')
+LOADTEST_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'loadtest_votes',
+    }
+}
+
+
+class _Response:
+    def __init__(self, status_code, body, exception=None):
+        self.status_code = status_code
+        self.body = body
+        self.exception = exception
+
+    def json(self):
+        try:
+            return json.loads(self.body)
+        except ValueError:
+            return {}
+
+
+class WSGITransport:
+    """Requests through django.test.Client (full middleware stack, same process)."""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _client(self):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = Client(raise_request_exception=False)
+        return client
+
+    def request(self, method, path, headers, body=None):
+        extra = {'HTTP_' + name.upper().replace('-', '_'): value for name, value in headers.items()}
+        if method == 'POST':
+            response = self._client().post(path, data=body, content_type='application/json', **extra)
+        else:
+            response = self._client().get(path, **extra)
+        exc_info = getattr(response, 'exc_info', None)
+        return _Response(response.status_code, response.content, exc_info[1] if exc_info else None)
+
+    def close(self):
+        pass
+
+
+class LiveServerTransport:
+    """Requests over HTTP to a threaded Django test server started in this process."""
+
+    def __init__(self):
+        self.thread = LiveServerThread('localhost', lambda handler: handler)
+        self.thread.daemon = True
+        self.thread.start()
+        self.thread.is_ready.wait()
+        if self.thread.error:
+            raise self.thread.error
+        self.base_url = f'http://localhost:{self.thread.port}'
+
+    def request(self, method, path, headers, body=None):
+        request = urllib.request.Request(
+            self.base_url + path,
+            data=body.encode('utf-8') if body is not None else None,
+            headers=dict(headers, **({'Content-Type': 'application/json'} if body is not None else {})),
+            method=method,
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                return _Response(response.status, response.read())
+        except urllib.error.HTTPError as error:
+            return _Response(error.code, error.read())
+        except OSError as error:
+            return _Response(0, b'', error)
+
+    def close(self):
+        self.thread.terminate()
+
+
+def classify(response):
+    """Error type of a failed response, or None when it succeeded."""
+    exception = response.exception
+    if exception is not None:
+        if isinstance(exception, OperationalError) and 'locked' in str(exception):
+            return 'sqlite_locked'
+        return f'exception:{type(exception).__name__}'
+    status_code = response.status_code
+    if status_code in (200, 201, 202):
+        return None
+    detail = str(response.json().get('detail', '')) if status_code in (400, 403, 429) else ''
+    if status_code == 429 or 'Rate limit' in detail:
+        return 'rate_limit'
+    if status_code == 403 and 'CSRF token' in detail:
+        return 'csrf_token'
+    if status_code == 403 and 'origin' in detail:
+        return 'origin'
+    if status_code == 400:
+        return 'already_voted' if response.json().get('error') == 'already_voted_in_category' else 'validation'
+    if status_code == 500:
+        return 'server_error'
+    if status_code == 0:
+        return 'connection'
+    return f'http_{status_code}'
+
+
+class Command(BaseCommand):
+    help = 'Load test CSRF token + vote + confirmation at configurable concurrency and scale'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--categories', type=int, default=10, help='Synthetic categories (default: 10)')
+        parser.add_argument('--nominees', type=int, default=5, help='Nominees per category (default: 5)')
+        parser.add_argument('--votes-per-ballot', type=int, default=None,
+                            help='Categories voted per ballot, chosen at random (default: all)')
+        parser.add_argument('--voters', type=int, default=500,
+                            help='Virtual voters per concurrency level, one flow each (default: 500)')
+        parser.add_argument('--concurrency', default='1,4,16',
+                            help='Comma-separated concurrent voter counts (default: 1,4,16)')
+        parser.add_argument('--confirm-ratio', type=float, default=1.0,
+                            help='Fraction of voters who follow the confirmation link (default: 1.0)')
+        parser.add_argument('--server', choices=['wsgi', 'live'], default='wsgi',
+                            help='wsgi: in-process WSGI app; live: HTTP to a threaded test server')
+        parser.add_argument('--shared-ip', action='store_true',
+                            help='Send every voter from the same client IP (default: one IP per voter)')
+        parser.add_argument('--origin', default=None,
+                            help='Origin header (default: first CORS_ALLOWED_ORIGINS entry)')
+        parser.add_argument('--deliver-emails', action='store_true',
+                            help='Render and send each confirmation email (locmem backend) as it is queued')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed for ballots (default: 1)')
+        parser.add_argument('--sqlite-file', default=None,
+                            help='Path for the scratch SQLite database (default: temporary file)')
+        parser.add_argument('--json', dest='json_path', default=None, help='Write results to this JSON file')
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.random = random.Random(options['seed'])
+        self.confirm_urls = {}
+        self.confirm_lock = threading.Lock()
+        origins = getattr(settings, 'CORS_ALLOWED_ORIGINS', [])
+        self.origin = options['origin'] or (origins[0] if origins else 'http://localhost')
+
+        levels = [int(value) for value in options['concurrency'].split(',') if value.strip()]
+        reports = []
+        # A private in-process cache: clearing it must not touch a shared
+        # backend's rate limits, version keys or filter sequences
+        with override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend', CACHES=LOADTEST_CACHES), \
+                throwaway_database(options['sqlite_file']), \
+                local_broker(on_publish=self.email_published):
+            cache.clear()
+            self.ballot_choices = self.create_catalog()
+            if options['server'] == 'live':
+                # The live server's threads open their own connections to the scratch file
+                connection.close()
+            transport = LiveServerTransport() if options['server'] == 'live' else WSGITransport()
+            try:
+                for level, concurrency in enumerate(levels):
+                    report = self.run_level(transport, concurrency, f'lt{level}')
+                    reports.append(report)
+                    self.stdout.write(self.format_report(report))
+            finally:
+                transport.close()
+
+        if options['json_path']:
+            with open(options['json_path'], 'w') as fh:
+                json.dump({
+                    'environment': environment_info(),
+                    'scale': {key: options[key] for key in ('categories', 'nominees', 'votes_per_ballot', 'voters')},
+                    'server': options['server'],
+                    'results': reports,
+                }, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['json_path']}"))
+
+    def create_catalog(self):
+        choices = []
+        for index in range(self.options['categories']):
+            category = Category.objects.create(title=f'Load test category {index}', priority=index)
+            nominees = Nominee.objects.bulk_create(
+                Nominee(category=category, nominee=f'Nominee {index}-{n}') for n in range(self.options['nominees'])
+            )
+            choices.append((category.id, [nominee.id for nominee in nominees]))
+        return choices
+
+    def email_published(self, task):
+        if self.options['deliver_emails']:
+            email_service.process_email_task(task)
+        confirm_url = (task.get('context') or {}).get('confirm_url')
+        if confirm_url:
+            with self.confirm_lock:
+                self.confirm_urls[task['recipients'][0]] = confirm_url
+
+    def ballot(self, email):
+        categories = self.ballot_choices
+        per_ballot = self.options['votes_per_ballot']
+        if per_ballot:
+            categories = self.random.sample(categories, min(per_ballot, len(categories)))
+        return json.dumps({
+            'voterName': 'Load Test Voter',
+            'voterEmail': email,
+            'votes': [
+                {'category_id': category_id, 'nominee_id': self.random.choice(nominee_ids)}
+                for category_id, nominee_ids in categories
+            ],
+        })
+
+    def run_level(self, transport, concurrency, prefix):
+        voters = self.options['voters']
+        samples = {step: [] for step in STEPS + ('flow',)}
+        errors = {step: {} for step in STEPS}
+        deferred = []
+        lock = threading.Lock()
+        counter = StatementCounter(default_label='server')
+
+        def timed(step, method, path, headers, body=None):
+            counter.set_label(step)
+            started = time.perf_counter()
+            response = transport.request(method, path, headers, body)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            error = classify(response)
+            with lock:
+                samples[step].append(elapsed_ms)
+                if error:
+                    errors[step][error] = errors[step].get(error, 0) + 1
+            return response, error
+
+        def confirm(email, headers):
+            with self.confirm_lock:
+                confirm_url = self.confirm_urls.pop(email, None)
+            if confirm_url is None:
+                with lock:
+                    errors['confirm']['no_confirmation_email'] = errors['confirm'].get('no_confirmation_email', 0) + 1
+                return
+            parts = urlsplit(confirm_url)
+            timed('confirm', 'GET', f'{parts.path}?{parts.query}', headers)
+
+        def flow(index):
+            email = f'{prefix}-voter-{index}@loadtest.local'
+            client_ip = '10.0.0.1' if self.options['shared_ip'] else f'10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}'
+            headers = {'X-Forwarded-For': client_ip, 'Origin': self.origin}
+            with lock:
+                body = self.ballot(email)
+                confirms = self.random.random() < self.options['confirm_ratio']
+            started = time.perf_counter()
+
+            response, error = timed('csrf_token', 'GET', reverse('security:csrf-token'), headers)
+            if error:
+                return
+            vote_headers = dict(headers, **{'X-CSRF-Token': response.json().get('csrf_token', '')})
+            response, error = timed('vote', 'POST', reverse('awards-vote-submit'), vote_headers, body)
+            if error:
+                return
+            if response.status_code == 202:
+                # Spooled: the flow ends at the acknowledgement, confirmed after the flush
+                with lock:
+                    samples['flow'].append((time.perf_counter() - started) * 1000)
+                    if confirms:
+                        deferred.append((email, headers))
+                return
+            if confirms:
+                confirm(email, headers)
+            with lock:
+                samples['flow'].append((time.perf_counter() - started) * 1000)
+
+        flush_ms = None
+        with counter.installed():
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                list(pool.map(flow, range(voters)))
+            elapsed = time.perf_counter() - started
+
+            if deferred:
+                from awards.vote_buffer import flush
+                counter.set_label('flush')
+                flush_started = time.perf_counter()
+                flush()
+                flush_ms = (time.perf_counter() - flush_started) * 1000
+                with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                    list(pool.map(lambda item: confirm(*item), deferred))
+
+        steps = []
+        for step in STEPS + ('flow',):
+            latencies = sorted(samples[step])
+            step_errors = errors.get(step, {})
+            requests = len(latencies)
+            steps.append({
+                'step': step,
+                'requests': requests,
+                'ok': requests - sum(step_errors.values()) if step != 'flow' else requests,
+                'p50_ms': round(percentile(latencies, 50), 2),
+                'p95_ms': round(percentile(latencies, 95), 2),
+                'p99_ms': round(percentile(latencies, 99), 2),
+                'statements_per_request': (
+                    round(counter.counts.get(step, 0) / requests, 2)
+                    if requests and step != 'flow' and self.options['server'] == 'wsgi' else None
+                ),
+                'errors': step_errors,
+            })
+        total_requests = sum(len(samples[step]) for step in STEPS)
+        return {
+            'concurrency': concurrency,
+            'voters': voters,
+            'elapsed_s': round(elapsed, 3),
+            'flows_per_sec': round(len(samples['flow']) / elapsed, 1) if elapsed else 0.0,
+            'requests_per_sec': round(total_requests / elapsed, 1) if elapsed else 0.0,
+            'flush_ms': round(flush_ms, 1) if flush_ms is not None else None,
+            'statements': dict(counter.counts),
+            'steps': steps,
+        }
+
+    def format_report(self, report):
+        lines = [
+            '',
+            f"Concurrency {report['concurrency']}: {report['voters']} voters in {report['elapsed_s']} s, "
+            f"{report['flows_per_sec']} completed flows/s, {report['requests_per_sec']} requests/s",
+        ]
+        if report['flush_ms'] is not None:
+            lines.append(f"Vote buffer flushed in {report['flush_ms']} ms")
+        header = f"{'step':<12} {'requests':>8} {'ok':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'stmt/req':>8}"
+        lines.extend([header, '-' * len(header)])
+        for step in report['steps']:
+            statements = step['statements_per_request']
+            line = (
+                f"{step['step']:<12} {step['requests']:>8} {step['ok']:>8} {step['p50_ms']:>9.2f} "
+                f"{step['p95_ms']:>9.2f} {step['p99_ms']:>9.2f} {'-' if statements is None else statements:>8}"
+            )
+            if step['errors']:
+                line += f"  errors={step['errors']}"
+            lines.append(line)
+        if self.options['server'] == 'live':
+            lines.append(f"SQL statements (server threads): {report['statements'].get('server', 0)}")
+        return '\n'.join(lines)
@@ -0,0 +1,39 @@
+"""
+Django management command to verify NomineeTally against a full recount of
+Vote and repair any drift (e.g. from bulk updates made outside the app).
+Run it periodically (cron) and after manual data fixes.
+
+Usage:
+    python manage.py reconcile_tallies
+    python manage.py reconcile_tallies --dry-run
+"""
+from django.core.management.base import BaseCommand
+
+from awards.tallies import find_drift, refresh_tallies
+from awards.utils import immediate_atomic
+
+
+class Command(BaseCommand):
+    help = 'Compare nominee tallies with a recount of votes and fix differences'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report drift, do not fix it')
+
+    def handle(self, *args, **options):
+        with immediate_atomic():
+            drift = find_drift()
+            for nominee_id, stored, actual in drift:
+                stored_text = 'missing' if stored is None else f'{stored[0]} confirmed / {stored[1]} unconfirmed'
+                self.stdout.write(
+                    f'Nominee {nominee_id}: tally {stored_text}, '
+                    f'recount {actual[0]} confirmed / {actual[1]} unconfirmed'
+                )
+            if drift and not options['dry_run']:
+                refresh_tallies([nominee_id for nominee_id, _, _ in drift])
+
+        if not drift:
+            self.stdout.write(self.style.SUCCESS('All nominee tallies match the votes.'))
+        elif options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'{len(drift)} tally(ies) out of date (dry run, nothing changed).'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'{len(drift)} tally(ies) repaired.'))
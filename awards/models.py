@@ -2,6 +2,7 @@ import uuid
 
 from django.contrib.auth.models import User
 from django.db import models
+from django.utils import timezone
 
 
 class Category(models.Model):
@@ -66,9 +67,44 @@ class Vote(models.Model):
         indexes = [
             models.Index(fields=['voter_email', 'is_confirmed']),
             models.Index(fields=['confirmation_token', 'voter_email']),
+            # Expiry sweep: oldest unconfirmed votes first. Partial, because
+            # is_confirmed=False compiles to NOT is_confirmed, which a
+            # composite (is_confirmed, created_at) index cannot serve
+            models.Index(
+                fields=['created_at'],
+                condition=models.Q(is_confirmed=False),
+                name='awards_vote_unconfirmed_idx',
+            ),
         ]
         unique_together = ('voter_email', 'category', 'is_confirmed')
 
     def __str__(self):
         return f"{self.voter_email} -> {self.nominee.nominee} [{self.category.title}]"
 
+
+class BufferedBallot(models.Model):
+    """
+    Spooled ballot (awards.vote_buffer) that record_ballot_batch has processed,
+    whether it was stored, superseded by a later ballot or rejected. Written in
+    the same transaction as the votes, so replaying a spool file skips it.
+    """
+    batch_id = models.UUIDField(primary_key=True)
+    processed_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return str(self.batch_id)
+
+
+class NomineeTally(models.Model):
+    """Live vote counts per nominee, kept up to date incrementally by awards.tallies."""
+    nominee = models.OneToOneField(Nominee, on_delete=models.CASCADE, primary_key=True, related_name='tally')
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='tallies')
+    confirmed = models.IntegerField(default=0)
+    unconfirmed = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['category__title', 'nominee__nominee']
+
+    def __str__(self):
+        return f"{self.nominee_id}: {self.confirmed} confirmed / {self.unconfirmed} unconfirmed"
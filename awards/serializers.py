@@ -1,5 +1,6 @@
 from rest_framework import serializers
 
+from .catalog import nominee_catalog
 from .models import Category, Nominee
 
 
@@ -31,15 +32,18 @@ class VoteItemSerializer(serializers.Serializer):
         category_id = attrs['category_id']
         nominee_id = attrs['nominee_id']
 
-        try:
-            nominee_obj = Nominee.objects.select_related('category').get(
-                id=nominee_id,
-                category_id=category_id,
-            )
-        except Nominee.DoesNotExist:
-            raise serializers.ValidationError(
-                "Nominee does not exist for the selected category."
-            )
+        nominee_obj = nominee_catalog.nominee(nominee_id, category_id)
+        if nominee_obj is None:
+            # Not in this worker's catalog yet (e.g. added seconds ago); confirm against the database
+            try:
+                nominee_obj = Nominee.objects.select_related('category').get(
+                    id=nominee_id,
+                    category_id=category_id,
+                )
+            except Nominee.DoesNotExist:
+                raise serializers.ValidationError(
+                    "Nominee does not exist for the selected category."
+                )
 
         attrs['category_obj'] = nominee_obj.category
         attrs['nominee_obj'] = nominee_obj
@@ -0,0 +1,25 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .catalog import nominee_catalog
+from .models import Category, Nominee, NomineeTally
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Nominee)
+@receiver(post_delete, sender=Nominee)
+def invalidate_nominee_catalog(sender, **kwargs):
+    """Reload categories and nominees in every worker after an admin change."""
+    nominee_catalog.invalidate()
+
+
+@receiver(post_save, sender=Nominee)
+def ensure_nominee_tally(sender, instance, created, **kwargs):
+    """Every nominee has a tally row; keep its category in step with the nominee."""
+    if created:
+        NomineeTally.objects.get_or_create(nominee=instance, defaults={'category_id': instance.category_id})
+    else:
+        NomineeTally.objects.filter(nominee=instance).exclude(category_id=instance.category_id).update(
+            category_id=instance.category_id
+        )
@@ -0,0 +1,196 @@
+"""
+Nominee Tallies
+Confirmed/unconfirmed vote counts per nominee, adjusted with F() updates in
+the same transaction as the vote writes, so the admin summary reads one row
+per nominee instead of aggregating the Vote table.
+
+Every code path that creates, confirms or deletes votes calls one of the
+apply_* helpers (Vote has no delete signal receivers on purpose: they would
+disable Django's single-statement delete). `reconcile_tallies` recomputes
+the counts from Vote and reports any drift. Changes are published to the
+live results feed (awards.live) once the transaction commits.
+
+Unconfirmed votes past AWARDS_UNCONFIRMED_VOTE_TTL_HOURS stay in the tallies
+until expire_unconfirmed_votes deletes them; the summary and the live feed
+subtract them on read (with_live_counts), so results do not depend on when
+the sweeper last ran. The expired counts are cached per minute of cutoff and
+per oldest expired vote (which every sweep chunk deletes), so a read only
+pays for one partial index lookup.
+"""
+from collections import Counter
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .live import tally_feed
+from .models import Nominee, NomineeTally, Vote
+from .utils import unconfirmed_vote_cutoff
+
+
+def _vote_count(is_confirmed):
+    counts = (
+        Vote.objects.filter(nominee_id=OuterRef('nominee_id'), is_confirmed=is_confirmed)
+        .order_by()
+        .values('nominee_id')
+        .annotate(total=Count('id'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def refresh_tallies(nominee_ids=None):
+    """Recompute tallies from Vote (all nominees when nominee_ids is None), creating missing rows."""
+    if nominee_ids is not None:
+        nominee_ids = list(nominee_ids)
+    nominees = Nominee.objects.all()
+    if nominee_ids is not None:
+        nominees = nominees.filter(id__in=nominee_ids)
+    NomineeTally.objects.bulk_create(
+        [NomineeTally(nominee_id=nominee_id, category_id=category_id)
+         for nominee_id, category_id in nominees.values_list('id', 'category_id')],
+        ignore_conflicts=True,
+    )
+    tallies = NomineeTally.objects.all()
+    if nominee_ids is not None:
+        tallies = tallies.filter(nominee_id__in=nominee_ids)
+    tallies.update(
+        confirmed=_vote_count(True),
+        unconfirmed=_vote_count(False),
+        updated_at=timezone.now(),
+    )
+    transaction.on_commit(lambda: tally_feed.publish(nominee_ids), robust=True)
+
+
+def _adjust(changes):
+    """
+    Apply {nominee_id: (confirmed_delta, unconfirmed_delta)} in one UPDATE.
+    Nominees without a tally row yet are recomputed from Vote instead.
+    """
+    changes = {nominee_id: delta for nominee_id, delta in changes.items() if delta != (0, 0)}
+    if not changes:
+        return
+
+    def delta_case(index):
+        whens = [When(nominee_id=nominee_id, then=Value(delta[index]))
+                 for nominee_id, delta in changes.items() if delta[index]]
+        if not whens:
+            return Value(0)
+        return Case(*whens, default=Value(0), output_field=IntegerField())
+
+    updated = NomineeTally.objects.filter(nominee_id__in=list(changes)).update(
+        confirmed=F('confirmed') + delta_case(0),
+        unconfirmed=F('unconfirmed') + delta_case(1),
+        updated_at=timezone.now(),
+    )
+    if updated < len(changes):
+        existing = set(NomineeTally.objects.filter(nominee_id__in=list(changes)).values_list('nominee_id', flat=True))
+        refresh_tallies(set(changes) - existing)
+    transaction.on_commit(lambda: tally_feed.publish(list(changes), changes), robust=True)
+
+
+def apply_ballot(new_nominee_ids, replaced_nominee_ids=()):
+    """New unconfirmed votes, replacing the voter's previous unconfirmed ones."""
+    changes = {}
+    for nominee_id in new_nominee_ids:
+        confirmed, unconfirmed = changes.get(nominee_id, (0, 0))
+        changes[nominee_id] = (confirmed, unconfirmed + 1)
+    for nominee_id in replaced_nominee_ids:
+        confirmed, unconfirmed = changes.get(nominee_id, (0, 0))
+        changes[nominee_id] = (confirmed, unconfirmed - 1)
+    _adjust(changes)
+
+
+def apply_confirmation(nominee_ids):
+    """Unconfirmed votes that were just confirmed."""
+    changes = {}
+    for nominee_id in nominee_ids:
+        confirmed, unconfirmed = changes.get(nominee_id, (0, 0))
+        changes[nominee_id] = (confirmed + 1, unconfirmed - 1)
+    _adjust(changes)
+
+
+def apply_deletion(votes):
+    """Votes removed from the table; `votes` are (nominee_id, is_confirmed) pairs."""
+    changes = {}
+    for nominee_id, is_confirmed in votes:
+        confirmed, unconfirmed = changes.get(nominee_id, (0, 0))
+        changes[nominee_id] = (confirmed - 1, unconfirmed) if is_confirmed else (confirmed, unconfirmed - 1)
+    _adjust(changes)
+
+
+# Expired counts are recomputed at most once per this many seconds of cutoff
+EXPIRED_COUNTS_GRANULARITY = 60
+EXPIRED_COUNTS_KEY = 'awards_expired_counts:{cutoff}:{oldest}'
+
+
+def expired_unconfirmed_counts():
+    """{nominee_id: expired unconfirmed votes not yet deleted}, read from the partial index."""
+    cutoff = unconfirmed_vote_cutoff()
+    if cutoff is None:
+        return Counter()
+    cutoff = cutoff.replace(second=0, microsecond=0)
+    expired = Vote.objects.filter(is_confirmed=False, created_at__lt=cutoff).order_by()
+    oldest = expired.order_by('created_at', 'id').values_list('id', flat=True).first()
+    if oldest is None:
+        return Counter()
+
+    # A sweep deletes the oldest rows first, which changes the key. A
+    # resubmission that rewrites an expired row is counted until the next minute
+    key = EXPIRED_COUNTS_KEY.format(cutoff=int(cutoff.timestamp()), oldest=oldest)
+    counts = cache.get(key)
+    if counts is None:
+        # No GROUP BY: grouping makes SQLite walk the nominee index instead
+        counts = Counter(expired.values_list('nominee_id', flat=True))
+        cache.set(key, counts, timeout=EXPIRED_COUNTS_GRANULARITY)
+    return counts
+
+
+def with_live_counts(tallies):
+    """Annotate a NomineeTally queryset with live_unconfirmed: unconfirmed minus expired votes."""
+    expired = expired_unconfirmed_counts()
+    if not expired:
+        return tallies.annotate(live_unconfirmed=F('unconfirmed'))
+    return tallies.annotate(live_unconfirmed=F('unconfirmed') - Case(
+        *[When(nominee_id=nominee_id, then=Value(count)) for nominee_id, count in expired.items()],
+        default=Value(0),
+        output_field=IntegerField(),
+    ))
+
+
+def summary_rows():
+    """One row per nominee with votes, shaped like the old aggregate summary."""
+    return (
+        with_live_counts(NomineeTally.objects.all())
+        .filter(Q(confirmed__gt=0) | Q(live_unconfirmed__gt=0))
+        .values('category__id', 'category__title', 'nominee__id', 'nominee__nominee')
+        .annotate(
+            confirmed_votes=F('confirmed'),
+            unconfirmed_votes=F('live_unconfirmed'),
+            total_votes=F('confirmed') + F('live_unconfirmed'),
+        )
+        .order_by('category__title', 'nominee__nominee')
+    )
+
+
+def find_drift():
+    """Tallies that differ from a full recount: [(nominee_id, stored, actual)]."""
+    actual = {}
+    rows = Vote.objects.order_by().values('nominee_id', 'is_confirmed').annotate(total=Count('id'))
+    for row in rows:
+        counts = actual.setdefault(row['nominee_id'], [0, 0])
+        counts[0 if row['is_confirmed'] else 1] = row['total']
+
+    stored = {
+        nominee_id: (confirmed, unconfirmed)
+        for nominee_id, confirmed, unconfirmed in NomineeTally.objects.values_list('nominee_id', 'confirmed', 'unconfirmed')
+    }
+    drift = []
+    for nominee_id in Nominee.objects.values_list('id', flat=True):
+        expected = tuple(actual.get(nominee_id, (0, 0)))
+        current = stored.get(nominee_id)
+        if current != expected:
+            drift.append((nominee_id, current, expected))
+    return drift
@@ -0,0 +1,328 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import uuid
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.contrib import admin
+from django.core.management import call_command
+from django.db import OperationalError, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from coreconfig.benchmarking import local_broker
+from . import ballots
+from .admin import VoteAdmin
+from .ballots import NomineeRemoved, confirmed_categories, record_ballot, record_ballot_batch
+from .catalog import nominee_catalog
+from .confirmed_filter import ConfirmedVoteFilter, confirmed_vote_filter
+from .exports import csv_stream
+from .models import BufferedBallot, Category, Nominee, NomineeTally, Vote
+from .tallies import find_drift, refresh_tallies, summary_rows
+from .vote_buffer import flush
+
+
+@override_settings(VIEW_METRICS_ENABLED=False, SLOW_QUERY_CAPTURE_ENABLED=False)
+class BufferedBallotReplayTests(TestCase):
+    """Replaying a spooled batch after a crash must not change what was stored."""
+
+    def setUp(self):
+        self.category = Category.objects.create(title='Best Operator')
+        self.first = Nominee.objects.create(category=self.category, nominee='A')
+        self.second = Nominee.objects.create(category=self.category, nominee='B')
+        self.emails = []
+
+    def _ballot(self, nominee, token):
+        return {
+            'batch_id': str(uuid.uuid4()),
+            'token': token,
+            'voter_name': 'Voter',
+            'voter_email': 'voter@example.com',
+            'company': '',
+            'position': '',
+            'votes': [[self.category.id, nominee.id]],
+            'confirm_url': f'https://example.com/confirm/{token}',
+        }
+
+    def _record(self, ballots):
+        with local_broker(on_publish=self.emails.append):
+            return record_ballot_batch(ballots)
+
+    def _assert_latest_choice_stored(self):
+        vote = Vote.objects.get(voter_email='voter@example.com')
+        self.assertEqual((vote.nominee_id, vote.confirmation_token), (self.second.id, 'second'))
+        tallies = dict(NomineeTally.objects.values_list('nominee_id', 'unconfirmed'))
+        self.assertEqual(tallies, {self.first.id: 0, self.second.id: 1})
+        self.assertEqual(len(self.emails), 1)
+
+    def test_replaying_a_batch_with_a_superseded_ballot_is_a_no_op(self):
+        ballots = [self._ballot(self.first, 'first'), self._ballot(self.second, 'second')]
+        accepted, rejected = self._record(ballots)
+        self.assertEqual([ballot['token'] for ballot, _, _ in accepted], ['second'])
+        self.assertEqual(rejected, [])
+        self._assert_latest_choice_stored()
+
+        self.assertEqual(self._record(ballots), ([], []))
+        self._assert_latest_choice_stored()
+
+    def test_crash_before_queuing_emails_leaves_votes_unsent(self):
+        ballots = [self._ballot(self.first, 'first')]
+        with mock.patch('awards.ballots.email_service.send_email_tasks', side_effect=RuntimeError('crash')):
+            with self.assertRaises(RuntimeError):
+                self._record(ballots)
+        self.assertEqual(self._record(ballots), ([], []))
+        self.assertFalse(Vote.objects.get(voter_email='voter@example.com').email_sent)
+
+        self._record([self._ballot(self.second, 'second')])
+        self.assertTrue(Vote.objects.get(voter_email='voter@example.com').email_sent)
+
+    def test_flush_skips_processed_ballots_of_an_unremoved_file(self):
+        ballots = [self._ballot(self.first, 'first'), self._ballot(self.second, 'second')]
+        self._record(ballots)
+
+        # Crash after commit, before the claimed spool file was removed
+        directory = tempfile.mkdtemp()
+        with open(os.path.join(directory, 'processing-1-1.jsonl'), 'w', encoding='utf-8') as handle:
+            handle.writelines(json.dumps(ballot) + '\n' for ballot in ballots)
+        with override_settings(AWARDS_VOTE_BUFFER_DIR=directory), local_broker(on_publish=self.emails.append):
+            self.assertEqual(flush(), (0, 0))
+
+        self._assert_latest_choice_stored()
+        self.assertEqual(os.listdir(directory), [])
+        self.assertFalse(BufferedBallot.objects.exists())
+        os.rmdir(directory)
+
+
+@override_settings(AWARDS_UNCONFIRMED_VOTE_TTL_HOURS=48)
+class ExpiredUnconfirmedVoteTests(TestCase):
+    """The summary leaves out expired unconfirmed votes before the sweeper deletes them."""
+
+    def test_summary_skips_expired_unconfirmed_votes(self):
+        cache.clear()
+        category = Category.objects.create(title='Best Operator')
+        nominee = Nominee.objects.create(category=category, nominee='A')
+        for token, hours, confirmed in [('old', 72, False), ('new', 1, False), ('confirmed', 72, True)]:
+            vote = Vote.objects.create(
+                category=category, nominee=nominee, voter_name='Voter', voter_email=f'{token}@example.com',
+                confirmation_token=token, is_confirmed=confirmed,
+            )
+            Vote.objects.filter(pk=vote.pk).update(created_at=timezone.now() - timedelta(hours=hours))
+        refresh_tallies()
+
+        row, = summary_rows()
+        self.assertEqual((row['confirmed_votes'], row['unconfirmed_votes'], row['total_votes']), (1, 1, 2))
+
+        # The sweep deletes the oldest expired vote: the cached counts are not reused
+        call_command('expire_unconfirmed_votes', stdout=io.StringIO())
+        row, = summary_rows()
+        self.assertEqual((row['confirmed_votes'], row['unconfirmed_votes'], row['total_votes']), (1, 1, 2))
+
+
+@override_settings(VIEW_METRICS_ENABLED=False, SLOW_QUERY_CAPTURE_ENABLED=False)
+class ConfirmedVoteFilterTests(TestCase):
+    """Once a confirmation commits, no worker's filter may rule its pair out."""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        shared_cache = override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': self.cache_dir,
+        }})
+        shared_cache.enable()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+        self.addCleanup(shared_cache.disable)
+
+        self.category = Category.objects.create(title='Best Operator')
+        self.nominee = Nominee.objects.create(category=self.category, nominee='A')
+        # Two workers: one confirms, the other checks
+        self.confirming = ConfirmedVoteFilter()
+        self.checking = ConfirmedVoteFilter()
+        self.assertEqual(self.checking.might_contain('voter@example.com', [self.category.id]), set())
+
+    def _confirm(self, voter_email='voter@example.com', publisher=None):
+        with transaction.atomic():
+            Vote.objects.create(
+                category=self.category, nominee=self.nominee, voter_name='Voter', voter_email=voter_email,
+                confirmation_token=uuid.uuid4().hex, is_confirmed=True,
+            )
+            (publisher or self.confirming).add([(voter_email, self.category.id)])
+
+    def test_confirmation_is_seen_by_other_workers_at_their_next_check(self):
+        self._confirm()
+        self.assertEqual(self.checking.might_contain('voter@example.com', [self.category.id]), {self.category.id})
+
+    def test_missing_entry_rebuilds_from_the_vote_table(self):
+        self._confirm()
+        cache.delete(ConfirmedVoteFilter.DELTA_KEY.format(sequence=cache.get(ConfirmedVoteFilter.SEQUENCE_KEY)))
+        self.assertEqual(self.checking.might_contain('voter@example.com', [self.category.id]), {self.category.id})
+
+    def test_cleared_cache_rebuilds_from_the_vote_table(self):
+        cache.clear()
+        self._confirm()
+        self.assertEqual(self.checking.might_contain('voter@example.com', [self.category.id]), {self.category.id})
+
+    def test_per_process_cache_disables_the_filter(self):
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}):
+            self.assertFalse(self.checking.enabled())
+            self._confirm()
+            self.assertIsNone(cache.get(ConfirmedVoteFilter.SEQUENCE_KEY))
+            self.assertEqual(self.checking.might_contain('new@example.com', [self.category.id]), {self.category.id})
+
+    def test_pre_check_rejects_a_voter_confirmed_through_another_worker(self):
+        confirmed_vote_filter.__init__()
+        self.addCleanup(confirmed_vote_filter.__init__)
+        categories = {self.category.id: self.category}
+        self.assertEqual(confirmed_categories('voter@example.com', categories), [])
+        self._confirm()
+
+        self.assertEqual(confirmed_categories('voter@example.com', categories), ['Best Operator'])
+        with self.assertNumQueries(0):
+            self.assertEqual(confirmed_categories('other@example.com', categories), [])
+
+@override_settings(VIEW_METRICS_ENABLED=False, SLOW_QUERY_CAPTURE_ENABLED=False)
+class StaleNomineeCatalogTests(TransactionTestCase):
+    """A worker whose catalog missed another worker's change stays consistent."""
+
+    def setUp(self):
+        self.category = Category.objects.create(title='Best Operator')
+        self.nominee = Nominee.objects.create(category=self.category, nominee='A')
+        nominee_catalog.invalidate()
+        self.addCleanup(nominee_catalog.invalidate)
+
+    def _change_elsewhere(self, change):
+        """Apply `change` without this worker seeing the invalidation (per-process cache)."""
+        snapshot, version = nominee_catalog.snapshot(), nominee_catalog._version
+        change()
+        nominee_catalog._snapshot, nominee_catalog._version = snapshot, version
+        cache.set(nominee_catalog.VERSION_KEY, version, timeout=None)
+
+    def test_etag_changes_only_with_the_served_catalog(self):
+        first = self.client.get(reverse('awards-categories'))
+        self._change_elsewhere(lambda: Nominee.objects.create(category=self.category, nominee='B'))
+
+        stale = self.client.get(reverse('awards-categories'))
+        self.assertEqual((stale['ETag'], stale.content), (first['ETag'], first.content))
+
+        with override_settings(PROCESS_SNAPSHOT_MAX_AGE=0, NOMINEE_CATALOG_CHECK_INTERVAL=0):
+            fresh = self.client.get(reverse('awards-categories'), HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(fresh.status_code, 200)
+        self.assertNotEqual(fresh['ETag'], first['ETag'])
+        self.assertEqual(len(fresh.json()[0]['nominees']), 2)
+
+    def test_ballot_for_a_nominee_removed_elsewhere_is_rejected(self):
+        self._change_elsewhere(lambda: Nominee.objects.filter(pk=self.nominee.pk).delete())
+        nominee = nominee_catalog.nominee(self.nominee.id, self.category.id)
+        self.assertIsNotNone(nominee)
+
+        payload = [{'category_obj': nominee.category, 'nominee_obj': nominee}]
+        with local_broker(on_publish=lambda message: None), self.assertRaises(NomineeRemoved):
+            record_ballot('Voter', 'voter@example.com', '', '', payload)
+        self.assertFalse(Vote.objects.exists())
+        self.assertIsNone(nominee_catalog.nominee(self.nominee.id, self.category.id))
+
+
+class CsvExportTests(TestCase):
+    def test_cells_read_as_formulas_are_quoted(self):
+        rows = [('=HYPERLINK("http://example.com")', '+1', '-2', '@SUM(A1)', '\tx', 'Plain', -3)]
+        body = ''.join(csv_stream(['a', 'b', 'c', 'd', 'e', 'f', 'g'], rows))
+        self.assertEqual(
+            body.splitlines()[1],
+            '"\'=HYPERLINK(""http://example.com"")",\'+1,\'-2,\'@SUM(A1),\'\tx,Plain,-3',
+        )
+
+
+@override_settings(VIEW_METRICS_ENABLED=False, SLOW_QUERY_CAPTURE_ENABLED=False)
+class BallotWritePathTests(TestCase):
+    """record_ballot upserts the voter's unconfirmed rows and keeps tallies in step."""
+
+    def setUp(self):
+        self.category = Category.objects.create(title='Best Operator')
+        self.first = Nominee.objects.create(category=self.category, nominee='A')
+        self.second = Nominee.objects.create(category=self.category, nominee='B')
+
+    def _record(self, nominee):
+        payload = [{'category_obj': self.category, 'nominee_obj': nominee}]
+        with local_broker(on_publish=lambda message: None):
+            votes, _ = record_ballot('Voter', 'voter@example.com', '', '', payload)
+        return votes
+
+    def test_resubmission_updates_the_unconfirmed_row_in_place(self):
+        first, = self._record(self.first)
+        Vote.objects.filter(pk=first.pk).update(created_at=timezone.now() - timedelta(hours=1))
+        before = Vote.objects.get(pk=first.pk)
+
+        second, = self._record(self.second)
+        after = Vote.objects.get()
+        self.assertEqual((second.pk, after.pk), (first.pk, first.pk))
+        self.assertEqual(after.nominee_id, self.second.id)
+        self.assertNotEqual(after.confirmation_token, before.confirmation_token)
+        self.assertGreater(after.created_at, before.created_at)
+        self.assertEqual(find_drift(), [])
+        tallies = dict(NomineeTally.objects.values_list('nominee_id', 'unconfirmed'))
+        self.assertEqual(tallies, {self.first.id: 0, self.second.id: 1})
+
+    def test_locked_database_is_retried_with_fresh_primary_keys(self):
+        replace_votes = ballots._replace_votes
+        attempts = []
+
+        def locked_once(voter_email, categories, votes):
+            attempts.append([vote.pk for vote in votes])
+            if len(attempts) == 1:
+                for vote in votes:
+                    vote.pk = 12345
+                raise OperationalError('database is locked')
+            return replace_votes(voter_email, categories, votes)
+
+        with mock.patch('awards.ballots._replace_votes', side_effect=locked_once):
+            vote, = self._record(self.first)
+        self.assertEqual(attempts, [[None], [None]])
+        self.assertEqual(vote.pk, Vote.objects.get().pk)
+        self.assertEqual(find_drift(), [])
+
+    def test_other_operational_errors_are_not_retried(self):
+        with mock.patch('awards.ballots._replace_votes', side_effect=OperationalError('disk I/O error')) as replace:
+            with self.assertRaises(OperationalError):
+                self._record(self.first)
+        self.assertEqual(replace.call_count, 1)
+
+
+@override_settings(VIEW_METRICS_ENABLED=False, SLOW_QUERY_CAPTURE_ENABLED=False, AWARDS_UNCONFIRMED_VOTE_TTL_HOURS=48)
+class ResendConfirmationTests(TestCase):
+    """The admin resend queues one email per ballot and skips expired ones."""
+
+    def setUp(self):
+        self.categories = [Category.objects.create(title=title) for title in ('Best Operator', 'Best Affiliate')]
+        self.nominees = [Nominee.objects.create(category=category, nominee='A') for category in self.categories]
+        self.emails = []
+
+    def _ballot(self, voter_email, hours_old=0):
+        votes = [
+            Vote.objects.create(
+                category=category, nominee=nominee, voter_name='Voter', voter_email=voter_email,
+                confirmation_token=voter_email, email_sent=False,
+            )
+            for category, nominee in zip(self.categories, self.nominees)
+        ]
+        Vote.objects.filter(voter_email=voter_email).update(created_at=timezone.now() - timedelta(hours=hours_old))
+        return votes
+
+    def test_one_email_per_ballot_and_expired_ballots_skipped(self):
+        self._ballot('fresh@example.com')
+        self._ballot('stale@example.com', hours_old=72)
+        selected = Vote.objects.all()
+        ballots = list(selected.values_list('voter_email', 'confirmation_token'))
+        self.assertEqual(len(ballots), 4)
+
+        with local_broker(on_publish=self.emails.append):
+            result = VoteAdmin(Vote, admin.site)._queue_vote_confirmation_emails(ballots)
+        self.assertEqual(result, (1, 0, 1))
+        self.assertEqual(len(self.emails), 1)
+        self.assertEqual(self.emails[0]['recipients'], ['fresh@example.com'])
+        self.assertEqual(len(self.emails[0]['context']['vote_rows']), 2)
+        sent = dict(Vote.objects.values_list('voter_email', 'email_sent').distinct())
+        self.assertEqual(sent, {'fresh@example.com': True, 'stale@example.com': False})
@@ -1,5 +1,10 @@
+from contextlib import contextmanager
+from datetime import timedelta
+
 from django.conf import settings
+from django.db import transaction
 from django.urls import reverse
+from django.utils import timezone
 
 
 def vote_rows_for_queue_context(votes):
@@ -32,3 +37,42 @@ def build_confirmation_url(token, email, request=None):
         return f'https://{public_host}{path}'
     return path
 
+
+def unconfirmed_vote_cutoff():
+    """Unconfirmed votes created before this have expired; None when expiry is disabled."""
+    hours = getattr(settings, 'AWARDS_UNCONFIRMED_VOTE_TTL_HOURS', 0)
+    if not hours:
+        return None
+    return timezone.now() - timedelta(hours=hours)
+
+
+def is_expired(vote, cutoff=None):
+    cutoff = cutoff or unconfirmed_vote_cutoff()
+    return cutoff is not None and not vote.is_confirmed and vote.created_at < cutoff
+
+
+@contextmanager
+def immediate_atomic(using=None):
+    """
+    transaction.atomic that takes SQLite's write lock at BEGIN (BEGIN IMMEDIATE).
+
+    For transactions that read before they write: a deferred transaction
+    fails at once with "database is locked" when it upgrades to a write while
+    another connection writes, an immediate one waits for the busy timeout
+    instead. Other backends, and blocks nested in an open transaction, get a
+    plain atomic.
+    """
+    connection = transaction.get_connection(using)
+    connection.ensure_connection()
+    if connection.vendor != 'sqlite' or connection.in_atomic_block:
+        with transaction.atomic(using=using):
+            yield
+        return
+    previous = connection.transaction_mode
+    connection.transaction_mode = 'IMMEDIATE'
+    try:
+        with transaction.atomic(using=using):
+            connection.transaction_mode = previous
+            yield
+    finally:
+        connection.transaction_mode = previous
@@ -1,33 +1,32 @@
-import uuid
-
 from django.conf import settings
 from django.db import transaction
-from django.db.models import Prefetch
 from django.http import HttpResponseBadRequest
 from django.shortcuts import render
 from django.utils import timezone
-from rest_framework import status
+from rest_framework import serializers, status
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from coreconfig.service import email_service
+from coreconfig.conditional import versioned_conditional_get
 from security.permissions import ProtectedPostPermission
 
-from .models import Category, Nominee, Vote
-from .serializers import CategoryWithNomineesSerializer, VoteSubmissionSerializer
-from .utils import build_confirmation_url, vote_rows_for_queue_context
+from .ballots import BallotRejected, NomineeRemoved, record_ballot
+from .catalog import nominee_catalog
+from .confirmed_filter import confirmed_vote_filter
+from .models import Vote
+from .serializers import VoteSubmissionSerializer
+from .tallies import apply_confirmation, refresh_tallies
+from .utils import is_expired, unconfirmed_vote_cutoff
+from .vote_buffer import enqueue_ballot
 
 
 class AwardsCategoryListAPIView(APIView):
     permission_classes = [AllowAny]
 
+    @versioned_conditional_get(nominee_catalog)
     def get(self, request):
-        categories = Category.objects.prefetch_related(
-            Prefetch('nominees', queryset=Nominee.objects.order_by('nominee'))
-        ).order_by('priority', 'title')
-        serializer = CategoryWithNomineesSerializer(categories, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return Response(nominee_catalog.categories_payload(), status=status.HTTP_200_OK)
 
 
 class VoteSubmissionAPIView(APIView):
@@ -44,78 +43,40 @@ class VoteSubmissionAPIView(APIView):
         company = (data.get('company') or '').strip()
         position = (data.get('position') or '').strip()
         votes_payload = data['votes']
-        category_ids = [item['category_obj'].id for item in votes_payload]
-
-        confirmed_already = list(
-            Vote.objects.filter(
-                voter_email=voter_email,
-                category_id__in=category_ids,
-                is_confirmed=True,
-            )
-            .values_list('category__title', flat=True)
-            .distinct()
-        )
-        if confirmed_already:
+        buffered = getattr(settings, 'AWARDS_VOTE_BUFFER_ENABLED', False)
+
+        try:
+            if buffered:
+                enqueue_ballot(voter_name, voter_email, company, position, votes_payload, request=request)
+            else:
+                _, email_sent = record_ballot(
+                    voter_name, voter_email, company, position, votes_payload, request=request
+                )
+        except BallotRejected as rejected:
             return Response(
                 {
                     "message": (
                         "You have already voted in the following category or categories. "
                         "Your submission was not accepted."
                     ),
-                    "categories": confirmed_already,
+                    "categories": rejected.categories,
                     "error": "already_voted_in_category",
                 },
                 status=status.HTTP_400_BAD_REQUEST,
             )
+        except NomineeRemoved:
+            raise serializers.ValidationError(
+                {"votes": "Nominee does not exist for the selected category."}
+            )
 
-        token = uuid.uuid4().hex
-        batch_id = uuid.uuid4()
-        created_votes = []
-
-        with transaction.atomic():
-            Vote.objects.filter(
-                voter_email=voter_email,
-                category_id__in=category_ids,
-                is_confirmed=False,
-            ).delete()
-
-            for vote_item in votes_payload:
-                created_votes.append(
-                    Vote(
-                        voter_name=voter_name,
-                        voter_email=voter_email,
-                        company=company,
-                        position=position,
-                        category=vote_item['category_obj'],
-                        nominee=vote_item['nominee_obj'],
-                        batch_id=batch_id,
-                        confirmation_token=token,
-                    )
-                )
-            Vote.objects.bulk_create(created_votes)
-
-        created_votes = list(
-            Vote.objects.filter(batch_id=batch_id).select_related('category', 'nominee')
-        )
-        confirm_url = build_confirmation_url(token=token, email=voter_email, request=request)
-        vote_rows = vote_rows_for_queue_context(created_votes)
-
-        email_queue = email_service.send_email_task(
-            email_type='awards_vote',
-            subject='Confirm Your iGaming Awards Vote',
-            recipients=[voter_email],
-            context={
-                "voter_name": voter_name,
-                "vote_rows": vote_rows,
-                "confirm_url": confirm_url,
-            },
-            template_path='awards/email/vote_confirmation.html',
-            source_app='awards_VoteSubmissionAPIView',
-            related_model_id=created_votes[0].id if created_votes else None,
-        )
-
-        email_sent = email_queue is not None
-        Vote.objects.filter(batch_id=batch_id).update(email_sent=email_sent)
+        if buffered:
+            return Response(
+                {
+                    "message": "Vote received. A confirmation email will follow shortly.",
+                    "queued": True,
+                },
+                status=status.HTTP_202_ACCEPTED,
+            )
 
         return Response(
             {
@@ -144,12 +105,33 @@ class VoteConfirmationView(APIView):
             )
         )
 
+        cutoff = unconfirmed_vote_cutoff()
+        if pending_votes and any(is_expired(vote, cutoff) for vote in pending_votes):
+            # Past AWARDS_UNCONFIRMED_VOTE_TTL_HOURS; expire_unconfirmed_votes deletes them
+            return render(
+                request,
+                'awards/vote_confirmation_result.html',
+                {
+                    "status_text": "expired",
+                    "voter_email": email,
+                    "votes": [],
+                    "support_email": getattr(settings, 'NOTIFICATION_EMAIL', ''),
+                },
+            )
+
         if pending_votes:
             now = timezone.now()
-            Vote.objects.filter(id__in=[v.id for v in pending_votes]).update(
-                is_confirmed=True,
-                confirmed_at=now,
-            )
+            with transaction.atomic():
+                confirmed = Vote.objects.filter(id__in=[v.id for v in pending_votes], is_confirmed=False).update(
+                    is_confirmed=True,
+                    confirmed_at=now,
+                )
+                if confirmed == len(pending_votes):
+                    apply_confirmation([v.nominee_id for v in pending_votes])
+                else:
+                    # A concurrent request confirmed some of them first
+                    refresh_tallies([v.nominee_id for v in pending_votes])
+                confirmed_vote_filter.add((v.voter_email, v.category_id) for v in pending_votes)
             return render(
                 request,
                 'awards/vote_confirmation_result.html',
@@ -0,0 +1,188 @@
+"""
+Vote Ingestion Buffer
+Optional burst mode for VoteSubmissionAPIView (AWARDS_VOTE_BUFFER_ENABLED).
+A validated ballot is appended as one JSON line to a spool file and the
+request is answered with 202; `python manage.py flush_vote_buffer` stores the
+spooled ballots with record_ballot_batch, AWARDS_VOTE_BUFFER_BATCH_SIZE per
+transaction, so write throughput is bounded by batch commits rather than by
+one SQLite commit per request.
+
+Spool layout (AWARDS_VOTE_BUFFER_DIR, local to the web host):
+    incoming-<pid>.jsonl     appended to by each worker process
+    processing-<ns>-<pid>.jsonl
+                             claimed by the flusher (atomic rename); removed
+                             once every ballot in it is committed
+
+Each ballot carries its Vote.batch_id. record_ballot_batch records it as a
+BufferedBallot with the votes, so replaying a file after a crash skips the
+ballots that were already processed; the records are removed with the file.
+"""
+import glob
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.db import IntegrityError
+
+from .ballots import BallotRejected, confirmed_categories, record_ballot_batch
+from .catalog import nominee_catalog
+from .models import BufferedBallot
+from .utils import build_confirmation_url
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process development only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+def _lock(handle):
+    if fcntl is not None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+
+
+def _unlock(handle):
+    if fcntl is not None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+class VoteBuffer:
+    """Append-only JSONL spool of accepted ballots."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self):
+        return str(getattr(settings, 'AWARDS_VOTE_BUFFER_DIR', settings.BASE_DIR / 'vote_buffer'))
+
+    def _incoming_path(self):
+        return os.path.join(self.directory, f'incoming-{os.getpid()}.jsonl')
+
+    def append(self, ballot):
+        line = json.dumps(ballot, separators=(',', ':')) + '\n'
+        path = self._incoming_path()
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            while True:
+                handle = open(path, 'a', encoding='utf-8')
+                try:
+                    _lock(handle)
+                    # The flusher may have claimed (renamed) the file between open and lock
+                    if os.path.exists(path) and os.path.samestat(os.fstat(handle.fileno()), os.stat(path)):
+                        handle.write(line)
+                        handle.flush()
+                        if getattr(settings, 'AWARDS_VOTE_BUFFER_FSYNC', True):
+                            os.fsync(handle.fileno())
+                        return
+                finally:
+                    _unlock(handle)
+                    handle.close()
+
+    def claim(self):
+        """Spool files ready to flush, oldest first: leftovers of an interrupted flush, then new ones."""
+        claimed = sorted(glob.glob(os.path.join(self.directory, 'processing-*.jsonl')))
+        for path in sorted(glob.glob(os.path.join(self.directory, 'incoming-*.jsonl'))):
+            pid = os.path.basename(path)[len('incoming-'):-len('.jsonl')]
+            target = os.path.join(self.directory, f'processing-{time.time_ns()}-{pid}.jsonl')
+            try:
+                os.rename(path, target)
+            except FileNotFoundError:
+                continue
+            claimed.append(target)
+        return claimed
+
+    def read(self, path):
+        """Ballots in a claimed file; waits for a writer that opened it before the rename."""
+        ballots = []
+        with open(path, 'r', encoding='utf-8') as handle:
+            _lock(handle)
+            try:
+                for number, line in enumerate(handle, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        ballots.append(json.loads(line))
+                    except ValueError:
+                        # Only a torn last line can be malformed (crash mid-append)
+                        logger.error("Skipping malformed ballot at %s:%s", path, number)
+            finally:
+                _unlock(handle)
+        return ballots
+
+    def pending_files(self):
+        return sorted(glob.glob(os.path.join(self.directory, '*.jsonl')))
+
+
+vote_buffer = VoteBuffer()
+
+
+def enqueue_ballot(voter_name, voter_email, company, position, votes_payload, request=None):
+    """
+    Spool a validated ballot instead of storing it. Already confirmed
+    categories are still rejected up front (one read query); the flusher
+    checks again in case a confirmation lands before the ballot is stored.
+    """
+    categories = {item['category_obj'].id: item['category_obj'] for item in votes_payload}
+    rejected = confirmed_categories(voter_email, categories)
+    if rejected:
+        raise BallotRejected(rejected)
+
+    token = uuid.uuid4().hex
+    vote_buffer.append({
+        'batch_id': str(uuid.uuid4()),
+        'token': token,
+        'voter_name': voter_name,
+        'voter_email': voter_email,
+        'company': company,
+        'position': position,
+        'votes': [[item['category_obj'].id, item['nominee_obj'].id] for item in votes_payload],
+        'confirm_url': build_confirmation_url(token=token, email=voter_email, request=request),
+        'received_at': time.time(),
+    })
+
+
+def _store(ballots):
+    """record_ballot_batch, falling back to one ballot at a time if the batch conflicts."""
+    try:
+        return record_ballot_batch(ballots)
+    except IntegrityError:
+        # A nominee may have been removed since this worker's catalog loaded;
+        # the retry drops its votes (_ballot_votes)
+        nominee_catalog.invalidate()
+        if len(ballots) == 1:
+            return [], [(ballots[0], 'conflicting unconfirmed vote')]
+        accepted, rejected = [], []
+        for ballot in ballots:
+            ballot_accepted, ballot_rejected = _store([ballot])
+            accepted.extend(ballot_accepted)
+            rejected.extend(ballot_rejected)
+        return accepted, rejected
+
+
+def flush(batch_size=None):
+    """
+    Store every spooled ballot. Returns (stored, rejected) counts; a ballot
+    entirely replaced by a later one in the same batch counts as neither.
+    """
+    batch_size = batch_size or getattr(settings, 'AWARDS_VOTE_BUFFER_BATCH_SIZE', 500)
+    accepted_count = rejected_count = 0
+    for path in vote_buffer.claim():
+        ballots = vote_buffer.read(path)
+        for start in range(0, len(ballots), batch_size):
+            accepted, rejected = _store(ballots[start:start + batch_size])
+            accepted_count += len(accepted)
+            rejected_count += len(rejected)
+            for ballot, reason in rejected:
+                logger.warning("Buffered ballot %s from %s not stored: %s",
+                               ballot['batch_id'], ballot['voter_email'], reason)
+        os.remove(path)
+        batch_ids = [ballot['batch_id'] for ballot in ballots]
+        for start in range(0, len(batch_ids), batch_size):
+            BufferedBallot.objects.filter(batch_id__in=batch_ids[start:start + batch_size]).delete()
+    return accepted_count, rejected_count
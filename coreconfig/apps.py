@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CoreconfigConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'coreconfig'
+
+    def ready(self):
+        import coreconfig.signals
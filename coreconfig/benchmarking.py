@@ -0,0 +1,257 @@
+"""
+Benchmark helpers
+Shared plumbing for the benchmark management commands: a throwaway database,
+per-call query counting, threaded timing runs, comparable JSON reports and an
+in-process stand-in for the RabbitMQ email channel.
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.db import connection, connections
+from django.db.backends.signals import connection_created
+from django.test.utils import setup_databases, teardown_databases
+
+
+@contextmanager
+def throwaway_database(sqlite_path=None, verbosity=0):
+    """
+    Create a scratch copy of the default database for the duration of a run.
+    SQLite defaults to an on-disk file so commit/fsync costs are included.
+    """
+    test_settings = connection.settings_dict.setdefault('TEST', {})
+    previous_name = test_settings.get('NAME')
+    tmp_dir = None
+    if connection.vendor == 'sqlite':
+        if not sqlite_path:
+            tmp_dir = tempfile.mkdtemp(prefix='igaming_bench_')
+            sqlite_path = os.path.join(tmp_dir, 'bench.sqlite3')
+        test_settings['NAME'] = sqlite_path
+
+    old_config = setup_databases(verbosity=verbosity, interactive=False)
+    try:
+        yield connection.settings_dict['NAME']
+    finally:
+        connections.close_all()
+        teardown_databases(old_config, verbosity=verbosity)
+        test_settings['NAME'] = previous_name
+        if tmp_dir:
+            for name in os.listdir(tmp_dir):
+                os.remove(os.path.join(tmp_dir, name))
+            os.rmdir(tmp_dir)
+
+
+class QueryCounter:
+    """Thread-safe SQL statement counter installed with connection.execute_wrapper."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        with self._lock:
+            self.count += 1
+        return execute(sql, params, many, context)
+
+    @contextmanager
+    def installed(self):
+        with connection.execute_wrapper(self):
+            yield self
+
+
+class StatementCounter:
+    """
+    Counts SQL statements on every connection opened while installed, per
+    label set by the calling thread (e.g. the request being timed). Threads
+    that never set a label, such as a live server's handler threads, count
+    under `default_label`.
+    """
+
+    def __init__(self, default_label='other'):
+        self.default_label = default_label
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.counts = {}
+
+    def set_label(self, label):
+        self._local.label = label
+
+    def __call__(self, execute, sql, params, many, context):
+        label = getattr(self._local, 'label', None) or self.default_label
+        with self._lock:
+            self.counts[label] = self.counts.get(label, 0) + 1
+        return execute(sql, params, many, context)
+
+    def _attach(self, sender, connection, **kwargs):
+        # Connections open lazily inside other execute_wrapper() blocks, which
+        # pop the last wrapper on exit: stay at the front of the list
+        if self not in connection.execute_wrappers:
+            connection.execute_wrappers.insert(0, self)
+
+    @contextmanager
+    def installed(self):
+        connection_created.connect(self._attach, dispatch_uid=f'statement_counter:{id(self)}')
+        self._attach(None, connection)
+        try:
+            yield self
+        finally:
+            connection_created.disconnect(dispatch_uid=f'statement_counter:{id(self)}')
+            if self in connection.execute_wrappers:
+                connection.execute_wrappers.remove(self)
+
+
+class LocalChannel:
+    """Stands in for a pika channel; keeps the number of published messages."""
+
+    def __init__(self, on_publish=None):
+        self.published = 0
+        self.is_closed = False
+        self.on_publish = on_publish
+
+    def basic_publish(self, exchange, routing_key, body, properties=None):
+        self.published += 1
+        if self.on_publish is not None:
+            self.on_publish(json.loads(body))
+
+
+@contextmanager
+def local_broker(on_publish=None):
+    """
+    Route email_service publishes to a LocalChannel instead of RabbitMQ.
+    on_publish, if given, is called with each decoded email task.
+    """
+    from coreconfig.service import email_service
+
+    channel = LocalChannel(on_publish)
+    original = email_service._ensure_connection, email_service._close_connection, email_service.channel
+
+    def ensure_connection():
+        email_service.channel = channel
+
+    email_service._ensure_connection = ensure_connection
+    email_service._close_connection = lambda: None
+    try:
+        yield channel
+    finally:
+        email_service._ensure_connection, email_service._close_connection, email_service.channel = original
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def run_benchmark(name, func, iterations, threads=1, warmup=0):
+    """
+    Call func(index) `iterations` times spread over `threads` workers.
+
+    Returns a dict with throughput, latency percentiles (ms) and the average
+    number of SQL statements issued per call.
+    """
+    counter = QueryCounter()
+    for i in range(warmup):
+        func(-i - 1)
+
+    per_thread = [iterations // threads + (1 if t < iterations % threads else 0) for t in range(threads)]
+    offsets = [sum(per_thread[:t]) for t in range(threads)]
+    latencies = []
+    errors = {}
+    lock = threading.Lock()
+
+    def worker(thread_index):
+        local_latencies = []
+        local_errors = {}
+        with counter.installed():
+            start = offsets[thread_index]
+            for i in range(start, start + per_thread[thread_index]):
+                t0 = time.perf_counter()
+                try:
+                    func(i)
+                except Exception as e:
+                    key = type(e).__name__
+                    local_errors[key] = local_errors.get(key, 0) + 1
+                local_latencies.append((time.perf_counter() - t0) * 1000)
+        if threads > 1:
+            connection.close()
+        with lock:
+            latencies.extend(local_latencies)
+            for key, value in local_errors.items():
+                errors[key] = errors.get(key, 0) + value
+
+    started = time.perf_counter()
+    if threads == 1:
+        worker(0)
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(worker, range(threads)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    calls = len(latencies) or 1
+    return {
+        'name': name,
+        'threads': threads,
+        'iterations': len(latencies),
+        'elapsed_s': round(elapsed, 4),
+        'ops_per_sec': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'mean_ms': round(sum(latencies) / calls, 4),
+        'p50_ms': round(percentile(latencies, 50), 4),
+        'p95_ms': round(percentile(latencies, 95), 4),
+        'p99_ms': round(percentile(latencies, 99), 4),
+        'queries_per_call': round(counter.count / calls, 2),
+        'errors': errors,
+    }
+
+
+def result_key(result):
+    return f"{result['name']}@{result['threads']}"
+
+
+def format_results(results, baseline=None):
+    """Render results as a fixed-width table, with ops/sec deltas against a baseline run."""
+    baseline = {result_key(r): r for r in (baseline or [])}
+    header = f"{'benchmark':<40} {'thr':>3} {'ops/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'q/call':>7}"
+    if baseline:
+        header += f" {'vs base':>9}"
+    lines = [header, '-' * len(header)]
+    for r in results:
+        line = (
+            f"{r['name']:<40} {r['threads']:>3} {r['ops_per_sec']:>10.1f} {r['p50_ms']:>9.3f} "
+            f"{r['p95_ms']:>9.3f} {r['p99_ms']:>9.3f} {r['queries_per_call']:>7.2f}"
+        )
+        base = baseline.get(result_key(r))
+        if base and base['ops_per_sec']:
+            change = (r['ops_per_sec'] - base['ops_per_sec']) / base['ops_per_sec'] * 100
+            line += f" {change:>+8.1f}%"
+        if r['errors']:
+            line += f"  errors={r['errors']}"
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def environment_info():
+    from django.conf import settings
+    return {
+        'database': connection.vendor,
+        'cache': settings.CACHES.get('default', {}).get('BACKEND'),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
+
+
+def write_report(path, results, extra=None):
+    report = {'environment': environment_info(), 'results': results}
+    report.update(extra or {})
+    with open(path, 'w') as fh:
+        json.dump(report, fh, indent=2)
+
+
+def read_report(path):
+    with open(path) as fh:
+        return json.load(fh).get('results', [])
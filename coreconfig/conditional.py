@@ -0,0 +1,60 @@
+"""
+Conditional GET for snapshot-backed endpoints
+Views served from a versioned in-process snapshot (sponsor.directory,
+awards.catalog) take their validators from the snapshot itself:
+source.validators() -> (version, last_modified), so a client (or the CDN)
+holding the current ETag / Last-Modified gets a 304 without the view querying
+or serializing anything, and the ETag always matches the body this worker
+serves.
+
+Usage on an APIView:
+
+    @versioned_conditional_get(sponsor_directory)
+    def get(self, request, *args, **kwargs):
+        ...
+
+Views cached with coreconfig.response_cache.cached_response get an ETag
+from the cached body instead.
+"""
+import hashlib
+
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+
+
+def request_filters(request):
+    """Sorted (key, value) pairs from the query string and, for GET bodies, request.data."""
+    items = [(str(key), str(value)) for key, values in request.GET.lists() for value in values]
+    data = getattr(request, 'data', None)
+    if hasattr(data, 'items'):
+        items.extend((str(key), str(value)) for key, value in data.items())
+    return sorted(items)
+
+
+def versioned_validators(request, source, scope=''):
+    """(etag, last_modified) from a snapshot version; computed once per request."""
+    memo = getattr(request, '_versioned_validators', None)
+    if memo is not None:
+        return memo
+
+    version, last_modified = source.validators()
+    parts = [scope, request.get_host(), str(version)]
+    parts.extend(f"{key}={value}" for key, value in request_filters(request))
+    etag = hashlib.md5('|'.join(parts).encode('utf-8')).hexdigest()
+    request._versioned_validators = (etag, last_modified)
+    return request._versioned_validators
+
+
+def versioned_conditional_get(source):
+    """conditional_get for views built from `source`, an object with validators() -> (version, last_modified)."""
+    def decorator(get):
+        scope = f"{get.__module__}.{get.__qualname__}"
+
+        def etag(request, *args, **kwargs):
+            return versioned_validators(request, source, scope)[0]
+
+        def last_modified(request, *args, **kwargs):
+            return versioned_validators(request, source, scope)[1]
+
+        return method_decorator(condition(etag_func=etag, last_modified_func=last_modified))(get)
+    return decorator
@@ -0,0 +1,40 @@
+"""
+Django management command to fill the pre-parsed benefit/note list columns
+of existing Sponsorship and ExhibitionOption rows. New and edited rows are
+kept in sync by save(); the serializers split the text for rows that have
+not been backfilled yet, so this can run at any time after deploying.
+
+Usage:
+    python manage.py backfill_benefit_lists
+    python manage.py backfill_benefit_lists --all    # also recompute rows already filled
+"""
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from exhibition.models import ExhibitionOption
+from sponsorship.models import Sponsorship
+
+
+class Command(BaseCommand):
+    help = 'Populate the pre-parsed list columns from the benefit/note text fields'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Recompute every row, not only unfilled ones')
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows per UPDATE batch (default: 500)')
+
+    def handle(self, *args, **options):
+        for model in (Sponsorship, ExhibitionOption):
+            list_fields = list(model.LIST_FIELDS.values())
+            queryset = model.objects.all()
+            if not options['all']:
+                missing = Q()
+                for field in list_fields:
+                    missing |= Q(**{f'{field}__isnull': True})
+                queryset = queryset.filter(missing)
+
+            rows = []
+            for obj in queryset.only('pk', *model.LIST_FIELDS).iterator():
+                obj.refresh_lists()
+                rows.append(obj)
+            model.objects.bulk_update(rows, list_fields, batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f'{model._meta.verbose_name_plural}: {len(rows)} row(s) updated'))
@@ -17,6 +17,7 @@ from django.conf import settings
 import pika
 from coreconfig.service import email_service
 from coreconfig.models import EmailQueue
+from logs.slow_queries import capture_slow_queries
 
 logger = logging.getLogger(__name__)
 
@@ -152,6 +153,22 @@ class Command(BaseCommand):
             # Reject and requeue on unexpected errors
             ch.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
 
+    def consume(self):
+        while not self.should_stop:
+            try:
+                self.connection.process_data_events(time_limit=1)
+            except KeyboardInterrupt:
+                self.should_stop = True
+                break
+            except Exception as e:
+                if not self.should_stop:
+                    logger.error(f'Error in process_data_events: {e}')
+                    time.sleep(5)  # Wait before retrying
+                    # Try to reconnect
+                    if not self.setup_connection():
+                        self.should_stop = True
+                        break
+
     def handle(self, *args, **options):
         self.options = options
         
@@ -175,20 +192,8 @@ class Command(BaseCommand):
             self.stdout.write(self.style.SUCCESS('Waiting for messages. To exit press CTRL+C'))
             
             # Start consuming
-            while not self.should_stop:
-                try:
-                    self.connection.process_data_events(time_limit=1)
-                except KeyboardInterrupt:
-                    self.should_stop = True
-                    break
-                except Exception as e:
-                    if not self.should_stop:
-                        logger.error(f'Error in process_data_events: {e}')
-                        time.sleep(5)  # Wait before retrying
-                        # Try to reconnect
-                        if not self.setup_connection():
-                            self.should_stop = True
-                            break
+            with capture_slow_queries('command:consume_emails'):
+                self.consume()
             
         except Exception as e:
             self.stdout.write(self.style.ERROR(f'Consumer error: {e}'))
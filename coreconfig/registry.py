@@ -0,0 +1,161 @@
+"""
+Environment Registry
+Per-process view of allowed hosts, CORS origins and CSRF trusted origins.
+
+Values come from the static lists in settings plus the EnvironmentSetting
+table, so admins can add a new summit domain without a redeploy. Lookups are
+frozenset membership checks; the database is only read when the shared cache
+version changes (bumped by the EnvironmentSetting signals). With a per-process
+cache backend other workers cannot see that bump and reload after
+PROCESS_SNAPSHOT_MAX_AGE seconds instead (coreconfig.shared_cache).
+"""
+import logging
+import threading
+import time
+import uuid
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+
+from .shared_cache import snapshot_expired
+
+logger = logging.getLogger(__name__)
+
+ALLOWED_HOST = 'ALLOWED_HOST'
+CORS_ORIGIN = 'CORS_ORIGIN'
+CSRF_TRUSTED_ORIGIN = 'CSRF_TRUSTED_ORIGIN'
+
+
+@lru_cache(maxsize=1024)
+def normalize_origin(value):
+    """Reduce an Origin/Referer header to 'scheme://netloc', or None if unparsable."""
+    if not value:
+        return None
+    try:
+        parsed = urlsplit(value)
+    except ValueError:
+        return None
+    if not parsed.scheme or not parsed.netloc:
+        return None
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+class EnvironmentRegistry:
+    """Process-wide cache of EnvironmentSetting values keyed by setting type."""
+
+    VERSION_KEY = 'coreconfig_env_registry_version'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = None
+        self._version = None
+        self._checked_at = 0.0
+        self._loaded_at = 0.0
+
+    def _static_values(self):
+        # list.__iter__ skips EnvironmentAllowedHosts.__iter__, which calls back into the registry
+        return {
+            ALLOWED_HOST: list(list.__iter__(settings.ALLOWED_HOSTS)),
+            CORS_ORIGIN: getattr(settings, 'CORS_ALLOWED_ORIGINS', []),
+            CSRF_TRUSTED_ORIGIN: getattr(settings, 'CSRF_TRUSTED_ORIGINS', []),
+        }
+
+    def _load(self):
+        """
+        Read every EnvironmentSetting row in a single query and merge with
+        settings. Returns (values, complete); complete is False when the
+        table could not be read.
+        """
+        merged = {key: set(values) for key, values in self._static_values().items()}
+        complete = True
+        try:
+            from .models import EnvironmentSetting
+            rows = EnvironmentSetting.objects.values_list('setting_type', 'value')
+            for setting_type, value in rows:
+                value = value.strip().rstrip('/')
+                if value and setting_type in merged:
+                    merged[setting_type].add(value)
+        except Exception as e:
+            # DB not ready (e.g., during collectstatic, migrations, test database setup) - fall back to settings
+            logger.info(f"Environment registry using settings only: {e}")
+            complete = False
+        return {key: frozenset(values) for key, values in merged.items()}, complete
+
+    def _current_version(self):
+        version = cache.get(self.VERSION_KEY)
+        if version is None:
+            # Evicted or never set: publish a fresh version so stale workers reload too
+            cache.add(self.VERSION_KEY, uuid.uuid4().hex, timeout=None)
+            version = cache.get(self.VERSION_KEY)
+        return version
+
+    def _snapshot(self):
+        """Return the current values, reloading only when the shared version moved."""
+        interval = getattr(settings, 'ENV_REGISTRY_CHECK_INTERVAL', 5)
+        now = time.monotonic()
+        if self._values is not None and now - self._checked_at < interval:
+            return self._values
+
+        with self._lock:
+            if self._values is not None and now - self._checked_at < interval:
+                return self._values
+            version = self._current_version()
+            if self._values is None or version != self._version or snapshot_expired(self._loaded_at, now):
+                self._values, complete = self._load()
+                # A settings-only fallback is not kept: the next lookup tries the table again
+                self._version = version if complete else None
+                self._loaded_at = now
+            self._checked_at = now if self._version is not None else 0.0
+            return self._values
+
+    def values(self, setting_type):
+        if not apps.ready:
+            return frozenset(self._static_values().get(setting_type, ()))
+        return self._snapshot().get(setting_type, frozenset())
+
+    @property
+    def allowed_hosts(self):
+        return self.values(ALLOWED_HOST)
+
+    def match_cors_origin(self, origin):
+        """Return the normalized origin if it is an allowed CORS origin, else None."""
+        allowed = self.values(CORS_ORIGIN)
+        if origin in allowed:
+            return origin
+        origin = normalize_origin(origin)
+        if origin in allowed:
+            return origin
+        return None
+
+    def is_cors_origin(self, origin):
+        return self.match_cors_origin(origin) is not None
+
+    def is_csrf_trusted_origin(self, origin):
+        return origin in self.values(CSRF_TRUSTED_ORIGIN)
+
+    def invalidate(self):
+        """Bump the shared version so every worker reloads on its next check."""
+        cache.set(self.VERSION_KEY, uuid.uuid4().hex, timeout=None)
+        with self._lock:
+            self._values = None
+
+
+class EnvironmentAllowedHosts(list):
+    """
+    ALLOWED_HOSTS list that also yields hosts registered as EnvironmentSetting
+    rows. Django iterates ALLOWED_HOSTS when validating the Host header.
+    """
+
+    def __iter__(self):
+        static = list(super().__iter__())
+        yield from static
+        if apps.ready:
+            # The registry merges the static hosts in as well; yield the registered ones only
+            yield from env_registry.allowed_hosts.difference(static)
+
+
+# Singleton instance
+env_registry = EnvironmentRegistry()
@@ -0,0 +1,238 @@
+"""
+Response cache for API views
+Caches the rendered body of an APIView.get per host, accepted media type and
+normalized filters. Every cache key embeds a version token for each model
+the response depends on; post_save/post_delete/m2m_changed on any of those
+models replaces the token, so stale entries are simply never read again and
+expire after RESPONSE_CACHE_TIMEOUT. Receivers are connected per tracked
+model only: a sender-less post_delete receiver would disable Django's fast
+(single statement) delete path for every model.
+
+Usage:
+
+    @cached_response(Sponsorship, Sponsor)
+    def get(self, request, *args, **kwargs):
+        ...
+
+Changes made with QuerySet.update()/bulk_create() send no signals; those
+are only picked up when the entry times out.
+
+The decorator also answers conditional GETs: the ETag is a hash of the body
+and is stored with the cache entry, so it always describes the body this
+worker serves (version tokens are per-process with LocMemCache) and a hit
+costs no query. If-None-Match is answered with 304 on hits and misses alike.
+"""
+import functools
+import hashlib
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.http import HttpResponse
+from django.template.response import SimpleTemplateResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+from logs.utils import log_buffer
+
+from .conditional import request_filters
+
+# Entries are (status, content type, body, etag)
+CACHE_KEY_PREFIX = 'response_cache:v2:'
+METRICS_INDEX_KEY = 'response_cache_metrics_index'
+METRICS_KEY_PREFIX = 'response_cache_metrics:'
+METRICS_TIMEOUT = 7 * 24 * 3600
+
+
+class ModelVersions:
+    """Shared version token per model, replaced whenever a tracked model changes."""
+
+    KEY = 'model_version:{label}'
+
+    def __init__(self):
+        self.tracked = set()
+
+    def track(self, *models):
+        """Connect change receivers for the models and the m2m tables on either side of them."""
+        for model in models:
+            label = model._meta.label
+            if label in self.tracked:
+                continue
+            self.tracked.add(label)
+            post_save.connect(self._model_changed, sender=model, dispatch_uid=f'model_version_save:{label}')
+            post_delete.connect(self._model_changed, sender=model, dispatch_uid=f'model_version_delete:{label}')
+            for field in model._meta.get_fields():
+                if field.many_to_many:
+                    through = field.remote_field.through if field.concrete else field.through
+                    m2m_changed.connect(self._m2m_changed, sender=through,
+                                        dispatch_uid=f'model_version_m2m:{through._meta.label}')
+
+    def is_tracked(self, model):
+        return model._meta.label in self.tracked
+
+    def _model_changed(self, sender, **kwargs):
+        self.bump(sender)
+
+    def _m2m_changed(self, sender, instance, action, model, **kwargs):
+        if not action.startswith('post_'):
+            return
+        for changed in (type(instance), model):
+            if self.is_tracked(changed):
+                self.bump(changed)
+
+    def get_many(self, models):
+        keys = {model._meta.label: self.KEY.format(label=model._meta.label) for model in models}
+        found = cache.get_many(list(keys.values()))
+        versions = {}
+        for label, key in keys.items():
+            version = found.get(key)
+            if version is None:
+                # Evicted or never set: a fresh token can never match an old cache entry
+                cache.add(key, uuid.uuid4().hex, timeout=None)
+                version = cache.get(key)
+            versions[label] = version
+        return versions
+
+    def bump(self, model):
+        cache.set(self.KEY.format(label=model._meta.label), uuid.uuid4().hex, timeout=None)
+
+
+model_versions = ModelVersions()
+
+
+def _empty_metrics():
+    return {'hits': 0, 'misses': 0, 'rebuild_ms_sum': 0.0, 'rebuild_ms_max': 0.0}
+
+
+class ResponseCacheMetrics:
+    """Per-view hit/miss counts and rebuild times, merged into the shared cache periodically."""
+
+    def __init__(self, merge_interval=10):
+        self.merge_interval = merge_interval
+        self._lock = threading.Lock()
+        self._local = {}
+        self._merged_at = time.monotonic()
+
+    def hit(self, scope):
+        with self._lock:
+            self._local.setdefault(scope, _empty_metrics())['hits'] += 1
+
+    def miss(self, scope, rebuild_ms):
+        with self._lock:
+            stats = self._local.setdefault(scope, _empty_metrics())
+            stats['misses'] += 1
+            stats['rebuild_ms_sum'] += rebuild_ms
+            stats['rebuild_ms_max'] = max(stats['rebuild_ms_max'], rebuild_ms)
+
+    @staticmethod
+    def _add(target, source):
+        target['hits'] += source['hits']
+        target['misses'] += source['misses']
+        target['rebuild_ms_sum'] += source['rebuild_ms_sum']
+        target['rebuild_ms_max'] = max(target['rebuild_ms_max'], source['rebuild_ms_max'])
+        return target
+
+    def merge(self, force=False):
+        if not force and time.monotonic() - self._merged_at < self.merge_interval:
+            return
+        self._merged_at = time.monotonic()
+        with self._lock:
+            local, self._local = self._local, {}
+        if not local:
+            return
+        keys = {scope: METRICS_KEY_PREFIX + scope for scope in local}
+        shared = cache.get_many(list(keys.values()))
+        cache.set_many(
+            {keys[scope]: self._add(shared.get(keys[scope]) or _empty_metrics(), stats) for scope, stats in local.items()},
+            timeout=METRICS_TIMEOUT,
+        )
+        index = set(cache.get(METRICS_INDEX_KEY) or [])
+        index.update(local)
+        cache.set(METRICS_INDEX_KEY, sorted(index), timeout=METRICS_TIMEOUT)
+
+    def snapshot(self):
+        scopes = cache.get(METRICS_INDEX_KEY) or []
+        shared = cache.get_many([METRICS_KEY_PREFIX + scope for scope in scopes])
+        combined = {scope: shared[METRICS_KEY_PREFIX + scope] for scope in scopes if METRICS_KEY_PREFIX + scope in shared}
+        with self._lock:
+            for scope, stats in self._local.items():
+                self._add(combined.setdefault(scope, _empty_metrics()), stats)
+        rows = []
+        for scope, stats in sorted(combined.items()):
+            requests = stats['hits'] + stats['misses']
+            rows.append({
+                'view': scope,
+                'hits': stats['hits'],
+                'misses': stats['misses'],
+                'hit_rate': round(stats['hits'] / requests, 4) if requests else 0.0,
+                'rebuild_ms_mean': round(stats['rebuild_ms_sum'] / stats['misses'], 2) if stats['misses'] else 0.0,
+                'rebuild_ms_max': round(stats['rebuild_ms_max'], 2),
+            })
+        return rows
+
+    def reset(self):
+        scopes = cache.get(METRICS_INDEX_KEY) or []
+        cache.delete_many([METRICS_KEY_PREFIX + scope for scope in scopes] + [METRICS_INDEX_KEY])
+        with self._lock:
+            self._local = {}
+
+
+response_cache_metrics = ResponseCacheMetrics(getattr(settings, 'VIEW_METRICS_MERGE_INTERVAL', 10))
+log_buffer.add_tick_callback(response_cache_metrics.merge)
+
+
+def _cache_key(request, scope, models):
+    versions = model_versions.get_many(models)
+    parts = [scope, request.get_host(), getattr(request, 'accepted_media_type', '') or '']
+    parts.extend(f"{label}={versions[label]}" for label in sorted(versions))
+    parts.extend(f"{key}={value}" for key, value in request_filters(request))
+    return CACHE_KEY_PREFIX + hashlib.md5('|'.join(parts).encode('utf-8')).hexdigest()
+
+
+def _conditional(request, response, etag):
+    """Set the ETag and answer a matching If-None-Match with 304."""
+    response['ETag'] = etag
+    return get_conditional_response(request, etag=etag, response=response)
+
+
+def cached_response(*models, timeout=None):
+    """Method decorator for APIView.get caching 200 responses until a dependency changes."""
+    model_versions.track(*models)
+
+    def decorator(get):
+        scope = f"{get.__module__}.{get.__qualname__}"
+
+        @functools.wraps(get)
+        def wrapper(self, request, *args, **kwargs):
+            enabled = getattr(settings, 'RESPONSE_CACHE_ENABLED', True)
+            key = _cache_key(request, scope, models) if enabled else None
+            if key is not None:
+                cached = cache.get(key)
+                if cached is not None:
+                    response_cache_metrics.hit(scope)
+                    status_code, content_type, content, etag = cached
+                    return _conditional(request, HttpResponse(content, status=status_code, content_type=content_type), etag)
+
+            start = time.perf_counter()
+            response = get(self, request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            entry_timeout = timeout if timeout is not None else getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300)
+
+            def store(rendered):
+                etag = quote_etag(hashlib.md5(rendered.content).hexdigest())
+                if key is not None:
+                    response_cache_metrics.miss(scope, (time.perf_counter() - start) * 1000)
+                    cache.set(key, (rendered.status_code, rendered['Content-Type'], rendered.content, etag), entry_timeout)
+                return _conditional(request, rendered, etag)
+
+            # DRF responses are rendered after the view returns; store the final bytes
+            if isinstance(response, SimpleTemplateResponse) and not response.is_rendered:
+                response.add_post_render_callback(store)
+                return response
+            return store(response)
+        return wrapper
+    return decorator
@@ -73,6 +73,43 @@ class RabbitMQEmailService:
         except Exception as e:
             logger.error(f"Error closing RabbitMQ connection: {e}")
     
+    def _prepare_task(self, email_type, subject, recipients, context=None, template_path=None,
+                      html_body=None, plain_body=None, attachments=None, source_app=None,
+                      related_model_id=None):
+        """Message payload and (unsaved) EmailQueue row for one email task"""
+        email_data = {
+            'email_type': email_type,
+            'subject': subject,
+            'recipients': recipients if isinstance(recipients, list) else [recipients],
+            'from_email': settings.DEFAULT_FROM_EMAIL,
+            'context': context or {},
+            'template_path': template_path,
+            'html_body': html_body,
+            'plain_body': plain_body,
+            'attachments': attachments or [],
+            'source_app': source_app,
+            'related_model_id': related_model_id,
+        }
+
+        requeue_snapshot = {
+            'template_path': template_path,
+            'context': json.loads(json.dumps(context or {}, cls=DateTimeJSONEncoder)),
+            'html_body': html_body,
+            'plain_body': plain_body,
+            'attachments': list(attachments or []),
+        }
+
+        email_queue = EmailQueue(
+            email_type=email_type,
+            subject=subject,
+            recipients=','.join(recipients) if isinstance(recipients, list) else recipients,
+            status='pending',
+            source_app=source_app or 'unknown',
+            related_model_id=related_model_id,
+            requeue_snapshot=requeue_snapshot,
+        )
+        return email_data, email_queue
+
     def send_email_task(self, email_type, subject, recipients, context=None, 
                         template_path=None, html_body=None, plain_body=None, 
                         attachments=None, source_app=None, related_model_id=None):
@@ -97,39 +134,12 @@ class RabbitMQEmailService:
         try:
             self._ensure_connection()
             
-            # Prepare email data
-            email_data = {
-                'email_type': email_type,
-                'subject': subject,
-                'recipients': recipients if isinstance(recipients, list) else [recipients],
-                'from_email': settings.DEFAULT_FROM_EMAIL,
-                'context': context or {},
-                'template_path': template_path,
-                'html_body': html_body,
-                'plain_body': plain_body,
-                'attachments': attachments or [],
-                'source_app': source_app,
-                'related_model_id': related_model_id,
-            }
-
-            requeue_snapshot = {
-                'template_path': template_path,
-                'context': json.loads(json.dumps(context or {}, cls=DateTimeJSONEncoder)),
-                'html_body': html_body,
-                'plain_body': plain_body,
-                'attachments': list(attachments or []),
-            }
-            
-            # Create EmailQueue record
-            email_queue = EmailQueue.objects.create(
-                email_type=email_type,
-                subject=subject,
-                recipients=','.join(recipients) if isinstance(recipients, list) else recipients,
-                status='pending',
-                source_app=source_app or 'unknown',
-                related_model_id=related_model_id,
-                requeue_snapshot=requeue_snapshot,
+            email_data, email_queue = self._prepare_task(
+                email_type, subject, recipients, context, template_path,
+                html_body, plain_body, attachments, source_app, related_model_id,
             )
+            # Create EmailQueue record
+            email_queue.save()
             
             # Add queue_id to email_data
             email_data['queue_id'] = email_queue.id
@@ -151,7 +161,7 @@ class RabbitMQEmailService:
         except Exception as e:
             logger.error(f"Failed to queue email task: {e}")
             # Update EmailQueue status to failed
-            if 'email_queue' in locals():
+            if 'email_queue' in locals() and email_queue.pk:
                 email_queue.status = 'failed'
                 email_queue.error_message = str(e)
                 email_queue.save()
@@ -159,6 +169,61 @@ class RabbitMQEmailService:
         finally:
             self._close_connection()
     
+    def send_email_tasks(self, tasks):
+        """
+        Queue many emails at once: one RabbitMQ connection, one bulk INSERT of
+        EmailQueue rows and every message published on the same channel.
+        
+        Args:
+            tasks: List of dicts with the keyword arguments of send_email_task
+        
+        Returns:
+            List aligned with tasks: EmailQueue instance if queued, None otherwise
+        """
+        if not tasks:
+            return []
+        prepared = [self._prepare_task(**task) for task in tasks]
+        try:
+            self._ensure_connection()
+            rows = EmailQueue.objects.bulk_create([email_queue for _, email_queue in prepared])
+        except Exception as e:
+            logger.error(f"Failed to queue {len(tasks)} email task(s): {e}")
+            self._close_connection()
+            return [None] * len(tasks)
+
+        results = []
+        failed_ids = []
+        error = None
+        try:
+            for (email_data, _), email_queue in zip(prepared, rows):
+                if error is None:
+                    try:
+                        email_data['queue_id'] = email_queue.id
+                        message = json.dumps(email_data, cls=DateTimeJSONEncoder)
+                        self.channel.basic_publish(
+                            exchange='',
+                            routing_key=self.queue_name,
+                            body=message,
+                            properties=pika.BasicProperties(
+                                delivery_mode=2,  # Make message persistent
+                            )
+                        )
+                        results.append(email_queue)
+                        continue
+                    except Exception as e:
+                        # The channel is unusable after a failed publish: fail the rest too
+                        error = e
+                        logger.error(f"Failed to queue email task (Queue ID: {email_queue.id}): {e}")
+                failed_ids.append(email_queue.id)
+                results.append(None)
+        finally:
+            self._close_connection()
+
+        if failed_ids:
+            EmailQueue.objects.filter(id__in=failed_ids).update(status='failed', error_message=str(error))
+        logger.info(f"Email tasks queued: {len(tasks) - len(failed_ids)} of {len(tasks)}")
+        return results
+    
     def process_email_task(self, email_data):
         """
         Process a single email task from the queue
@@ -0,0 +1,29 @@
+"""
+Shared cache detection
+Process-wide snapshots (environment registry, sponsor directory, nominee
+catalog) are invalidated by bumping a version key in the default cache. That
+only reaches other workers when the cache backend is shared between
+processes; with a per-process backend (LocMemCache, the default) each worker
+sees its own invalidations only, so snapshots are also reloaded once they are
+older than PROCESS_SNAPSHOT_MAX_AGE seconds.
+
+Kept free of model imports: the environment registry is loaded from settings.
+"""
+from django.conf import settings
+
+PER_PROCESS_BACKENDS = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+def cache_is_shared(alias='default'):
+    """False when the cache backend keeps its entries inside each process."""
+    return settings.CACHES[alias]['BACKEND'] not in PER_PROCESS_BACKENDS
+
+
+def snapshot_expired(loaded_at, now):
+    """Whether a snapshot loaded at `loaded_at` (time.monotonic) must be reloaded regardless of its version."""
+    if cache_is_shared():
+        return False
+    return now - loaded_at >= getattr(settings, 'PROCESS_SNAPSHOT_MAX_AGE', 60)
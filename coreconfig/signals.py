@@ -0,0 +1,20 @@
+from corsheaders.signals import check_request_enabled
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import EnvironmentSetting
+from .registry import env_registry
+
+
+@receiver(post_save, sender=EnvironmentSetting)
+@receiver(post_delete, sender=EnvironmentSetting)
+def invalidate_environment_registry(sender, **kwargs):
+    """Reload hosts/origins in every worker after an EnvironmentSetting change."""
+    env_registry.invalidate()
+
+
+@receiver(check_request_enabled)
+def cors_allow_registered_origin(sender, request, **kwargs):
+    """Let django-cors-headers accept origins added through EnvironmentSetting."""
+    origin = request.headers.get('origin')
+    return bool(origin) and env_registry.is_cors_origin(origin)
@@ -0,0 +1,27 @@
+"""
+Test runner
+DiscoverRunner that takes the LogEntry handler (logs.handlers) off the root
+logger for the run: records logged while the test database is created would
+otherwise be written into it mid-migration, and tests would leave LogEntry
+rows behind. Console output is unchanged.
+"""
+import logging
+
+from django.test.runner import DiscoverRunner
+
+from logs.handlers import LogEntryQueueHandler
+
+
+class TestRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        root = logging.getLogger()
+        self._logentry_handlers = [handler for handler in root.handlers if isinstance(handler, LogEntryQueueHandler)]
+        for handler in self._logentry_handlers:
+            root.removeHandler(handler)
+
+    def teardown_test_environment(self, **kwargs):
+        root = logging.getLogger()
+        for handler in self._logentry_handlers:
+            root.addHandler(handler)
+        super().teardown_test_environment(**kwargs)
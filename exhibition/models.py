@@ -32,6 +32,14 @@ class ExhibitionTier(models.Model):
     def __str__(self):
         return self.name
 
+def split_list_text(text):
+    """Split newline separated text (or comma separated, if single-line) into stripped items."""
+    if not text:
+        return []
+    separator = '\n' if '\n' in text else ','
+    return [item.strip() for item in text.split(separator) if item.strip()]
+
+
 class ExhibitionOption(models.Model):
     """
     Represents a specific exhibition option within a tier (e.g., Space Only, Shell Scheme).
@@ -48,6 +56,12 @@ class ExhibitionOption(models.Model):
     sponsorship_status = models.TextField(blank=True, null=True, help_text="Comma-separated or newline-separated list of sponsorship status details.")
     notes = models.TextField(blank=True, null=True, help_text="Comma-separated or newline-separated list of additional notes for this option.")
 
+    # Pre-parsed copies of the text fields above, kept in sync by save(); None until backfilled
+    stand_benefits_list = models.JSONField(null=True, blank=True, editable=False)
+    exhibitor_benefits_list = models.JSONField(null=True, blank=True, editable=False)
+    sponsorship_status_list = models.JSONField(null=True, blank=True, editable=False)
+    notes_list = models.JSONField(null=True, blank=True, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     added_by = models.ForeignKey(
@@ -60,6 +74,14 @@ class ExhibitionOption(models.Model):
         help_text=_("The user who created this exhibition option.")
     )
 
+    # Text field -> pre-parsed list field
+    LIST_FIELDS = {
+        'stand_benefits': 'stand_benefits_list',
+        'exhibitor_benefits': 'exhibitor_benefits_list',
+        'sponsorship_status': 'sponsorship_status_list',
+        'notes': 'notes_list',
+    }
+
     class Meta:
         verbose_name = _("Exhibition Option")
         verbose_name_plural = _("Exhibition Options")
@@ -68,6 +90,20 @@ class ExhibitionOption(models.Model):
     def __str__(self):
         return f"{self.tier.name} - {self.type} ({self.stand_size})"
 
+    def refresh_lists(self):
+        for text_field, list_field in self.LIST_FIELDS.items():
+            setattr(self, list_field, split_list_text(getattr(self, text_field)))
+
+    def save(self, *args, **kwargs):
+        self.refresh_lists()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            kwargs['update_fields'] = update_fields | {
+                self.LIST_FIELDS[name] for name in update_fields if name in self.LIST_FIELDS
+            }
+        super().save(*args, **kwargs)
+
 
 def exhibition_image_upload_path(instance, filename):
     """
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import ExhibitionTier, ExhibitionOption, ExhibitionImage
+from .models import ExhibitionTier, ExhibitionOption, ExhibitionImage, split_list_text
 import base64
 import mimetypes
 from urllib.parse import urljoin
@@ -58,25 +58,24 @@ class ExhibitionOptionSerializer(serializers.ModelSerializer):
             'images',
         ]
 
-    def _split_text_field(self, text):
-        if text:
-            if '\n' in text:
-                return [item.strip() for item in text.split('\n') if item.strip()]
-            else:
-                return [item.strip() for item in text.split(',') if item.strip()]
-        return []
+    def _list_field(self, obj, text_field):
+        """Pre-parsed list stored by ExhibitionOption.save(); rows not yet backfilled are split here."""
+        items = getattr(obj, ExhibitionOption.LIST_FIELDS[text_field])
+        if items is None:
+            return split_list_text(getattr(obj, text_field))
+        return items
 
     def get_standBenefits(self, obj):
-        return self._split_text_field(obj.stand_benefits)
+        return self._list_field(obj, 'stand_benefits')
 
     def get_exhibitorBenefits(self, obj):
-        return self._split_text_field(obj.exhibitor_benefits)
+        return self._list_field(obj, 'exhibitor_benefits')
 
     def get_sponsorshipStatus(self, obj):
-        return self._split_text_field(obj.sponsorship_status)
+        return self._list_field(obj, 'sponsorship_status')
 
     def get_notes(self, obj):
-        return self._split_text_field(obj.notes)
+        return self._list_field(obj, 'notes')
 
     def get_images(self, obj):
         request = self.context.get('request')
@@ -3,6 +3,7 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import AllowAny
 from django.db.models import Prefetch
+from coreconfig.response_cache import cached_response
 from .models import ExhibitionTier, ExhibitionOption, ExhibitionImage
 from .serializers import ExhibitionTierSerializer
 
@@ -14,6 +15,7 @@ class ExhibitionListAPIView(APIView):
     # Public endpoint - no authentication required
     permission_classes = [AllowAny]
 
+    @cached_response(ExhibitionTier, ExhibitionOption, ExhibitionImage)
     def get(self, request, *args, **kwargs):
         tier_name = request.data.get('tier', None)
         # Prefetch related options and images to minimize database queries
@@ -9,4 +9,5 @@ urlpatterns = [
     path('nominations/', include('nomination.urls')),
     path('awards/', include('awards.urls')),
     path('security/', include('security.urls')),
+    path('logs/', include('logs.urls')),
 ]
\ No newline at end of file
@@ -1,5 +1,5 @@
 from rest_framework.views import exception_handler
-from django.conf import settings
+from coreconfig.registry import env_registry
 
 
 def custom_exception_handler(exc, context):
@@ -21,22 +21,14 @@ def custom_exception_handler(exc, context):
             
             # If origin is in allowed origins, add CORS headers
             if origin:
-                from urllib.parse import urlparse
-                try:
-                    parsed = urlparse(origin)
-                    origin_domain = f"{parsed.scheme}://{parsed.netloc}"
-                    allowed_origins = getattr(settings, 'CORS_ALLOWED_ORIGINS', [])
-                    
-                    if origin_domain in allowed_origins:
-                        # Add CORS headers to the response
-                        response['Access-Control-Allow-Origin'] = origin_domain
-                        response['Access-Control-Allow-Credentials'] = 'true'
-                        response['Access-Control-Allow-Methods'] = 'GET, POST, PUT, PATCH, DELETE, OPTIONS'
-                        response['Access-Control-Allow-Headers'] = 'Content-Type, Authorization, X-CSRF-Token, X-Csrf-Token'
-                        response['Access-Control-Expose-Headers'] = 'Content-Type'
-                except Exception:
-                    # If parsing fails, don't add headers (let CORS middleware handle it)
-                    pass
+                origin_domain = env_registry.match_cors_origin(origin)
+                if origin_domain:
+                    # Add CORS headers to the response
+                    response['Access-Control-Allow-Origin'] = origin_domain
+                    response['Access-Control-Allow-Credentials'] = 'true'
+                    response['Access-Control-Allow-Methods'] = 'GET, POST, PUT, PATCH, DELETE, OPTIONS'
+                    response['Access-Control-Allow-Headers'] = 'Content-Type, Authorization, X-CSRF-Token, X-Csrf-Token'
+                    response['Access-Control-Expose-Headers'] = 'Content-Type'
     
     return response
 
@@ -15,6 +15,7 @@ from decouple import config, Csv
 import django
 from django.conf import settings
 from .theme_configurations import *
+from coreconfig.registry import EnvironmentAllowedHosts
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -30,7 +31,9 @@ SECRET_KEY = config('SECRET_KEY')
 DEBUG = config('DEBUG', default=False, cast=bool)
 
 
-ALLOWED_HOSTS = config('ALLOWED_HOSTS', cast=Csv())
+# Hosts/origins below are the static seed; more can be added at runtime as
+# EnvironmentSetting rows (see coreconfig.registry)
+ALLOWED_HOSTS = EnvironmentAllowedHosts(config('ALLOWED_HOSTS', cast=Csv()))
 CORS_ALLOWED_ORIGINS = [
     "https://summits.igamingafrika.com",
     "http://summits.igamingafrika.com",
@@ -111,11 +114,14 @@ REST_FRAMEWORK = {
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'logs.profiling.ViewProfilingMiddleware',
+    'logs.slow_queries.SlowQueryMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
+    'coreconfig.middleware.EnvironmentCsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'logs.request_profiler.RequestProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'logs.middleware.ExceptionLoggingMiddleware'
@@ -256,15 +262,144 @@ RABBITMQ_VHOST = config('RABBITMQ_VHOST', default='/')
 # Enable origin validation for POST requests (recommended for production)
 ENABLE_ORIGIN_VALIDATION = config('ENABLE_ORIGIN_VALIDATION', default=True, cast=bool)
 
+# Seconds between checks of the shared EnvironmentSetting registry version
+# (with a per-process cache: reloaded every PROCESS_SNAPSHOT_MAX_AGE seconds)
+ENV_REGISTRY_CHECK_INTERVAL = config('ENV_REGISTRY_CHECK_INTERVAL', default=5, cast=int)
+
+# Seconds between checks of the shared sponsor directory version (sponsor.directory)
+# (with a per-process cache: reloaded every PROCESS_SNAPSHOT_MAX_AGE seconds)
+SPONSOR_DIRECTORY_CHECK_INTERVAL = config('SPONSOR_DIRECTORY_CHECK_INTERVAL', default=5, cast=int)
+
+# Seconds between checks of the shared awards nominee catalog version (awards.catalog)
+# (with a per-process cache: reloaded every PROCESS_SNAPSHOT_MAX_AGE seconds)
+NOMINEE_CATALOG_CHECK_INTERVAL = config('NOMINEE_CATALOG_CHECK_INTERVAL', default=5, cast=int)
+
+# Live awards results feed (awards.live, admin vote summary): seconds between
+# polls of the shared feed, stream lifetime before the browser reconnects,
+# and how long published tally changes stay available for resuming streams
+AWARDS_LIVE_FEED_POLL_INTERVAL = config('AWARDS_LIVE_FEED_POLL_INTERVAL', default=1.0, cast=float)
+AWARDS_LIVE_FEED_MAX_DURATION = config('AWARDS_LIVE_FEED_MAX_DURATION', default=300, cast=int)
+AWARDS_LIVE_FEED_EVENT_TTL = config('AWARDS_LIVE_FEED_EVENT_TTL', default=300, cast=int)
+
+# Unconfirmed awards votes expire after this many hours: their confirmation
+# links are rejected and `manage.py expire_unconfirmed_votes` deletes them
+# (0 keeps them forever)
+AWARDS_UNCONFIRMED_VOTE_TTL_HOURS = config('AWARDS_UNCONFIRMED_VOTE_TTL_HOURS', default=72, cast=int)
+
+# Vote ingestion buffer (awards.vote_buffer): ballots are spooled to local
+# JSONL files and answered with 202; run `manage.py flush_vote_buffer` to
+# store them AWARDS_VOTE_BUFFER_BATCH_SIZE per transaction
+AWARDS_VOTE_BUFFER_ENABLED = config('AWARDS_VOTE_BUFFER_ENABLED', default=False, cast=bool)
+AWARDS_VOTE_BUFFER_DIR = config('AWARDS_VOTE_BUFFER_DIR', default=str(BASE_DIR / 'vote_buffer'))
+AWARDS_VOTE_BUFFER_BATCH_SIZE = config('AWARDS_VOTE_BUFFER_BATCH_SIZE', default=500, cast=int)
+AWARDS_VOTE_BUFFER_FSYNC = config('AWARDS_VOTE_BUFFER_FSYNC', default=True, cast=bool)
+
+# Bloom filter of confirmed (voter_email, category) pairs (awards.confirmed_filter)
+# consulted before the already-voted queries: expected confirmed votes, false
+# positive rate and seconds between full rebuilds from the Vote table. Only
+# used with a shared cache backend (CACHE_BACKEND); ignored with LocMemCache
+AWARDS_CONFIRMED_FILTER_ENABLED = config('AWARDS_CONFIRMED_FILTER_ENABLED', default=True, cast=bool)
+AWARDS_CONFIRMED_FILTER_CAPACITY = config('AWARDS_CONFIRMED_FILTER_CAPACITY', default=100000, cast=int)
+AWARDS_CONFIRMED_FILTER_ERROR_RATE = config('AWARDS_CONFIRMED_FILTER_ERROR_RATE', default=0.001, cast=float)
+AWARDS_CONFIRMED_FILTER_REBUILD_INTERVAL = config('AWARDS_CONFIRMED_FILTER_REBUILD_INTERVAL', default=600, cast=int)
+
 # Optional: Separate secret for request signing (uses SECRET_KEY if not set)
 API_SIGNING_SECRET = config('API_SIGNING_SECRET', default=SECRET_KEY)
 
 # Cache backend for rate limiting (uses default cache if available)
 # Make sure CACHES is configured in your settings
+# Cross-worker invalidation (environment registry, sponsor directory, nominee
+# catalog, response cache versions, live feed) needs a backend shared by all
+# worker processes, e.g. CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+# with CACHE_LOCATION=redis://host:6379/1. With the default per-process
+# LocMemCache a change made in one worker reaches the others only when their
+# snapshot is older than PROCESS_SNAPSHOT_MAX_AGE seconds (cached API
+# responses: RESPONSE_CACHE_TIMEOUT), and the confirmed voter filter is off.
+CACHE_BACKEND = config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache')
+CACHE_LOCATION = config('CACHE_LOCATION', default='unique-snowflake')
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': CACHE_LOCATION,
     }
 }
 
+# Upper bound, in seconds, on how long a worker keeps a process-wide snapshot
+# when the cache backend is per-process (coreconfig.shared_cache)
+PROCESS_SNAPSHOT_MAX_AGE = config('PROCESS_SNAPSHOT_MAX_AGE', default=60, cast=int)
+
+
+
+# Buffered LogEntry writer (logs.utils.log_message)
+# Overflow policy when the queue is full: drop_newest, drop_oldest, block or sync
+LOGS_BUFFER_ENABLED = config('LOGS_BUFFER_ENABLED', default=True, cast=bool)
+LOGS_BUFFER_MAX_SIZE = config('LOGS_BUFFER_MAX_SIZE', default=10000, cast=int)
+LOGS_BUFFER_BATCH_SIZE = config('LOGS_BUFFER_BATCH_SIZE', default=200, cast=int)
+LOGS_BUFFER_FLUSH_INTERVAL_MS = config('LOGS_BUFFER_FLUSH_INTERVAL_MS', default=500, cast=int)
+LOGS_BUFFER_OVERFLOW = config('LOGS_BUFFER_OVERFLOW', default='drop_oldest')
+
+# Standard `logging` records at or above LOGS_HANDLER_LEVEL are also stored as
+# LogEntry rows, through a queue + listener thread and the buffered writer;
+# WARNING and above are printed to stderr as well. The test runner
+# (coreconfig.test_runner) detaches the LogEntry handler, since records logged
+# while the test database is created would be flushed into it mid-migration;
+# set LOGS_HANDLER_ENABLED=False for other runners (pytest).
+LOGS_HANDLER_LEVEL = config('LOGS_HANDLER_LEVEL', default='WARNING')
+LOGS_HANDLER_ENABLED = config('LOGS_HANDLER_ENABLED', default=True, cast=bool)
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'level': 'WARNING',
+        },
+        'logentry': {
+            'class': 'logs.handlers.LogEntryQueueHandler',
+            'level': LOGS_HANDLER_LEVEL,
+            'max_size': LOGS_BUFFER_MAX_SIZE,
+        },
+    },
+    'root': {
+        'handlers': ['console', 'logentry'] if LOGS_HANDLER_ENABLED else ['console'],
+        'level': LOGS_HANDLER_LEVEL,
+    },
+}
+TEST_RUNNER = 'coreconfig.test_runner.TestRunner'
+
+# ExceptionLoggingMiddleware: error responses are counted per (status, path
+# pattern, source_app) and written as one LogEntry per window
+LOGS_ERROR_STATUSES = [401, 403, 404, 500]
+LOGS_ERROR_AGGREGATION_WINDOW = config('LOGS_ERROR_AGGREGATION_WINDOW', default=60, cast=int)
+# Fraction of events recorded per status, e.g. LOGS_ERROR_SAMPLE_RATES=404:0.1,401:0.5;
+# counts are scaled back up
+LOGS_ERROR_SAMPLE_RATES = config(
+    'LOGS_ERROR_SAMPLE_RATES',
+    default='',
+    cast=Csv(cast=lambda item: (int(item.split(':')[0]), float(item.split(':')[1])), post_process=dict),
+)
+
+# LogEntry retention (python manage.py purge_logs)
+LOGS_RETENTION_DAYS = config('LOGS_RETENTION_DAYS', default=90, cast=int)
+# Monthly gzipped NDJSON archives of purged rows; set empty to delete without archiving
+LOGS_ARCHIVE_DIR = config('LOGS_ARCHIVE_DIR', default=str(BASE_DIR / 'logs_archive'))
+
+# Per-view latency histograms (logs.profiling.ViewProfilingMiddleware), merged
+# into the shared cache every VIEW_METRICS_MERGE_INTERVAL seconds
+VIEW_METRICS_ENABLED = config('VIEW_METRICS_ENABLED', default=True, cast=bool)
+VIEW_METRICS_MERGE_INTERVAL = config('VIEW_METRICS_MERGE_INTERVAL', default=10, cast=int)
+
+# API response cache (coreconfig.response_cache.cached_response); entries are
+# invalidated by model signals and expire after RESPONSE_CACHE_TIMEOUT seconds.
+# Cached views send an ETag of the body they serve, stored with the entry
+RESPONSE_CACHE_ENABLED = config('RESPONSE_CACHE_ENABLED', default=True, cast=bool)
+RESPONSE_CACHE_TIMEOUT = config('RESPONSE_CACHE_TIMEOUT', default=300, cast=int)
+
+# Staff-only on-demand profiling: send "X-Profile-Request: 1" (or ?_profile=1)
+# to store a RequestProfile, or "download" to get the .prof file back
+REQUEST_PROFILING_ENABLED = config('REQUEST_PROFILING_ENABLED', default=True, cast=bool)
+
+# Statements slower than this are aggregated per normalized SQL into SlowQuery
+# (web requests via logs.slow_queries.SlowQueryMiddleware, plus consume_emails)
+SLOW_QUERY_CAPTURE_ENABLED = config('SLOW_QUERY_CAPTURE_ENABLED', default=True, cast=bool)
+SLOW_QUERY_THRESHOLD_MS = config('SLOW_QUERY_THRESHOLD_MS', default=200, cast=float)
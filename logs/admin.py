@@ -1,10 +1,108 @@
-from django.contrib import admin
-from .models import LogEntry
+from django.contrib import admin, messages
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import path
+from django.utils.html import format_html
+from .models import LogEntry, RequestProfile, SlowQuery
+from .pagination import EstimatedCountPaginator
+from .profiling import view_metrics
+from coreconfig.response_cache import response_cache_metrics
 from import_export.admin import ImportExportModelAdmin
 
 
 @admin.register(LogEntry)
 class LogEntryAdmin(ImportExportModelAdmin):
-    list_display = ('level', 'message', 'source_app', 'user', 'created_at')
+    import_export_change_list_template = 'admin/logs/logentry_change_list.html'
+    list_display = ('level', 'message', 'source_app', 'user', 'occurrences', 'created_at', 'last_seen_at')
     list_filter = ('level', 'source_app', 'created_at')
     search_fields = ('message', 'exception')
+    list_select_related = ('user',)
+    ordering = ('-created_at',)
+    # Avoid COUNT(*) over the whole table on every changelist load
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_urls(self):
+        urls = super().get_urls()
+        custom_urls = [
+            path(
+                'performance/',
+                self.admin_site.admin_view(self.view_metrics_view),
+                name='logs_view_metrics',
+            ),
+        ]
+        return custom_urls + urls
+
+    def view_metrics_view(self, request):
+        if request.method == 'POST' and request.POST.get('reset'):
+            view_metrics.reset()
+            response_cache_metrics.reset()
+            messages.success(request, "View metrics reset.")
+            return redirect('admin:logs_view_metrics')
+        context = dict(
+            self.admin_site.each_context(request),
+            title='View Performance',
+            views=view_metrics.snapshot(),
+            response_cache=response_cache_metrics.snapshot(),
+        )
+        return render(request, 'admin/logs/view_metrics.html', context)
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    list_display = ('id', 'method', 'path', 'view', 'status_code', 'duration_ms', 'db_ms',
+                    'query_count', 'user', 'created_at', 'download_button')
+    list_filter = ('method', 'status_code', 'created_at')
+    search_fields = ('path', 'view')
+    list_select_related = ('user',)
+    exclude = ('profile_data',)
+    readonly_fields = ('method', 'path', 'view', 'status_code', 'duration_ms', 'db_ms', 'query_count',
+                       'user', 'created_at', 'stats', 'queries')
+
+    def has_add_permission(self, request):
+        return False
+
+    def download_button(self, obj):
+        return format_html(
+            '<a class="button" href="{}">Download .prof</a>',
+            f'/admin/logs/requestprofile/{obj.id}/download/',
+        )
+    download_button.short_description = 'Profile'
+
+    def get_urls(self):
+        urls = super().get_urls()
+        custom_urls = [
+            path(
+                '<int:profile_id>/download/',
+                self.admin_site.admin_view(self.download_view),
+                name='logs_requestprofile_download',
+            ),
+        ]
+        return custom_urls + urls
+
+    def download_view(self, request, profile_id):
+        profile = get_object_or_404(RequestProfile, id=profile_id)
+        response = HttpResponse(bytes(profile.profile_data), content_type='application/octet-stream')
+        response['Content-Disposition'] = f'attachment; filename="{profile.filename}"'
+        return response
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    list_display = ('short_sql', 'source', 'occurrences', 'mean_ms_display', 'max_ms', 'total_ms', 'last_seen_at')
+    list_filter = ('last_seen_at',)
+    search_fields = ('sql', 'source')
+    ordering = ('-total_ms',)
+    readonly_fields = ('fingerprint', 'sql', 'source', 'occurrences', 'total_ms', 'max_ms', 'last_ms',
+                       'last_params_fingerprint', 'last_stack', 'first_seen_at', 'last_seen_at')
+
+    def has_add_permission(self, request):
+        return False
+
+    def short_sql(self, obj):
+        return obj.sql[:120]
+    short_sql.short_description = 'SQL'
+
+    def mean_ms_display(self, obj):
+        return f"{obj.mean_ms:.1f}"
+    mean_ms_display.short_description = 'Mean ms'
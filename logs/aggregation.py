@@ -0,0 +1,107 @@
+"""
+Error response aggregation
+Counts identical (status, path pattern, source_app) events in memory and
+writes one LogEntry per key and window, so a scanner hitting thousands of
+random URLs costs a handful of rows instead of one insert per request.
+Windows are flushed by the log writer thread's tick (whether or not
+LOGS_BUFFER_ENABLED queues the rows), never on the request path.
+"""
+import random
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.utils.timezone import now
+
+from .models import LogEntry
+from .utils import log_buffer, save_log_entry
+
+_NUMBER_RE = re.compile(r'\d+')
+
+# Keys beyond this many per window are folded into a single catch-all bucket
+MAX_KEYS_PER_WINDOW = 1000
+OVERFLOW_PATTERN = '(other paths)'
+
+
+def path_pattern(request):
+    """URL route for resolved requests; first path segment for unresolved ones."""
+    match = getattr(request, 'resolver_match', None)
+    if match is not None and match.route:
+        return '/' + match.route
+    segments = [s for s in request.path.split('/') if s]
+    if not segments:
+        return '/'
+    first = _NUMBER_RE.sub('<n>', segments[0])[:60]
+    return f'/{first}/*' if len(segments) > 1 else f'/{first}'
+
+
+class ErrorAggregator:
+    """In-process counter of error responses, flushed once per window."""
+
+    def __init__(self, window_seconds=60):
+        self.window_seconds = window_seconds
+        self._lock = threading.Lock()
+        self._events = {}
+        self._window_started = time.monotonic()
+
+    def sample_rate(self, status_code):
+        rates = getattr(settings, 'LOGS_ERROR_SAMPLE_RATES', {}) or {}
+        return float(rates.get(status_code, rates.get(str(status_code), 1.0)))
+
+    def record(self, status_code, reason, pattern, source_app='', user_id=None):
+        """Count one event. Sampled statuses are recorded with weight 1/rate."""
+        rate = self.sample_rate(status_code)
+        if rate <= 0 or (rate < 1 and random.random() >= rate):
+            return
+        weight = 1.0 / rate
+        seen_at = now()
+
+        with self._lock:
+            key = (status_code, pattern, source_app)
+            if key not in self._events and len(self._events) >= MAX_KEYS_PER_WINDOW:
+                key = (status_code, OVERFLOW_PATTERN, source_app)
+            event = self._events.get(key)
+            if event is None:
+                self._events[key] = {
+                    'count': weight,
+                    'reason': reason,
+                    'first_seen': seen_at,
+                    'last_seen': seen_at,
+                    'user_id': user_id,
+                    'sampled': rate < 1,
+                }
+            else:
+                event['count'] += weight
+                event['last_seen'] = seen_at
+
+        # The writer thread's tick flushes the window once it has elapsed
+        log_buffer.start()
+
+    def flush(self, force=False):
+        """Queue one LogEntry per aggregated key once the window has elapsed."""
+        if not force and time.monotonic() - self._window_started < self.window_seconds:
+            return
+        with self._lock:
+            events, self._events = self._events, {}
+            self._window_started = time.monotonic()
+
+        for (status_code, pattern, source_app), event in events.items():
+            count = max(1, int(round(event['count'])))
+            message = f"{status_code} - {event['reason']}: {pattern}"
+            if count > 1:
+                message += f" (x{count}{', sampled' if event['sampled'] else ''})"
+            save_log_entry(LogEntry(
+                level='ERROR',
+                message=message,
+                source_app=source_app,
+                user_id=event['user_id'],
+                occurrences=count,
+                first_seen_at=event['first_seen'],
+                last_seen_at=event['last_seen'],
+                created_at=event['first_seen'],
+            ))
+
+
+error_aggregator = ErrorAggregator(getattr(settings, 'LOGS_ERROR_AGGREGATION_WINDOW', 60))
+log_buffer.add_tick_callback(error_aggregator.flush)
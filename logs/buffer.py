@@ -0,0 +1,179 @@
+"""
+Buffered background writer
+Collects records in a bounded in-process queue and hands them to a flush
+function in batches from a daemon thread, so request code never waits on a
+database commit. Pending records are flushed on process shutdown.
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_DROP_NEWEST = 'drop_newest'
+OVERFLOW_DROP_OLDEST = 'drop_oldest'
+OVERFLOW_BLOCK = 'block'
+OVERFLOW_SYNC = 'sync'
+OVERFLOW_POLICIES = (OVERFLOW_DROP_NEWEST, OVERFLOW_DROP_OLDEST, OVERFLOW_BLOCK, OVERFLOW_SYNC)
+
+
+class BufferedWriter:
+    """
+    Bounded queue + daemon thread that calls flush_func(batch) every
+    `batch_size` records or `flush_interval_ms` milliseconds, whichever
+    comes first.
+
+    Overflow policies when the queue is full:
+        drop_newest - discard the incoming record
+        drop_oldest - discard the oldest queued record to make room
+        block       - wait up to `block_timeout` seconds, then drop
+        sync        - write the record immediately in the caller's thread
+    """
+
+    def __init__(self, flush_func, name='buffered-writer', max_size=10000, batch_size=200,
+                 flush_interval_ms=500, overflow=OVERFLOW_DROP_OLDEST, block_timeout=1.0):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{overflow}', expected one of {OVERFLOW_POLICIES}")
+        self.flush_func = flush_func
+        self.name = name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.dropped = 0
+        self.written = 0
+        self._queue = queue.Queue(maxsize=max_size)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._tick_callbacks = []
+        atexit.register(self.shutdown)
+
+    def add_tick_callback(self, callback):
+        """
+        Run callback(force=False) from the writer thread roughly every flush
+        interval, and callback(force=True) once at shutdown.
+        """
+        self._tick_callbacks.append(callback)
+
+    def _ensure_thread(self):
+        # Threads do not survive fork(); restart the worker in each child process
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._stop.clear()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def start(self):
+        self._ensure_thread()
+
+    def put(self, record):
+        """Queue a record. Returns False if it was dropped by the overflow policy."""
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except queue.Full:
+            pass
+
+        if self.overflow == OVERFLOW_SYNC:
+            self._write([record])
+            return True
+        if self.overflow == OVERFLOW_DROP_OLDEST:
+            try:
+                self._queue.get_nowait()
+                self.dropped += 1
+            except queue.Empty:
+                pass
+            try:
+                self._queue.put_nowait(record)
+                return True
+            except queue.Full:
+                pass
+        elif self.overflow == OVERFLOW_BLOCK:
+            try:
+                self._queue.put(record, timeout=self.block_timeout)
+                return True
+            except queue.Full:
+                pass
+        self.dropped += 1
+        return False
+
+    def _drain(self, first):
+        """Collect up to batch_size records, waiting at most flush_interval for the batch to fill."""
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        try:
+            self.flush_func(batch)
+            self.written += len(batch)
+        except Exception as e:
+            self.dropped += len(batch)
+            logger.error(f"{self.name}: failed to flush {len(batch)} record(s): {e}")
+
+    def _tick(self, force=False):
+        for callback in self._tick_callbacks:
+            try:
+                callback(force=force)
+            except Exception as e:
+                logger.error(f"{self.name}: tick callback failed: {e}")
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._tick()
+                close_old_connections()
+                continue
+            self._write(self._drain(first))
+            self._tick()
+            close_old_connections()
+
+    def flush(self):
+        """Synchronously write everything currently queued."""
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+            if len(batch) >= self.batch_size:
+                self._write(batch)
+                batch = []
+        if batch:
+            self._write(batch)
+
+    def shutdown(self):
+        self._stop.set()
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            self._thread.join(timeout=self.flush_interval + 1)
+        self._tick(force=True)
+        self.flush()
+
+    def stats(self):
+        return {
+            'queued': self._queue.qsize(),
+            'written': self.written,
+            'dropped': self.dropped,
+        }
@@ -0,0 +1,134 @@
+"""
+Standard logging -> LogEntry bridge
+LogEntryQueueHandler only puts records on an in-memory queue; a
+QueueListener thread turns them into LogEntry objects and hands them to the
+buffered writer, which inserts them in batches. Code that logs (views, the
+email service, consume_emails) never waits on the database.
+
+Configured from settings.LOGGING, i.e. before the app registry is ready, so
+models are imported lazily in the listener thread. Records are dropped until
+the LogEntry table exists (fresh database, before `migrate`).
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+from datetime import datetime, timezone as dt_timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from django.conf import settings
+
+# Loggers that never reach LogEntry: SQL debug output, request errors that
+# ExceptionLoggingMiddleware already aggregates, and this app's own writer
+# (which would feed its failures back into itself)
+DEFAULT_IGNORED_LOGGERS = ('django.db.backends', 'django.request', 'django.server', 'logs')
+
+
+def _level_name(levelno):
+    # LogEntry only knows the five standard levels; custom levels round down
+    return logging.getLevelName(min(logging.CRITICAL, max(logging.DEBUG, levelno // 10 * 10)))
+
+
+class LogEntryHandler(logging.Handler):
+    """Converts records to LogEntry objects and hands them to logs.utils.save_log_entry."""
+
+    def __init__(self):
+        super().__init__()
+        self._table_ready = False
+
+    def table_ready(self):
+        """Whether the LogEntry table exists; only a positive answer is remembered."""
+        if not self._table_ready:
+            from django.db import connection
+            from .models import LogEntry
+            try:
+                self._table_ready = LogEntry._meta.db_table in connection.introspection.table_names()
+            except Exception:
+                return False
+        return self._table_ready
+
+    def emit(self, record):
+        from django.apps import apps
+        if not apps.ready or not self.table_ready():
+            return
+        from .models import LogEntry
+        from .utils import save_log_entry
+
+        try:
+            exception = record.exc_text
+            if record.exc_info:
+                exception = logging.Formatter().formatException(record.exc_info)
+            created_at = datetime.fromtimestamp(record.created, tz=dt_timezone.utc)
+            if not settings.USE_TZ:
+                created_at = datetime.fromtimestamp(record.created)
+            save_log_entry(LogEntry(
+                level=_level_name(record.levelno),
+                message=record.getMessage(),
+                exception=exception,
+                source_app=record.name.split('.')[0][:100],
+                created_at=created_at,
+            ))
+        except Exception:
+            self.handleError(record)
+
+
+class LogEntryQueueHandler(QueueHandler):
+    """
+    Non-blocking handler for settings.LOGGING. Records are dropped (and
+    counted) when the queue is full rather than slowing the caller down.
+    """
+
+    def __init__(self, max_size=10000, ignored_loggers=DEFAULT_IGNORED_LOGGERS):
+        super().__init__(queue.Queue(maxsize=max_size))
+        self.ignored_loggers = tuple(ignored_loggers)
+        self.dropped = 0
+        self._listener = None
+        self._pid = None
+        self._lock = threading.Lock()
+        atexit.register(self.stop)
+
+    def _is_ignored(self, name):
+        return any(name == prefix or name.startswith(prefix + '.') for prefix in self.ignored_loggers)
+
+    def _ensure_listener(self):
+        # The listener thread does not survive fork(); start one per process
+        if self._listener is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._listener is not None and self._pid == os.getpid():
+                return
+            self._listener = QueueListener(self.queue, LogEntryHandler(), respect_handler_level=False)
+            self._pid = os.getpid()
+            self._listener.start()
+
+    def emit(self, record):
+        if self._is_ignored(record.name):
+            return
+        self._ensure_listener()
+        super().emit(record)
+
+    def prepare(self, record):
+        # Resolve the message now (args may change later); the traceback is
+        # formatted by the listener thread instead of the caller
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def stop(self):
+        """Drain the queue into the buffered writer and write it out (runs at exit)."""
+        if self._listener is None or self._pid != os.getpid():
+            return
+        self._listener.stop()
+        self._listener = None
+        from django.apps import apps
+        if apps.ready:
+            from .utils import log_buffer
+            log_buffer.flush()
@@ -0,0 +1,105 @@
+"""
+Django management command to enforce LogEntry retention.
+Rows older than the retention period are optionally archived to monthly
+gzipped NDJSON files and then deleted in small chunks, so the table never
+sits behind one long delete transaction.
+
+Usage:
+    python manage.py purge_logs
+    python manage.py purge_logs --days 30 --chunk-size 2000 --no-archive
+
+Run daily from cron or a systemd timer.
+"""
+import gzip
+import json
+import os
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from logs.models import LogEntry
+
+ARCHIVE_FIELDS = (
+    'id', 'level', 'message', 'exception', 'user_id', 'source_app',
+    'occurrences', 'first_seen_at', 'last_seen_at', 'created_at',
+)
+
+
+class Command(BaseCommand):
+    help = 'Archive and delete LogEntry rows older than the retention period, in chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=getattr(settings, 'LOGS_RETENTION_DAYS', 90),
+            help='Keep rows newer than this many days (default: LOGS_RETENTION_DAYS)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=5000,
+            help='Rows archived/deleted per transaction (default: 5000)',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=0.05,
+            help='Seconds to pause between chunks so request writers get the lock (default: 0.05)',
+        )
+        parser.add_argument(
+            '--archive-dir',
+            default=getattr(settings, 'LOGS_ARCHIVE_DIR', None),
+            help='Directory for monthly logentry-YYYY-MM.jsonl.gz archives (default: LOGS_ARCHIVE_DIR)',
+        )
+        parser.add_argument(
+            '--no-archive',
+            action='store_true',
+            help='Delete without writing archive files',
+        )
+
+    def _archive(self, archive_dir, rows):
+        by_month = {}
+        for row in rows:
+            by_month.setdefault(row['created_at'].strftime('%Y-%m'), []).append(row)
+        for month, month_rows in by_month.items():
+            path = os.path.join(archive_dir, f'logentry-{month}.jsonl.gz')
+            # Appending creates a multi-member gzip file, which gzip readers handle transparently
+            with gzip.open(path, 'at', encoding='utf-8') as fh:
+                for row in month_rows:
+                    fh.write(json.dumps(row, cls=DjangoJSONEncoder) + '\n')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        chunk_size = options['chunk_size']
+        archive_dir = None if options['no_archive'] else options['archive_dir']
+        if archive_dir:
+            os.makedirs(archive_dir, exist_ok=True)
+
+        total = 0
+        while True:
+            rows = list(
+                LogEntry.objects.filter(created_at__lt=cutoff)
+                .order_by('created_at')
+                .values(*ARCHIVE_FIELDS)[:chunk_size]
+            )
+            if not rows:
+                break
+            if archive_dir:
+                self._archive(archive_dir, rows)
+            LogEntry.objects.filter(id__in=[row['id'] for row in rows]).delete()
+            total += len(rows)
+            self.stdout.write(f'Purged {total} log entries so far...')
+            if options['sleep']:
+                time.sleep(options['sleep'])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Purged {total} log entries older than {cutoff:%Y-%m-%d %H:%M}'
+                + (f' (archived to {archive_dir})' if archive_dir and total else '')
+            )
+        )
@@ -1,31 +1,50 @@
 import traceback
+
+from django.conf import settings
+from django.utils.timezone import now
+
+from .aggregation import error_aggregator, path_pattern
 from .models import LogEntry
+from .utils import save_log_entry
+
+
+def _user_id(request):
+    user = getattr(request, 'user', None)
+    return user.pk if user is not None and user.is_authenticated else None
+
+
+def _source_app(request):
+    return request.resolver_match.app_name if getattr(request, 'resolver_match', None) else ''
+
 
 class ExceptionLoggingMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
+        self.logged_statuses = set(getattr(settings, 'LOGS_ERROR_STATUSES', [401, 403, 404, 500]))
 
     def __call__(self, request):
         try:
             response = self.get_response(request)
         except Exception as e:
-            # Log unhandled exceptions
-            LogEntry.objects.create(
+            # Log unhandled exceptions (one row each, traceback kept)
+            save_log_entry(LogEntry(
                 level='ERROR',
                 message=str(e),
                 exception=traceback.format_exc(),
-                user=request.user if request.user.is_authenticated else None,
-                source_app=request.resolver_match.app_name if request.resolver_match else '',
-            )
+                user_id=_user_id(request),
+                source_app=_source_app(request),
+                created_at=now(),
+            ))
             raise  # Reraise for default error behavior
         else:
-            # Also capture handled HTTP error responses like 401/403/404
-            if response.status_code in [401, 403, 404, 500]:
-                LogEntry.objects.create(
-                    level='ERROR',
-                    message=f"{response.status_code} - {response.reason_phrase}",
-                    exception=None,
-                    user=request.user if request.user.is_authenticated else None,
-                    source_app=request.resolver_match.app_name if request.resolver_match else '',
+            # Also capture handled HTTP error responses like 401/403/404,
+            # aggregated per (status, path pattern, source_app) and window
+            if response.status_code in self.logged_statuses:
+                error_aggregator.record(
+                    response.status_code,
+                    response.reason_phrase,
+                    path_pattern(request),
+                    source_app=_source_app(request),
+                    user_id=_user_id(request),
                 )
             return response
@@ -18,7 +18,72 @@ class LogEntry(models.Model):
     exception = models.TextField(blank=True, null=True)
     user = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL, related_name='custom_log_entries')
     source_app = models.CharField(max_length=100, blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Aggregated error responses: number of events folded into this row
+    occurrences = models.PositiveIntegerField(default=1)
+    first_seen_at = models.DateTimeField(null=True, blank=True)
+    last_seen_at = models.DateTimeField(null=True, blank=True)
+    # Set when the event happens, not when the buffered writer flushes it
+    created_at = models.DateTimeField(default=now, editable=False)
+
+    class Meta:
+        # Match the admin filters (level / source_app / date) and newest-first ordering
+        indexes = [
+            models.Index(fields=['-created_at'], name='logs_entry_created_idx'),
+            models.Index(fields=['level', '-created_at'], name='logs_entry_level_created_idx'),
+            models.Index(fields=['source_app', '-created_at'], name='logs_entry_source_created_idx'),
+        ]
 
     def __str__(self):
         return f"[{self.level}] {self.message[:50]}"
+
+
+class RequestProfile(models.Model):
+    """cProfile output and captured SQL for one staff-requested profiling run."""
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=500)
+    view = models.CharField(max_length=255, blank=True)
+    status_code = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    db_ms = models.FloatField()
+    query_count = models.PositiveIntegerField()
+    stats = models.TextField(help_text="pstats report sorted by cumulative time")
+    queries = models.JSONField(default=list, help_text="SQL statements with timings and call stacks")
+    profile_data = models.BinaryField(help_text="Raw marshalled pstats data (open with pstats/snakeviz)")
+    user = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL, related_name='request_profiles')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
+
+    @property
+    def filename(self):
+        return f"profile-{self.id}-{self.created_at:%Y%m%d-%H%M%S}.prof"
+
+
+class SlowQuery(models.Model):
+    """SQL statements slower than SLOW_QUERY_THRESHOLD_MS, aggregated per normalized statement."""
+    fingerprint = models.CharField(max_length=40, unique=True)
+    sql = models.TextField(help_text="Normalized statement (literals and IN/VALUES lists collapsed)")
+    source = models.CharField(max_length=255, blank=True, help_text="View or management command of the last occurrence")
+    occurrences = models.PositiveIntegerField(default=0)
+    total_ms = models.FloatField(default=0)
+    max_ms = models.FloatField(default=0)
+    last_ms = models.FloatField(default=0)
+    last_params_fingerprint = models.CharField(max_length=40, blank=True)
+    last_stack = models.JSONField(default=list)
+    first_seen_at = models.DateTimeField(default=now)
+    last_seen_at = models.DateTimeField(default=now)
+
+    class Meta:
+        ordering = ['-total_ms']
+        verbose_name_plural = 'Slow queries'
+
+    def __str__(self):
+        return f"{self.sql[:80]} ({self.occurrences}x, max {self.max_ms:.0f} ms)"
+
+    @property
+    def mean_ms(self):
+        return self.total_ms / self.occurrences if self.occurrences else 0.0
@@ -0,0 +1,51 @@
+import hashlib
+
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Max, Min
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator for very large tables.
+
+    Unfiltered lists use a cheap estimate (pg_class.reltuples on PostgreSQL,
+    primary key span elsewhere) instead of COUNT(*). Filtered lists run the
+    exact count once and cache it for COUNT_CACHE_TIMEOUT seconds.
+    """
+    COUNT_CACHE_TIMEOUT = 60
+
+    def _estimate(self, queryset):
+        model = queryset.model
+        connection = connections[queryset.db]
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                    [model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            if row and row[0] > 0:
+                return int(row[0])
+        bounds = model._default_manager.using(queryset.db).aggregate(low=Min('pk'), high=Max('pk'))
+        if bounds['low'] is None:
+            return 0
+        return bounds['high'] - bounds['low'] + 1
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not hasattr(queryset, 'query'):
+            return super().count
+        if not queryset.query.where:
+            return self._estimate(queryset)
+
+        sql, params = queryset.query.sql_with_params()
+        key = 'paginator_count_' + hashlib.md5(f'{sql}{params}'.encode()).hexdigest()
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count()
+            cache.set(key, count, timeout=self.COUNT_CACHE_TIMEOUT)
+        return count
@@ -0,0 +1,242 @@
+"""
+Per-view latency metrics
+Wall time, DB time and query count per resolved view, kept in fixed-bucket
+histograms in each process and periodically merged into the shared cache so
+p50/p95/p99 can be reported across all workers.
+"""
+import bisect
+import os
+import threading
+import time
+import traceback
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from .utils import log_buffer
+
+# Histogram upper bounds in milliseconds (roughly x1.5 apart); the last bucket is open-ended
+BUCKET_BOUNDS_MS = [
+    0.5, 1, 1.5, 2, 3, 5, 7.5, 10, 15, 20, 30, 50, 75, 100, 150, 200, 300,
+    500, 750, 1000, 1500, 2000, 3000, 5000, 7500, 10000, 15000, 30000,
+]
+NUM_BUCKETS = len(BUCKET_BOUNDS_MS) + 1
+
+CACHE_INDEX_KEY = 'view_metrics_index'
+CACHE_KEY_PREFIX = 'view_metrics:'
+CACHE_LOCK_KEY = 'view_metrics_lock'
+CACHE_TIMEOUT = 7 * 24 * 3600
+
+
+# Frames from these paths (and from the logs middleware/execute wrappers) are noise in SQL call stacks
+_LIBRARY_PATHS = (os.path.dirname(os.__file__), 'site-packages', 'dist-packages')
+_LOGS_DIR = os.path.dirname(os.path.abspath(__file__))
+_WRAPPER_MODULES = {'profiling.py', 'request_profiler.py', 'slow_queries.py', 'middleware.py'}
+
+
+def _is_noise(filename):
+    if os.path.dirname(filename) == _LOGS_DIR and os.path.basename(filename) in _WRAPPER_MODULES:
+        return True
+    return any(lib in filename for lib in _LIBRARY_PATHS)
+
+
+def short_stack(limit=8):
+    """Project frames leading to the current SQL statement, innermost last."""
+    frames = [f for f in traceback.extract_stack() if not _is_noise(f.filename)]
+    return [f"{f.filename}:{f.lineno} in {f.name}" for f in frames[-limit:]]
+
+
+def _cache_key(view):
+    return CACHE_KEY_PREFIX + view.replace(' ', '_')
+
+
+def bucket_index(value_ms):
+    return bisect.bisect_left(BUCKET_BOUNDS_MS, value_ms)
+
+
+def histogram_percentile(buckets, pct):
+    """Estimate a percentile from bucket counts, interpolating inside the bucket."""
+    total = sum(buckets)
+    if not total:
+        return 0.0
+    target = pct / 100.0 * total
+    running = 0
+    for index, count in enumerate(buckets):
+        if count and running + count >= target:
+            low = BUCKET_BOUNDS_MS[index - 1] if index > 0 else 0.0
+            high = BUCKET_BOUNDS_MS[index] if index < len(BUCKET_BOUNDS_MS) else low * 2
+            return low + (high - low) * ((target - running) / count)
+        running += count
+    return BUCKET_BOUNDS_MS[-1]
+
+
+def empty_stats():
+    return {
+        'count': 0,
+        'wall_ms_sum': 0.0,
+        'db_ms_sum': 0.0,
+        'queries_sum': 0,
+        'queries_max': 0,
+        'wall_buckets': [0] * NUM_BUCKETS,
+        'db_buckets': [0] * NUM_BUCKETS,
+    }
+
+
+def merge_stats(target, source):
+    target['count'] += source['count']
+    target['wall_ms_sum'] += source['wall_ms_sum']
+    target['db_ms_sum'] += source['db_ms_sum']
+    target['queries_sum'] += source['queries_sum']
+    target['queries_max'] = max(target['queries_max'], source['queries_max'])
+    for name in ('wall_buckets', 'db_buckets'):
+        target[name] = [a + b for a, b in zip(target[name], source[name])]
+    return target
+
+
+def summarize(view, stats):
+    count = stats['count'] or 1
+    return {
+        'view': view,
+        'count': stats['count'],
+        'wall_ms_mean': round(stats['wall_ms_sum'] / count, 2),
+        'wall_ms_p50': round(histogram_percentile(stats['wall_buckets'], 50), 2),
+        'wall_ms_p95': round(histogram_percentile(stats['wall_buckets'], 95), 2),
+        'wall_ms_p99': round(histogram_percentile(stats['wall_buckets'], 99), 2),
+        'db_ms_mean': round(stats['db_ms_sum'] / count, 2),
+        'db_ms_p95': round(histogram_percentile(stats['db_buckets'], 95), 2),
+        'queries_mean': round(stats['queries_sum'] / count, 2),
+        'queries_max': stats['queries_max'],
+    }
+
+
+class QueryTimer:
+    """execute_wrapper that accumulates SQL time and statement count for one request."""
+
+    __slots__ = ('count', 'db_ms')
+
+    def __init__(self):
+        self.count = 0
+        self.db_ms = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_ms += (time.perf_counter() - start) * 1000
+            self.count += 1
+
+
+class ViewMetrics:
+    """In-process histograms per view, merged into the shared cache by the log writer thread."""
+
+    def __init__(self, merge_interval=10):
+        self.merge_interval = merge_interval
+        self._lock = threading.Lock()
+        self._local = {}
+        self._merged_at = time.monotonic()
+
+    def record(self, view, wall_ms, db_ms, queries):
+        with self._lock:
+            stats = self._local.get(view)
+            if stats is None:
+                stats = self._local[view] = empty_stats()
+            stats['count'] += 1
+            stats['wall_ms_sum'] += wall_ms
+            stats['db_ms_sum'] += db_ms
+            stats['queries_sum'] += queries
+            if queries > stats['queries_max']:
+                stats['queries_max'] = queries
+            stats['wall_buckets'][bucket_index(wall_ms)] += 1
+            stats['db_buckets'][bucket_index(db_ms)] += 1
+
+    def _acquire_cache_lock(self):
+        for _ in range(20):
+            if cache.add(CACHE_LOCK_KEY, 1, timeout=5):
+                return True
+            time.sleep(0.01)
+        return False
+
+    def merge(self, force=False):
+        """Add local counts to the shared cache copy and reset them."""
+        if not force and time.monotonic() - self._merged_at < self.merge_interval:
+            return
+        self._merged_at = time.monotonic()
+        with self._lock:
+            local, self._local = self._local, {}
+        if not local:
+            return
+        if not self._acquire_cache_lock():
+            # Shared copy busy; keep the counts for the next merge
+            with self._lock:
+                for view, stats in local.items():
+                    merge_stats(self._local.setdefault(view, empty_stats()), stats)
+            return
+        try:
+            index = set(cache.get(CACHE_INDEX_KEY) or [])
+            keys = {view: _cache_key(view) for view in local}
+            shared = cache.get_many(list(keys.values()))
+            updated = {}
+            for view, stats in local.items():
+                updated[keys[view]] = merge_stats(shared.get(keys[view]) or empty_stats(), stats)
+            cache.set_many(updated, timeout=CACHE_TIMEOUT)
+            index.update(local)
+            cache.set(CACHE_INDEX_KEY, sorted(index), timeout=CACHE_TIMEOUT)
+        finally:
+            cache.delete(CACHE_LOCK_KEY)
+
+    def snapshot(self):
+        """Summaries across all workers (shared cache plus this process' unmerged counts)."""
+        views = cache.get(CACHE_INDEX_KEY) or []
+        shared = cache.get_many([_cache_key(view) for view in views])
+        combined = {view: shared[_cache_key(view)] for view in views if _cache_key(view) in shared}
+        with self._lock:
+            for view, stats in self._local.items():
+                merge_stats(combined.setdefault(view, empty_stats()), stats)
+        rows = [summarize(view, stats) for view, stats in combined.items()]
+        return sorted(rows, key=lambda row: row['wall_ms_p95'], reverse=True)
+
+    def reset(self):
+        views = cache.get(CACHE_INDEX_KEY) or []
+        cache.delete_many([_cache_key(view) for view in views] + [CACHE_INDEX_KEY])
+        with self._lock:
+            self._local = {}
+
+
+def view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return None
+    func = match.func
+    view_class = getattr(func, 'view_class', None) or getattr(func, 'cls', None)
+    target = view_class or func
+    return f"{request.method} {target.__module__}.{getattr(target, '__qualname__', target.__class__.__name__)}"
+
+
+view_metrics = ViewMetrics(getattr(settings, 'VIEW_METRICS_MERGE_INTERVAL', 10))
+log_buffer.add_tick_callback(view_metrics.merge)
+
+
+class ViewProfilingMiddleware:
+    """Record wall time, DB time and query count for every resolved view."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'VIEW_METRICS_ENABLED', True)
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        log_buffer.start()
+        timer = QueryTimer()
+        start = time.perf_counter()
+        with connection.execute_wrapper(timer):
+            response = self.get_response(request)
+        wall_ms = (time.perf_counter() - start) * 1000
+
+        name = view_name(request)
+        if name is not None:
+            view_metrics.record(name, wall_ms, timer.db_ms, timer.count)
+        return response
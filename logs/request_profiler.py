@@ -0,0 +1,123 @@
+"""
+On-demand request profiling
+Staff users can add the X-Profile-Request header (or ?_profile=1) to any
+request to run it under cProfile with every SQL statement captured. The
+result is stored as a RequestProfile; with the value "download" the raw
+.prof file is returned instead of the normal response.
+"""
+import cProfile
+import io
+import marshal
+import pstats
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.http import HttpResponse
+from rest_framework.authentication import TokenAuthentication
+
+from .models import RequestProfile
+from .profiling import short_stack, view_name
+
+PROFILE_HEADER = 'HTTP_X_PROFILE_REQUEST'
+PROFILE_QUERY_PARAM = '_profile'
+DOWNLOAD = 'download'
+
+
+class QueryRecorder:
+    """execute_wrapper that keeps every statement with its timing and call stack."""
+
+    def __init__(self, max_queries=1000):
+        self.max_queries = max_queries
+        self.queries = []
+        self.count = 0
+        self.db_ms = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = (time.perf_counter() - start) * 1000
+            self.count += 1
+            self.db_ms += duration
+            if len(self.queries) < self.max_queries:
+                self.queries.append({
+                    'sql': sql,
+                    'params': repr(params)[:500],
+                    'ms': round(duration, 3),
+                    'many': many,
+                    'stack': short_stack(),
+                })
+
+
+def _requested_mode(request):
+    value = request.META.get(PROFILE_HEADER) or request.GET.get(PROFILE_QUERY_PARAM)
+    if not value or value in ('0', 'false'):
+        return None
+    return DOWNLOAD if value == DOWNLOAD else 'store'
+
+
+def _profile_user(request):
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return user
+    # API clients authenticate with DRF tokens, which the session middleware does not see
+    try:
+        result = TokenAuthentication().authenticate(request)
+    except Exception:
+        return None
+    return result[0] if result else None
+
+
+class RequestProfilingMiddleware:
+    """Profile a single request for staff users who ask for it."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'REQUEST_PROFILING_ENABLED', True)
+
+    def __call__(self, request):
+        mode = _requested_mode(request) if self.enabled else None
+        if mode is None:
+            return self.get_response(request)
+        user = _profile_user(request)
+        if user is None or not user.is_staff:
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        with connection.execute_wrapper(recorder):
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+        duration_ms = (time.perf_counter() - start) * 1000
+
+        stats_stream = io.StringIO()
+        stats = pstats.Stats(profiler, stream=stats_stream)
+        stats.sort_stats('cumulative').print_stats(60)
+
+        profile = RequestProfile.objects.create(
+            method=request.method,
+            path=request.get_full_path()[:500],
+            view=view_name(request) or '',
+            status_code=response.status_code,
+            duration_ms=round(duration_ms, 3),
+            db_ms=round(recorder.db_ms, 3),
+            query_count=recorder.count,
+            stats=stats_stream.getvalue(),
+            queries=recorder.queries,
+            profile_data=marshal.dumps(stats.stats),
+            user=user,
+        )
+
+        if mode == DOWNLOAD:
+            response = HttpResponse(profile.profile_data, content_type='application/octet-stream')
+            response['Content-Disposition'] = f'attachment; filename="{profile.filename}"'
+        response['X-Profile-Id'] = str(profile.id)
+        response['X-Profile-Duration-Ms'] = f'{duration_ms:.1f}'
+        response['X-Profile-Queries'] = str(recorder.count)
+        return response
@@ -0,0 +1,176 @@
+"""
+Slow query capture
+An execute_wrapper that times every statement and keeps the ones slower
+than SLOW_QUERY_THRESHOLD_MS. Captures are aggregated in memory per
+normalized statement and written to SlowQuery rows by the log writer
+thread, so the query path itself never waits on an extra write.
+
+On SQLite the measured time includes waiting for the database lock, which
+is usually what makes a statement slow under concurrent writes.
+"""
+import hashlib
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.db import IntegrityError, connection
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils.timezone import now
+
+from .models import SlowQuery
+from .profiling import short_stack, view_name
+from .utils import log_buffer
+
+# Captures for fingerprints beyond this many per flush are counted as dropped
+MAX_PENDING_FINGERPRINTS = 500
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_RE = re.compile(r'%s|%\(\w+\)s|\?')
+_IN_LIST_RE = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.IGNORECASE)
+_VALUES_ROWS_RE = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))+')
+
+
+def normalize_sql(sql):
+    """Replace literals and placeholders with ? and collapse IN (...) / multi-row VALUES lists."""
+    sql = _WHITESPACE_RE.sub(' ', sql).strip()
+    sql = _STRING_RE.sub('?', sql)
+    sql = _NUMBER_RE.sub('?', sql)
+    sql = _PLACEHOLDER_RE.sub('?', sql)
+    sql = _IN_LIST_RE.sub('IN (...)', sql)
+    return _VALUES_ROWS_RE.sub('(...)', sql)
+
+
+def fingerprint(text):
+    return hashlib.sha1(text.encode('utf-8', 'replace')).hexdigest()
+
+
+def params_fingerprint(params):
+    """Short hash of the bound values, to tell a hot key from a generally slow statement."""
+    return fingerprint(repr(params))[:16]
+
+
+class SlowQueryCollector:
+    """Pending slow-query captures per fingerprint, flushed by the log writer thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+        self.dropped = 0
+
+    def record(self, sql, params, duration_ms, source):
+        normalized = normalize_sql(sql)
+        key = fingerprint(normalized)
+        seen_at = now()
+        stack = short_stack()
+
+        with self._lock:
+            entry = self._pending.get(key)
+            if entry is None:
+                if len(self._pending) >= MAX_PENDING_FINGERPRINTS:
+                    self.dropped += 1
+                    return
+                entry = self._pending[key] = {
+                    'sql': normalized,
+                    'count': 0,
+                    'total_ms': 0.0,
+                    'max_ms': 0.0,
+                    'first_seen': seen_at,
+                }
+            entry['count'] += 1
+            entry['total_ms'] += duration_ms
+            entry['max_ms'] = max(entry['max_ms'], duration_ms)
+            entry['last_ms'] = duration_ms
+            entry['last_seen'] = seen_at
+            entry['source'] = (source or '')[:255]
+            entry['params'] = params_fingerprint(params)
+            entry['stack'] = stack
+        log_buffer.start()
+
+    def flush(self, force=False):
+        """Fold pending captures into SlowQuery rows (one UPDATE, or INSERT for new fingerprints)."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for key, entry in pending.items():
+            changes = dict(
+                occurrences=F('occurrences') + entry['count'],
+                total_ms=F('total_ms') + entry['total_ms'],
+                max_ms=Greatest(F('max_ms'), entry['max_ms']),
+                last_ms=entry['last_ms'],
+                source=entry['source'],
+                last_params_fingerprint=entry['params'],
+                last_stack=entry['stack'],
+                last_seen_at=entry['last_seen'],
+            )
+            if SlowQuery.objects.filter(fingerprint=key).update(**changes):
+                continue
+            try:
+                SlowQuery.objects.create(
+                    fingerprint=key,
+                    sql=entry['sql'],
+                    source=entry['source'],
+                    occurrences=entry['count'],
+                    total_ms=entry['total_ms'],
+                    max_ms=entry['max_ms'],
+                    last_ms=entry['last_ms'],
+                    last_params_fingerprint=entry['params'],
+                    last_stack=entry['stack'],
+                    first_seen_at=entry['first_seen'],
+                    last_seen_at=entry['last_seen'],
+                )
+            except IntegrityError:
+                # Another worker inserted the same fingerprint first
+                SlowQuery.objects.filter(fingerprint=key).update(**changes)
+
+
+slow_query_collector = SlowQueryCollector()
+log_buffer.add_tick_callback(slow_query_collector.flush)
+
+
+class SlowQueryRecorder:
+    """
+    execute_wrapper that hands statements slower than threshold_ms to the
+    collector. `source` is a label or a callable returning one, evaluated
+    only when a slow statement is captured.
+    """
+
+    __slots__ = ('source', 'threshold_ms')
+
+    def __init__(self, source, threshold_ms=None):
+        self.source = source
+        if threshold_ms is None:
+            threshold_ms = getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', 200)
+        self.threshold_ms = threshold_ms
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = (time.perf_counter() - start) * 1000
+            if duration >= self.threshold_ms:
+                source = self.source() if callable(self.source) else self.source
+                slow_query_collector.record(sql, params, duration, source)
+
+
+def capture_slow_queries(source):
+    """Context manager installing a SlowQueryRecorder on the default connection (for commands)."""
+    return connection.execute_wrapper(SlowQueryRecorder(source))
+
+
+class SlowQueryMiddleware:
+    """Capture slow SQL from every request, labelled with the resolved view."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'SLOW_QUERY_CAPTURE_ENABLED', True)
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+        recorder = SlowQueryRecorder(lambda: view_name(request) or f"{request.method} {request.path}")
+        with connection.execute_wrapper(recorder):
+            return self.get_response(request)
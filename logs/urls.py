@@ -0,0 +1,7 @@
+from django.urls import path
+
+from .views import ViewMetricsAPIView
+
+urlpatterns = [
+    path('metrics/', ViewMetricsAPIView.as_view(), name='logs-view-metrics'),
+]
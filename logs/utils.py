@@ -1,10 +1,39 @@
+from django.conf import settings
+from django.utils.timezone import now
+
+from .buffer import BufferedWriter
 from .models import LogEntry
 
+
+def _write_log_entries(entries):
+    LogEntry.objects.bulk_create(entries, batch_size=log_buffer.batch_size)
+
+
+log_buffer = BufferedWriter(
+    _write_log_entries,
+    name='logentry-writer',
+    max_size=getattr(settings, 'LOGS_BUFFER_MAX_SIZE', 10000),
+    batch_size=getattr(settings, 'LOGS_BUFFER_BATCH_SIZE', 200),
+    flush_interval_ms=getattr(settings, 'LOGS_BUFFER_FLUSH_INTERVAL_MS', 500),
+    overflow=getattr(settings, 'LOGS_BUFFER_OVERFLOW', 'drop_oldest'),
+)
+
+
+def save_log_entry(entry):
+    """Queue a LogEntry on the buffered writer, or insert it now when LOGS_BUFFER_ENABLED is off."""
+    if getattr(settings, 'LOGS_BUFFER_ENABLED', True):
+        log_buffer.put(entry)
+    else:
+        entry.save()
+
+
 def log_message(level, message, user=None, source_app=None, exception=None):
-    LogEntry.objects.create(
+    entry = LogEntry(
         level=level,
         message=message,
-        user=user,
-        source_app=source_app,
-        exception=exception
+        user_id=getattr(user, 'pk', None),
+        source_app=source_app or '',
+        exception=exception,
+        created_at=now(),
     )
+    save_log_entry(entry)
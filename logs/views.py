@@ -1,3 +1,24 @@
-from django.shortcuts import render
+from rest_framework import status
+from rest_framework.authentication import SessionAuthentication, TokenAuthentication
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Create your views here.
+from coreconfig.response_cache import response_cache_metrics
+
+from .profiling import view_metrics
+
+
+class ViewMetricsAPIView(APIView):
+    """
+    Staff-only endpoint reporting per-view latency (p50/p95/p99), DB time and
+    query counts aggregated across all workers, plus response cache hit rates.
+    """
+    authentication_classes = [SessionAuthentication, TokenAuthentication]
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response({
+            "views": view_metrics.snapshot(),
+            "response_cache": response_cache_metrics.snapshot(),
+        }, status=status.HTTP_200_OK)
@@ -0,0 +1,110 @@
+"""
+Django management command to benchmark the request guard path of protected POST endpoints.
+Runs against a throwaway copy of the database and the configured cache.
+
+Usage:
+    python manage.py benchmark_security
+    python manage.py benchmark_security --iterations 5000 --threads 1,8 --json before.json
+    python manage.py benchmark_security --compare before.json
+"""
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory, override_settings
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+
+from coreconfig.benchmarking import (
+    format_results,
+    read_report,
+    run_benchmark,
+    throwaway_database,
+    write_report,
+)
+from coreconfig.registry import env_registry
+from security.models import APICSRFToken
+from security.permissions import ProtectedPostPermission
+from security.utils import rate_limit_check, validate_origin
+
+
+class _BenchmarkView:
+    rate_limit = '1000000/m'
+
+
+class Command(BaseCommand):
+    help = 'Benchmark CSRF token, rate limit, origin and permission checks (ops/sec and queries per call)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=2000,
+                            help='Calls per benchmark and thread configuration (default: 2000)')
+        parser.add_argument('--threads', default='1,4',
+                            help='Comma-separated thread counts to run each benchmark with (default: 1,4)')
+        parser.add_argument('--warmup', type=int, default=50, help='Untimed warmup calls (default: 50)')
+        parser.add_argument('--sqlite-file', default=None,
+                            help='Path for the scratch SQLite database (default: temporary file)')
+        parser.add_argument('--json', dest='json_path', default=None, help='Write results to this JSON file')
+        parser.add_argument('--compare', default=None, help='Show ops/sec change against a previous JSON report')
+
+    def handle(self, *args, **options):
+        thread_counts = [int(t) for t in options['threads'].split(',') if t.strip()]
+        iterations = options['iterations']
+        warmup = options['warmup']
+
+        results = []
+        with throwaway_database(options['sqlite_file']), \
+                override_settings(ENABLE_ORIGIN_VALIDATION=True):
+            env_registry.invalidate()
+            origin = next(iter(sorted(env_registry.values('CORS_ORIGIN'))), 'http://localhost:3000')
+            factory = RequestFactory()
+
+            def post_request(index, **extra):
+                # Spread calls over many client IPs so rate limiting never trips
+                return factory.post(
+                    '/api/benchmark/', data='{}', content_type='application/json',
+                    HTTP_ORIGIN=origin, REMOTE_ADDR=f'10.{(index >> 16) & 255}.{(index >> 8) & 255}.{index & 255}',
+                    **extra
+                )
+
+            for threads in thread_counts:
+                results.append(run_benchmark(
+                    'APICSRFToken.generate_token',
+                    lambda i: APICSRFToken.generate_token('127.0.0.1'),
+                    iterations, threads, warmup,
+                ))
+
+                tokens = [APICSRFToken.generate_token('127.0.0.1')[0] for _ in range(iterations + warmup)]
+                results.append(run_benchmark(
+                    'APICSRFToken.validate_token',
+                    lambda i: APICSRFToken.validate_token(tokens[i], '127.0.0.1'),
+                    iterations, threads, warmup,
+                ))
+
+                results.append(run_benchmark(
+                    'rate_limit_check',
+                    lambda i: rate_limit_check(post_request(i), rate='1000000/m'),
+                    iterations, threads, warmup,
+                ))
+
+                results.append(run_benchmark(
+                    'validate_origin',
+                    lambda i: validate_origin(post_request(i)),
+                    iterations, threads, warmup,
+                ))
+
+                tokens = [APICSRFToken.generate_token('127.0.0.1')[0] for _ in range(iterations + warmup)]
+                permission = ProtectedPostPermission()
+                view = _BenchmarkView()
+
+                def guarded_post(i):
+                    request = Request(post_request(i, HTTP_X_CSRF_TOKEN=tokens[i]), parsers=[JSONParser()])
+                    permission.has_permission(request, view)
+
+                results.append(run_benchmark(
+                    'ProtectedPostPermission.has_permission',
+                    guarded_post,
+                    iterations, threads, warmup,
+                ))
+
+        baseline = read_report(options['compare']) if options['compare'] else None
+        self.stdout.write(format_results(results, baseline))
+        if options['json_path']:
+            write_report(options['json_path'], results, {'iterations': iterations})
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['json_path']}"))
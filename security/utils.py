@@ -5,6 +5,8 @@ from ipaddress import ip_address
 import hashlib
 import hmac
 
+from coreconfig.registry import env_registry
+
 
 def get_client_ip(request):
     """Extract client IP address from request."""
@@ -32,18 +34,9 @@ def validate_origin(request):
         # If no origin/referer header, reject if validation is enabled
         return False
     
-    # Extract domain from origin/referer
-    from urllib.parse import urlparse
-    try:
-        parsed = urlparse(origin)
-        origin_domain = f"{parsed.scheme}://{parsed.netloc}"
-    except Exception:
-        # If parsing fails, reject if validation is enabled
-        return False
-    
-    # Check against allowed origins
-    allowed_origins = getattr(settings, 'CORS_ALLOWED_ORIGINS', [])
-    return origin_domain in allowed_origins
+    # Origin/referer is reduced to scheme://netloc and checked against the
+    # settings + EnvironmentSetting registry (frozenset lookup, no DB access)
+    return env_registry.is_cors_origin(origin)
 
 
 def rate_limit_check(request, identifier=None, rate='5/m', method='POST'):
@@ -83,8 +76,8 @@ def rate_limit_check(request, identifier=None, rate='5/m', method='POST'):
     current_count = cache.get(cache_key, 0)
     
     if current_count >= limit:
-        # Get reset time
-        ttl = cache.ttl(cache_key)
+        # Get reset time (only some backends, e.g. django-redis, expose ttl())
+        ttl = cache.ttl(cache_key) if hasattr(cache, 'ttl') else period_seconds
         return False, 0, ttl
     
     # Increment counter
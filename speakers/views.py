@@ -9,6 +9,7 @@ from .models import Speaker, BecomeASpeaker
 from .serializers import SpeakerSerializer, BecomeASpeakerSerializer
 from logs.utils import log_message
 from security.permissions import ProtectedPostPermission
+from coreconfig.response_cache import cached_response
 from coreconfig.service import email_service
 
 class SpeakerViewSet(APIView):
@@ -19,6 +20,7 @@ class SpeakerViewSet(APIView):
     # Public endpoint - no authentication required
     permission_classes = [AllowAny]
 
+    @cached_response(Speaker)
     def get(self, request, *args, **kwargs):
         name = request.data.get('name', None)
         company = request.data.get('company', None)
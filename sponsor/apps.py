@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class SponsorConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'sponsor'
+
+    def ready(self):
+        import sponsor.signals
@@ -0,0 +1,178 @@
+"""
+Sponsor Directory
+Pre-grouped sponsor list for SponsorListAPIView. Sponsors change a few times
+a day but the list is fetched on every summit page view, so the rows are
+read once per cache version and kept in each process; the rendered JSON for
+unfiltered requests is cached per site (logo URLs are absolute).
+
+Sponsor save/delete and m2m signals bump the shared cache version, which
+workers check at most every SPONSOR_DIRECTORY_CHECK_INTERVAL seconds. With a
+per-process cache backend other workers cannot see the bump and reload after
+PROCESS_SNAPSHOT_MAX_AGE seconds instead (coreconfig.shared_cache).
+"""
+import threading
+import time
+import uuid
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.renderers import JSONRenderer
+
+from coreconfig.shared_cache import snapshot_expired
+
+# Response key per Sponsor.type; headline is a single object, the rest are lists
+GROUP_KEYS = {
+    'headline': 'headlineSponsor',
+    'diamond': 'diamondSponsors',
+    'platinum': 'platinumSponsors',
+    'gold': 'goldSponsors',
+    'silver': 'silverSponsors',
+    'bronze': 'bronzeSponsors',
+    'media': 'mediaPartners',
+    'strategic': 'strategicPartners',
+    'attending_companies': 'attendingCompanies',
+}
+SINGLE_GROUPS = {'headline'}
+
+CACHE_TIMEOUT = 24 * 3600
+
+
+def _new_version():
+    # "<unix time>:<random>": the time doubles as Last-Modified for conditional GETs
+    return f'{time.time():.6f}:{uuid.uuid4().hex}'
+
+
+def empty_directory():
+    return {key: None if sponsor_type in SINGLE_GROUPS else [] for sponsor_type, key in GROUP_KEYS.items()}
+
+
+class SponsorDirectory:
+    """Process-wide sponsor rows plus per-site rendered responses."""
+
+    VERSION_KEY = 'sponsor_directory_version'
+    ROWS_KEY = 'sponsor_directory_rows:{version}'
+    RENDERED_KEY = 'sponsor_directory_json:{version}:{base}'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows = None
+        self._rendered = {}
+        self._version = None
+        self._checked_at = 0.0
+        self._loaded_at = 0.0
+
+    def _current_version(self):
+        version = cache.get(self.VERSION_KEY)
+        if version is None:
+            cache.add(self.VERSION_KEY, _new_version(), timeout=None)
+            version = cache.get(self.VERSION_KEY)
+        return version
+
+    def _load_rows(self, version):
+        """Sponsor rows ordered by type and name, from the shared cache or one query."""
+        key = self.ROWS_KEY.format(version=version)
+        rows = cache.get(key)
+        if rows is None:
+            from .models import Sponsor
+            storage = Sponsor._meta.get_field('logo').storage
+            rows = [
+                {
+                    'type': row['type'],
+                    'name': row['name'],
+                    'logo': storage.url(row['logo']) if row['logo'] else None,
+                    'url': row['url'],
+                }
+                for row in Sponsor.objects.order_by('type', 'name').values('type', 'name', 'logo', 'url')
+            ]
+            cache.set(key, rows, timeout=CACHE_TIMEOUT)
+        return rows
+
+    def _snapshot(self):
+        """Current (version, rows), reloading only when the shared version moved."""
+        interval = getattr(settings, 'SPONSOR_DIRECTORY_CHECK_INTERVAL', 5)
+        now = time.monotonic()
+        if self._rows is not None and now - self._checked_at < interval:
+            return self._version, self._rows
+
+        with self._lock:
+            if self._rows is not None and now - self._checked_at < interval:
+                return self._version, self._rows
+            if self._rows is not None and snapshot_expired(self._loaded_at, now):
+                # Per-process cache: a new local version re-keys the cached rows and responses
+                version = _new_version()
+                cache.set(self.VERSION_KEY, version, timeout=None)
+            else:
+                version = self._current_version()
+            if self._rows is None or version != self._version:
+                self._rows = self._load_rows(version)
+                self._rendered = {}
+                self._version = version
+                self._loaded_at = now
+            self._checked_at = now
+            return self._version, self._rows
+
+    def grouped(self, request, name=None, sponsor_type=None):
+        """Directory dict for the request's site, optionally filtered like the old queryset."""
+        _, rows = self._snapshot()
+        name = name.casefold() if name else None
+        sponsor_type = sponsor_type.casefold() if sponsor_type else None
+
+        directory = empty_directory()
+        for row in rows:
+            if name and (not row['name'] or name not in row['name'].casefold()):
+                continue
+            if sponsor_type and (row['type'] or '').casefold() != sponsor_type:
+                continue
+            key = GROUP_KEYS.get(row['type'])
+            if key is None:
+                continue
+            data = {
+                'name': row['name'],
+                'logo': request.build_absolute_uri(row['logo']) if row['logo'] else None,
+                'url': row['url'],
+            }
+            if row['type'] in SINGLE_GROUPS:
+                if directory[key] is None:
+                    directory[key] = data
+            else:
+                directory[key].append(data)
+        return directory
+
+    def rendered(self, request):
+        """JSON bytes of the unfiltered directory for the request's site."""
+        version, _ = self._snapshot()
+        base = request.build_absolute_uri('/')
+        content = self._rendered.get(base)
+        if content is not None:
+            return content
+
+        key = self.RENDERED_KEY.format(version=version, base=base)
+        content = cache.get(key)
+        if content is None:
+            content = JSONRenderer().render(self.grouped(request))
+            cache.set(key, content, timeout=CACHE_TIMEOUT)
+        with self._lock:
+            if self._version == version:
+                self._rendered[base] = content
+        return content
+
+    def validators(self):
+        """(version, last_modified) of the current directory, for conditional GETs; no query."""
+        version, _ = self._snapshot()
+        stamp, _, _ = version.partition(':')
+        try:
+            last_modified = datetime.fromtimestamp(float(stamp), tz=dt_timezone.utc)
+        except ValueError:
+            last_modified = None
+        return version, last_modified
+
+    def invalidate(self):
+        """Bump the shared version so every worker rebuilds on its next check."""
+        cache.set(self.VERSION_KEY, _new_version(), timeout=None)
+        with self._lock:
+            self._rows = None
+            self._rendered = {}
+
+
+sponsor_directory = SponsorDirectory()
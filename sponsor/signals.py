@@ -0,0 +1,14 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .directory import sponsor_directory
+from .models import Sponsor
+
+
+@receiver(post_save, sender=Sponsor)
+@receiver(post_delete, sender=Sponsor)
+@receiver(m2m_changed, sender=Sponsor.sponsorship_package.through)
+def invalidate_sponsor_directory(sender, **kwargs):
+    """Rebuild the cached sponsor directory in every worker after a sponsor change."""
+    if kwargs.get('action', 'post_').startswith('post_'):
+        sponsor_directory.invalidate()
@@ -13,6 +13,13 @@ def sponsorship_icon_upload_path(instance, filename):
     return os.path.join('sponsorship', filename)
 
 
+def split_list_text(text):
+    """Split comma/newline separated text into a list of stripped items."""
+    if not text:
+        return []
+    return [item.strip() for item in text.replace('\n', ',').split(',') if item.strip()]
+
+
 class Sponsorship(models.Model):
     """
     Represents a sponsorship package for the iGaming AFRIKA Summit 2026.
@@ -47,6 +54,15 @@ class Sponsorship(models.Model):
 
     tickets = models.TextField(blank=True, help_text="Details about included tickets (e.g., '40 Premium Passes...')")
 
+    # Pre-parsed copies of the text fields above, kept in sync by save(); None until backfilled
+    benefits_list = models.JSONField(null=True, blank=True, editable=False)
+    platinum_benefits_list = models.JSONField(null=True, blank=True, editable=False)
+    diamond_benefits_list = models.JSONField(null=True, blank=True, editable=False)
+    gold_benefits_list = models.JSONField(null=True, blank=True, editable=False)
+    silver_benefits_list = models.JSONField(null=True, blank=True, editable=False)
+    bronze_benefits_list = models.JSONField(null=True, blank=True, editable=False)
+    notes_list = models.JSONField(null=True, blank=True, editable=False)
+
     icon_image = models.ImageField(upload_to=sponsorship_icon_upload_path, blank=True, null=True)
 
     total_avalibility = models.IntegerField(default=0, help_text="Total number of sponsorship packages available.")
@@ -65,6 +81,17 @@ class Sponsorship(models.Model):
         help_text="The user who added this sponsorship record (auto-filled)."
     )
 
+    # Text field -> pre-parsed list field
+    LIST_FIELDS = {
+        'benefits': 'benefits_list',
+        'platinum_benefits': 'platinum_benefits_list',
+        'diamond_benefits': 'diamond_benefits_list',
+        'gold_benefits': 'gold_benefits_list',
+        'silver_benefits': 'silver_benefits_list',
+        'bronze_benefits': 'bronze_benefits_list',
+        'notes': 'notes_list',
+    }
+
     class Meta:
         verbose_name = "Sponsorship Package"
         verbose_name_plural = "Sponsorship Packages"
@@ -73,5 +100,16 @@ class Sponsorship(models.Model):
     def __str__(self):
         return self.title
 
+    def refresh_lists(self):
+        for text_field, list_field in self.LIST_FIELDS.items():
+            setattr(self, list_field, split_list_text(getattr(self, text_field)))
+
     def save(self, *args, **kwargs):
+        self.refresh_lists()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            kwargs['update_fields'] = update_fields | {
+                self.LIST_FIELDS[name] for name in update_fields if name in self.LIST_FIELDS
+            }
         super().save(*args, **kwargs)
\ No newline at end of file
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Sponsorship
+from .models import Sponsorship, split_list_text
 
 class SponsorshipSerializer(serializers.ModelSerializer):
     """
@@ -32,35 +32,34 @@ class SponsorshipSerializer(serializers.ModelSerializer):
             'liked_sponsor_logos'
         ]
 
-    def _split_text_field(self, text):
-        """Helper to split comma/newline separated text into a list."""
-        if not text:
-            return []
-        # Split by comma or newline, then strip whitespace from each item
-        items = [item.strip() for item in text.replace('\n', ',').split(',') if item.strip()]
+    def _list_field(self, obj, text_field):
+        """Pre-parsed list stored by Sponsorship.save(); rows not yet backfilled are split here."""
+        items = getattr(obj, Sponsorship.LIST_FIELDS[text_field])
+        if items is None:
+            return split_list_text(getattr(obj, text_field))
         return items
 
     def get_benefits(self, obj):
-        return self._split_text_field(obj.benefits)
+        return self._list_field(obj, 'benefits')
 
     def get_platinumBenefits(self, obj):
         # Note the casing change from model field `platinum_benefits` to output `platinumBenefits`
-        return self._split_text_field(obj.platinum_benefits)
+        return self._list_field(obj, 'platinum_benefits')
 
     def get_diamondBenefits(self, obj):
-        return self._split_text_field(obj.diamond_benefits)
+        return self._list_field(obj, 'diamond_benefits')
 
     def get_goldBenefits(self, obj):
-        return self._split_text_field(obj.gold_benefits)
+        return self._list_field(obj, 'gold_benefits')
 
     def get_silverBenefits(self, obj):
-        return self._split_text_field(obj.silver_benefits)
+        return self._list_field(obj, 'silver_benefits')
 
     def get_bronzeBenefits(self, obj):
-        return self._split_text_field(obj.bronze_benefits)
+        return self._list_field(obj, 'bronze_benefits')
 
     def get_notes(self, obj):
-        return self._split_text_field(obj.notes)
+        return self._list_field(obj, 'notes')
 
     def get_images(self, obj):
         request = self.context.get('request')  # Only works in serializers with context
@@ -74,7 +73,7 @@ class SponsorshipSerializer(serializers.ModelSerializer):
         """
         request = self.context.get('request')
         logos = []
-        # Get all sponsors associated with this sponsorship package
+        # Get all sponsors associated with this sponsorship package (prefetched by the view)
         sponsors = obj.sponsors.all()
         for sponsor in sponsors:
             if sponsor.logo and request:
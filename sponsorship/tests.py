@@ -1,3 +1,72 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
 
-# Create your tests here.
+from coreconfig.response_cache import model_versions
+from sponsor.models import Sponsor
+from .models import Sponsorship
+
+
+@override_settings(VIEW_METRICS_ENABLED=False, SLOW_QUERY_CAPTURE_ENABLED=False)
+class SponsorshipListQueryCountTests(TestCase):
+    """SponsorshipListAPIView must not issue a query per package or per sponsor."""
+
+    def _add_packages(self, count, sponsors_each):
+        start = Sponsorship.objects.count()
+        for i in range(start, start + count):
+            package = Sponsorship.objects.create(title=f'Package {i}', price=f'${i},000')
+            for j in range(sponsors_each):
+                sponsor = Sponsor.objects.create(name=f'Sponsor {i}-{j}', type='gold')
+                # Set the file name directly so no upload is written to MEDIA_ROOT
+                Sponsor.objects.filter(pk=sponsor.pk).update(logo=f'sponsor/sponsor-{i}-{j}.png')
+                package.sponsors.add(sponsor)
+
+    def _get(self):
+        response = self.client.get(reverse('sponsorships'))
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    # The packages and the logo prefetch
+    EXPECTED_QUERIES = 2
+
+    def test_query_count_is_constant(self):
+        self._add_packages(1, 1)
+        with self.assertNumQueries(self.EXPECTED_QUERIES):
+            data = self._get()
+        self.assertEqual(len(data[0]['liked_sponsor_logos']), 1)
+
+        self._add_packages(10, 5)
+        with self.assertNumQueries(self.EXPECTED_QUERIES):
+            data = self._get()
+        self.assertEqual(len(data), 11)
+        self.assertTrue(all(len(package['liked_sponsor_logos']) == 5 for package in data[1:]))
+        self.assertTrue(data[1]['liked_sponsor_logos'][0].startswith('http://testserver/'))
+
+
+@override_settings(VIEW_METRICS_ENABLED=False, SLOW_QUERY_CAPTURE_ENABLED=False)
+class SponsorshipConditionalGetTests(TestCase):
+    """The ETag always describes the body this worker serves, fresh or cached."""
+
+    def setUp(self):
+        cache.clear()
+        Sponsorship.objects.create(title='Gold', price='$1,000')
+
+    def test_etag_follows_the_served_body(self):
+        first = self.client.get(reverse('sponsorships'))
+        with self.assertNumQueries(0):
+            cached = self.client.get(reverse('sponsorships'), HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(cached.status_code, 304)
+
+        # Saved in another worker: with a per-process cache this worker keeps its token
+        version = model_versions.get_many([Sponsorship])[Sponsorship._meta.label]
+        Sponsorship.objects.create(title='Silver', price='$500')
+        cache.set(model_versions.KEY.format(label=Sponsorship._meta.label), version, timeout=None)
+        stale = self.client.get(reverse('sponsorships'))
+        self.assertEqual((stale['ETag'], stale.content), (first['ETag'], first.content))
+
+        # Once the entry is gone the rebuilt body comes with a new ETag
+        cache.clear()
+        fresh = self.client.get(reverse('sponsorships'), HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(fresh.status_code, 200)
+        self.assertNotEqual(fresh['ETag'], first['ETag'])
+        self.assertEqual(len(fresh.json()), 2)
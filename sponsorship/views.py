@@ -3,8 +3,10 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import AllowAny
-from django.db.models import Q # For complex lookups
+from django.db.models import Prefetch, Q # For complex lookups
 
+from coreconfig.response_cache import cached_response
+from sponsor.models import Sponsor
 from .models import Sponsorship
 from .serializers import SponsorshipSerializer
 
@@ -15,9 +17,13 @@ class SponsorshipListAPIView(APIView):
     API endpoint to retrieve a list of sponsorship packages.
     Supports filtering by id, title (case-insensitive contains), price (exact), and status (exact).
     """
+    @cached_response(Sponsorship, Sponsor)
     def get(self, request, *args, **kwargs):
-        # Start with all Sponsorship objects
-        queryset = Sponsorship.objects.all()
+        # Start with all Sponsorship objects; sponsor logos come from one prefetch query
+        # instead of one query per package
+        queryset = Sponsorship.objects.prefetch_related(
+            Prefetch('sponsors', queryset=Sponsor.objects.only('id', 'logo'))
+        )
 
         # Get filter parameters from query params
         sponsorship_id = request.data.get('id', None)